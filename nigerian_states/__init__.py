@@ -0,0 +1,41 @@
+"""
+The helpers below are importable from the package (`from nigerian_states import nearest_state`).
+They are imported on first access, so that importing the package (e.g. from INSTALLED_APPS)
+does not import the models, the indexes or optional dependencies such as NumPy.
+"""
+
+from importlib import import_module
+
+_LAZY_ATTRIBUTES = {
+    "get_registry": "nigerian_states.registry",
+    "clear_registry": "nigerian_states.registry",
+    "get_lga": "nigerian_states.utils",
+    "lga_states": "nigerian_states.utils",
+    "names_in_zone": "nigerian_states.utils",
+    "lga_names_in_zone": "nigerian_states.utils",
+    "lga_names_in_state": "nigerian_states.utils",
+    "validate_records": "nigerian_states.utils",
+    "nearest_state": "nigerian_states.spatial",
+    "nearest_lga": "nigerian_states.spatial",
+    "resolve_state": "nigerian_states.boundaries",
+    "resolve_lga": "nigerian_states.boundaries",
+    "dataset_json": "nigerian_states.bundle",
+    "warm_up": "nigerian_states.warmup",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module), name)
+    # cached, so that __getattr__ is only called on the first access.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
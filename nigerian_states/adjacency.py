@@ -0,0 +1,326 @@
+"""
+Neighbouring states / local governments, as compact CSR (compressed sparse row) graphs.
+
+The land borders between the states are packaged in `STATE_BORDERS`. LGA borders are
+not shipped with the package, they are read from the JSON file given by
+`settings.NIGERIAN_STATES_LGA_ADJACENCY`: an object mapping each LGA (by code or
+"State: LGA") to the list of its neighbours.
+
+Nodes are the positions of the objects in the registry, the neighbours of node `i` are
+`indices[indptr[i]:indptr[i + 1]]`, so a lookup is two array reads and a slice.
+"""
+
+import json
+from array import array
+from collections import deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# pairs of ISO 3166-2 codes of states sharing a land border.
+STATE_BORDERS = (
+    ("NG-AB", "NG-AK"),
+    ("NG-AB", "NG-AN"),
+    ("NG-AB", "NG-CR"),
+    ("NG-AB", "NG-EB"),
+    ("NG-AB", "NG-EN"),
+    ("NG-AB", "NG-IM"),
+    ("NG-AB", "NG-RI"),
+    ("NG-AD", "NG-BO"),
+    ("NG-AD", "NG-GO"),
+    ("NG-AD", "NG-TA"),
+    ("NG-AK", "NG-CR"),
+    ("NG-AK", "NG-RI"),
+    ("NG-AN", "NG-DE"),
+    ("NG-AN", "NG-ED"),
+    ("NG-AN", "NG-EN"),
+    ("NG-AN", "NG-IM"),
+    ("NG-AN", "NG-KO"),
+    ("NG-BA", "NG-GO"),
+    ("NG-BA", "NG-JI"),
+    ("NG-BA", "NG-KD"),
+    ("NG-BA", "NG-KN"),
+    ("NG-BA", "NG-PL"),
+    ("NG-BA", "NG-TA"),
+    ("NG-BA", "NG-YO"),
+    ("NG-BE", "NG-CR"),
+    ("NG-BE", "NG-EB"),
+    ("NG-BE", "NG-EN"),
+    ("NG-BE", "NG-KO"),
+    ("NG-BE", "NG-NA"),
+    ("NG-BE", "NG-TA"),
+    ("NG-BO", "NG-GO"),
+    ("NG-BO", "NG-YO"),
+    ("NG-BY", "NG-DE"),
+    ("NG-BY", "NG-RI"),
+    ("NG-CR", "NG-EB"),
+    ("NG-DE", "NG-ED"),
+    ("NG-DE", "NG-IM"),
+    ("NG-DE", "NG-ON"),
+    ("NG-DE", "NG-RI"),
+    ("NG-EB", "NG-EN"),
+    ("NG-ED", "NG-KO"),
+    ("NG-ED", "NG-ON"),
+    ("NG-EK", "NG-KO"),
+    ("NG-EK", "NG-KW"),
+    ("NG-EK", "NG-ON"),
+    ("NG-EK", "NG-OS"),
+    ("NG-EN", "NG-KO"),
+    ("NG-FC", "NG-KD"),
+    ("NG-FC", "NG-KO"),
+    ("NG-FC", "NG-NA"),
+    ("NG-FC", "NG-NI"),
+    ("NG-GO", "NG-TA"),
+    ("NG-GO", "NG-YO"),
+    ("NG-IM", "NG-RI"),
+    ("NG-JI", "NG-KN"),
+    ("NG-JI", "NG-KT"),
+    ("NG-JI", "NG-YO"),
+    ("NG-KD", "NG-KN"),
+    ("NG-KD", "NG-KT"),
+    ("NG-KD", "NG-NA"),
+    ("NG-KD", "NG-NI"),
+    ("NG-KD", "NG-PL"),
+    ("NG-KD", "NG-ZA"),
+    ("NG-KE", "NG-NI"),
+    ("NG-KE", "NG-SO"),
+    ("NG-KE", "NG-ZA"),
+    ("NG-KN", "NG-KT"),
+    ("NG-KO", "NG-KW"),
+    ("NG-KO", "NG-NA"),
+    ("NG-KO", "NG-NI"),
+    ("NG-KO", "NG-ON"),
+    ("NG-KT", "NG-ZA"),
+    ("NG-KW", "NG-NI"),
+    ("NG-KW", "NG-OS"),
+    ("NG-KW", "NG-OY"),
+    ("NG-LA", "NG-OG"),
+    ("NG-NA", "NG-PL"),
+    ("NG-NA", "NG-TA"),
+    ("NG-NI", "NG-ZA"),
+    ("NG-OG", "NG-ON"),
+    ("NG-OG", "NG-OS"),
+    ("NG-OG", "NG-OY"),
+    ("NG-ON", "NG-OS"),
+    ("NG-OS", "NG-OY"),
+    ("NG-PL", "NG-TA"),
+    ("NG-SO", "NG-ZA"),
+)
+
+
+class Graph:
+    """
+    A static, undirected graph over the nodes 0..size-1, in CSR form.
+    """
+
+    def __init__(self, size, edges):
+        adjacency = [set() for _ in range(size)]
+        for a, b in edges:
+            if a != b:
+                adjacency[a].add(b)
+                adjacency[b].add(a)
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        for neighbors in adjacency:
+            self.indices.extend(sorted(neighbors))
+            self.indptr.append(len(self.indices))
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def neighbors(self, node):
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def hops(self, source, max_hops=None):
+        """
+        Breadth first search from `source`.
+
+        Returns:
+            dict: node -> number of hops from `source`, for the nodes within `max_hops`
+                (every reachable node if None), in BFS order, `source` included.
+        """
+        indptr, indices = self.indptr, self.indices
+        distances = {source: 0}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            distance = distances[node] + 1
+            if max_hops is not None and distance > max_hops:
+                break
+            for neighbor in indices[indptr[node] : indptr[node + 1]]:
+                if neighbor not in distances:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+        return distances
+
+    def shortest_path(self, source, target):
+        """
+        Returns a list of nodes from `source` to `target` with the fewest hops, or None.
+        """
+        if source == target:
+            return [source]
+        indptr, indices = self.indptr, self.indices
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for neighbor in indices[indptr[node] : indptr[node + 1]]:
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = node
+                if neighbor == target:
+                    path = [target]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                queue.append(neighbor)
+        return None
+
+
+class AdjacencyIndex:
+    """
+    A Graph over `objects`, queried with keys resolved to objects by `resolve`.
+    """
+
+    def __init__(self, objects, edges, resolve):
+        self.objects = tuple(objects)
+        self.nodes = {id(obj): node for node, obj in enumerate(self.objects)}
+        self.resolve = resolve
+        self.graph = Graph(
+            len(self.objects),
+            ((self.nodes[id(a)], self.nodes[id(b)]) for a, b in edges),
+        )
+
+    def node(self, key):
+        obj = self.resolve(key)
+        if obj is None:
+            return None
+        return self.nodes.get(id(obj))
+
+    def neighbors(self, key):
+        """
+        Returns the neighbours of `key`, an empty tuple if it is unknown.
+        """
+        node = self.node(key)
+        if node is None:
+            return ()
+        objects = self.objects
+        return tuple(objects[neighbor] for neighbor in self.graph.neighbors(node))
+
+    def are_neighbors(self, a, b):
+        node, other = self.node(a), self.node(b)
+        if node is None or other is None:
+            return False
+        return other in self.graph.neighbors(node)
+
+    def within(self, key, hops=1):
+        """
+        Returns the objects at most `hops` borders away from `key` (itself excluded),
+        nearest first.
+        """
+        node = self.node(key)
+        if node is None:
+            return ()
+        objects = self.objects
+        return tuple(
+            objects[other] for other in self.graph.hops(node, hops) if other != node
+        )
+
+    def shortest_path(self, a, b):
+        """
+        Returns the objects crossed from `a` to `b` (both included) with the fewest
+        borders, or None if either is unknown or there is no path.
+        """
+        node, other = self.node(a), self.node(b)
+        if node is None or other is None:
+            return None
+        path = self.graph.shortest_path(node, other)
+        if path is None:
+            return None
+        return [self.objects[i] for i in path]
+
+
+def _state_index(registry):
+    states = registry.states_by_code
+    edges = [
+        (states[a], states[b]) for a, b in STATE_BORDERS if a in states and b in states
+    ]
+    return AdjacencyIndex(registry.states.values(), edges, registry.get_state)
+
+
+def _lga_index(registry):
+    path = getattr(settings, "NIGERIAN_STATES_LGA_ADJACENCY", None)
+    if not path:
+        raise ImproperlyConfigured("settings.NIGERIAN_STATES_LGA_ADJACENCY is not set.")
+    with open(path, encoding="utf-8") as f:
+        borders = json.load(f)
+    edges = []
+    for key, neighbors in borders.items():
+        lga = registry.get_lga(key)
+        if lga is None:
+            continue
+        for neighbor in map(registry.get_lga, neighbors):
+            if neighbor is not None:
+                edges.append((lga, neighbor))
+    return AdjacencyIndex(registry.lgas, edges, registry.get_lga)
+
+
+def get_state_adjacency(using=None):
+    """
+    Returns the AdjacencyIndex of the states, built once per registry.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry(using).memoize("adjacency.states", _state_index)
+
+
+def get_lga_adjacency(using=None):
+    """
+    Returns the AdjacencyIndex of the local governments, from
+    `settings.NIGERIAN_STATES_LGA_ADJACENCY`, loaded once per registry.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry(using).memoize("adjacency.lgas", _lga_index)
+
+
+def neighboring_states(state):
+    """
+    Returns the States sharing a border with the state (name or ISO 3166-2 code).
+    """
+    return get_state_adjacency().neighbors(state)
+
+
+def states_within(state, hops=1):
+    """
+    Returns the States at most `hops` borders away from the state, nearest first.
+    """
+    return get_state_adjacency().within(state, hops)
+
+
+def state_path(source, target):
+    """
+    Returns the States crossed from `source` to `target` with the fewest borders.
+    """
+    return get_state_adjacency().shortest_path(source, target)
+
+
+def neighboring_lgas(lga):
+    """
+    Returns the LocalGovernments sharing a border with the LGA (code or "State: LGA").
+    """
+    return get_lga_adjacency().neighbors(lga)
+
+
+def lgas_within(lga, hops=1):
+    """
+    Returns the LocalGovernments at most `hops` borders away from the LGA, nearest first.
+    """
+    return get_lga_adjacency().within(lga, hops)
+
+
+def lga_path(source, target):
+    """
+    Returns the LocalGovernments crossed from `source` to `target` with the fewest borders.
+    """
+    return get_lga_adjacency().shortest_path(source, target)
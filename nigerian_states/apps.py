@@ -1,6 +1,36 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class NigerianStates(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "nigerian_states"
+
+    def ready(self):
+        from django.db.models import CharField
+        from nigerian_states import registry  # noqa: F401 connects the signals
+        from nigerian_states.lookups import (
+            LocalGovernmentInState,
+            LocalGovernmentInZone,
+            StateInZone,
+        )
+
+        CharField.register_lookup(StateInZone)
+        CharField.register_lookup(LocalGovernmentInZone)
+        CharField.register_lookup(LocalGovernmentInState)
+
+        if getattr(settings, "NIGERIAN_STATES_WARM_UP", False):
+            self.warm_up()
+
+    def warm_up(self):
+        """
+        Opt-in (`settings.NIGERIAN_STATES_WARM_UP = True`) warm up of the caches at startup.
+        """
+        from django.db import DatabaseError
+        from nigerian_states.warmup import logger, warm_up
+
+        try:
+            warm_up()
+        except DatabaseError:
+            # e.g. before `migrate` has run, the caches would be built on first use.
+            logger.exception("nigerian_states warm up failed")
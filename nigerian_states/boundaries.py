@@ -0,0 +1,407 @@
+"""
+Resolve coordinates to the State / LocalGovernment whose boundary contains them.
+
+Boundary polygons are not shipped with the package, they are read from a GeoJSON
+FeatureCollection (or a geometry store saved with `BoundaryIndex.save`) given by
+`settings.NIGERIAN_STATES_STATE_BOUNDARIES` / `settings.NIGERIAN_STATES_LGA_BOUNDARIES`.
+Each feature is identified by its `code` property (falling back to `name`), which
+is matched against the codes and names of the registry, e.g. "NG-LA" or "Lagos: Badagry".
+
+NumPy is optional: it is needed for the memory-mapped store, and makes `locate_many` vectorized.
+"""
+
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from nigerian_states.utils import get_numpy
+
+
+def _rings(geometry):
+    """
+    Yields the rings of a (Multi)Polygon geometry as lists of (x, y) pairs.
+    """
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        raise ValueError(f"Unsupported geometry type {geometry['type']!r}")
+    for polygon in polygons:
+        for ring in polygon:
+            yield [(float(point[0]), float(point[1])) for point in ring]
+
+
+class GeometryStore:
+    """
+    Flat, array based storage of the feature rings.
+
+    Attributes:
+        - coords: x0, y0, x1, y1, ... of every ring point (longitude, latitude)
+        - ring_offsets: index of the first point of each ring, plus the total
+        - feature_offsets: index of the first ring of each feature, plus the total
+        - bboxes: min_x, min_y, max_x, max_y of each feature
+        - keys: the key of each feature
+    """
+
+    ARRAYS = ("coords", "ring_offsets", "feature_offsets", "bboxes")
+
+    def __init__(self, coords, ring_offsets, feature_offsets, bboxes, keys):
+        self.coords = coords
+        self.ring_offsets = ring_offsets
+        self.feature_offsets = feature_offsets
+        self.bboxes = bboxes
+        self.keys = list(keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_geojson(cls, data, key="code"):
+        coords, ring_offsets, feature_offsets, bboxes, keys = [], [0], [0], [], []
+        for feature in data["features"]:
+            min_x = min_y = float("inf")
+            max_x = max_y = float("-inf")
+            for ring in _rings(feature["geometry"]):
+                for x, y in ring:
+                    coords += (x, y)
+                    min_x, max_x = min(min_x, x), max(max_x, x)
+                    min_y, max_y = min(min_y, y), max(max_y, y)
+                ring_offsets.append(len(coords) // 2)
+            feature_offsets.append(len(ring_offsets) - 1)
+            bboxes += (min_x, min_y, max_x, max_y)
+            properties = feature["properties"]
+            keys.append(properties[key] if key in properties else properties["name"])
+        return cls(coords, ring_offsets, feature_offsets, bboxes, keys)
+
+    def bbox(self, feature):
+        return tuple(self.bboxes[feature * 4 : feature * 4 + 4])
+
+    def ring_points(self, ring):
+        start, end = self.ring_offsets[ring], self.ring_offsets[ring + 1]
+        points = self.coords[start * 2 : end * 2]
+        if hasattr(points, "tolist"):
+            points = points.tolist()
+        return points
+
+    def feature_rings(self, feature):
+        return range(self.feature_offsets[feature], self.feature_offsets[feature + 1])
+
+    def contains(self, feature, x, y):
+        """
+        Even-odd ray casting over every ring of the feature, so holes are excluded.
+        """
+        inside = False
+        for ring in self.feature_rings(feature):
+            points = self.ring_points(ring)
+            x1, y1 = points[-2], points[-1]
+            for i in range(0, len(points), 2):
+                x2, y2 = points[i], points[i + 1]
+                if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                    inside = not inside
+                x1, y1 = x2, y2
+        return inside
+
+    def save(self, directory):
+        """
+        Write the store as `.npy` arrays (and the keys as JSON) into `directory`.
+        """
+        numpy = get_numpy()
+        if numpy is None:
+            raise ImproperlyConfigured("Saving a geometry store requires NumPy.")
+        os.makedirs(directory, exist_ok=True)
+        for name, dtype in zip(self.ARRAYS, ("f8", "i8", "i8", "f8")):
+            numpy.save(
+                os.path.join(directory, f"{name}.npy"),
+                numpy.asarray(getattr(self, name), dtype=dtype),
+            )
+        with open(os.path.join(directory, "keys.json"), "w") as f:
+            json.dump(self.keys, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Load a store written by `save`. The arrays are memory-mapped unless `mmap` is False,
+        so the geometry is paged in from disk on demand and shared between processes.
+        """
+        numpy = get_numpy()
+        if numpy is None:
+            raise ImproperlyConfigured("Loading a geometry store requires NumPy.")
+        arrays = [
+            numpy.load(
+                os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None
+            )
+            for name in cls.ARRAYS
+        ]
+        with open(os.path.join(directory, "keys.json")) as f:
+            keys = json.load(f)
+        return cls(*arrays, keys)
+
+
+class STRTree:
+    """
+    A static R-tree over bounding boxes, packed with the Sort-Tile-Recursive algorithm.
+    Nodes are tuples of (bbox, children, is_leaf); leaf children are feature indexes.
+    """
+
+    def __init__(self, bboxes, capacity=16):
+        self.capacity = capacity
+        nodes = [(bbox, i, None) for i, bbox in enumerate(bboxes)]
+        leaf = True
+        while len(nodes) > capacity:
+            nodes = self._pack(nodes, leaf)
+            leaf = False
+        self.root = (
+            (_union([node[0] for node in nodes]), nodes, leaf) if nodes else None
+        )
+
+    def _pack(self, nodes, leaf):
+        capacity = self.capacity
+        node_count = -(-len(nodes) // capacity)
+        slab_count = max(1, round(node_count**0.5))
+        slab_size = -(-len(nodes) // slab_count)
+        nodes = sorted(nodes, key=lambda node: node[0][0] + node[0][2])
+        packed = []
+        for s in range(0, len(nodes), slab_size):
+            slab = sorted(
+                nodes[s : s + slab_size], key=lambda node: node[0][1] + node[0][3]
+            )
+            for c in range(0, len(slab), capacity):
+                children = slab[c : c + capacity]
+                packed.append(
+                    (_union([child[0] for child in children]), children, leaf)
+                )
+        return packed
+
+    def query(self, x, y):
+        """
+        Returns the indexes of the boxes containing the point.
+        """
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            bbox, children, leaf = stack.pop()
+            if not (bbox[0] <= x <= bbox[2] and bbox[1] <= y <= bbox[3]):
+                continue
+            for child in children:
+                child_bbox = child[0]
+                if not (
+                    child_bbox[0] <= x <= child_bbox[2]
+                    and child_bbox[1] <= y <= child_bbox[3]
+                ):
+                    continue
+                if leaf:
+                    found.append(child[1])
+                else:
+                    stack.append(child)
+        return found
+
+    def query_many(self, numpy, xs, ys):
+        """
+        Batch version of `query` over NumPy arrays: the points are pushed down the
+        tree together, each node keeping the indexes of the points inside its box.
+
+        Returns:
+            dict: box index -> array of the indexes of the points it contains.
+        """
+        found = {}
+        stack = [(self.root, numpy.arange(len(xs)))] if self.root else []
+        while stack:
+            (bbox, children, leaf), points = stack.pop()
+            px, py = xs[points], ys[points]
+            points = points[
+                (px >= bbox[0]) & (px <= bbox[2]) & (py >= bbox[1]) & (py <= bbox[3])
+            ]
+            if not len(points):
+                continue
+            if not leaf:
+                stack.extend((child, points) for child in children)
+                continue
+            px, py = xs[points], ys[points]
+            for child_bbox, index, _ in children:
+                inside = points[
+                    (px >= child_bbox[0])
+                    & (px <= child_bbox[2])
+                    & (py >= child_bbox[1])
+                    & (py <= child_bbox[3])
+                ]
+                if len(inside):
+                    found[index] = inside
+        return found
+
+
+def _union(bboxes):
+    return (
+        min(bbox[0] for bbox in bboxes),
+        min(bbox[1] for bbox in bboxes),
+        max(bbox[2] for bbox in bboxes),
+        max(bbox[3] for bbox in bboxes),
+    )
+
+
+class BoundaryIndex:
+    """
+    Point-in-polygon index over a GeometryStore.
+    Candidates are found by bounding box in the R-tree, then tested exactly.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.tree = STRTree([store.bbox(i) for i in range(len(store))])
+
+    def __len__(self):
+        return len(self.store)
+
+    @classmethod
+    def from_geojson(cls, data, key="code"):
+        return cls(GeometryStore.from_geojson(data, key=key))
+
+    @classmethod
+    def from_file(cls, path, key="code", mmap=True):
+        """
+        Load a GeoJSON file, or a directory written by `save`.
+        """
+        if os.path.isdir(path):
+            return cls(GeometryStore.load(path, mmap=mmap))
+        with open(path) as f:
+            return cls.from_geojson(json.load(f), key=key)
+
+    def save(self, directory):
+        self.store.save(directory)
+
+    def locate(self, latitude, longitude):
+        """
+        Returns the key of the feature containing the point, or None.
+        """
+        for feature in self.tree.query(longitude, latitude):
+            if self.store.contains(feature, longitude, latitude):
+                return self.store.keys[feature]
+        return None
+
+    def locate_many(self, latitudes, longitudes, chunk_size=100_000):
+        """
+        Batch version of `locate`, vectorized with NumPy when it is installed.
+
+        Returns:
+            list: the key of the containing feature (or None) for each point.
+        """
+        numpy = get_numpy()
+        if numpy is None:
+            return [self.locate(lat, lon) for lat, lon in zip(latitudes, longitudes)]
+        ys = numpy.asarray(latitudes, dtype=float)
+        xs = numpy.asarray(longitudes, dtype=float)
+        found = numpy.full(len(xs), -1, dtype=numpy.int64)
+        candidates_by_feature = self.tree.query_many(numpy, xs, ys)
+        for feature in sorted(candidates_by_feature):
+            candidates = candidates_by_feature[feature]
+            candidates = candidates[found[candidates] < 0]
+            for start in range(0, len(candidates), chunk_size):
+                chunk = candidates[start : start + chunk_size]
+                inside = self._contains_many(numpy, feature, xs[chunk], ys[chunk])
+                found[chunk[inside]] = feature
+        keys = self.store.keys
+        return [keys[i] if i >= 0 else None for i in found.tolist()]
+
+    def _contains_many(self, numpy, feature, xs, ys):
+        inside = numpy.zeros(len(xs), dtype=bool)
+        for ring in self.store.feature_rings(feature):
+            points = numpy.asarray(self.store.ring_points(ring), dtype=float)
+            x1, y1 = points[0::2], points[1::2]
+            x0, y0 = numpy.roll(x1, 1), numpy.roll(y1, 1)
+            for ex0, ey0, ex1, ey1 in zip(x0, y0, x1, y1):
+                if ey0 == ey1:
+                    continue
+                crosses = ((ey1 > ys) != (ey0 > ys)) & (
+                    xs < (ex1 - ex0) * (ys - ey0) / (ey1 - ey0) + ex0
+                )
+                inside ^= crosses
+        return inside
+
+
+# path -> BoundaryIndex. The polygons do not depend on the database, so they are not
+# memoized on the registry, which every write drops.
+_indexes = {}
+_load_lock = threading.Lock()
+
+
+def _load_index(setting):
+    path = getattr(settings, setting, None)
+    if not path:
+        raise ImproperlyConfigured(f"settings.{setting} is not set.")
+    try:
+        return _indexes[path]
+    except KeyError:
+        pass
+    with _load_lock:
+        if path not in _indexes:
+            _indexes[path] = BoundaryIndex.from_file(path)
+        return _indexes[path]
+
+
+def get_state_boundaries():
+    """
+    Returns the BoundaryIndex of `settings.NIGERIAN_STATES_STATE_BOUNDARIES`, loaded
+    once per path.
+    """
+    return _load_index("NIGERIAN_STATES_STATE_BOUNDARIES")
+
+
+def get_lga_boundaries():
+    """
+    Returns the BoundaryIndex of `settings.NIGERIAN_STATES_LGA_BOUNDARIES`, loaded
+    once per path.
+    """
+    return _load_index("NIGERIAN_STATES_LGA_BOUNDARIES")
+
+
+def resolve_lga(latitude, longitude):
+    """
+    Returns the LocalGovernment whose boundary contains the point, or None.
+    """
+    from nigerian_states.registry import get_registry
+
+    key = get_lga_boundaries().locate(latitude, longitude)
+    return get_registry().get_lga(key) if key is not None else None
+
+
+def resolve_lgas(latitudes, longitudes):
+    """
+    Batch version of `resolve_lga`.
+    """
+    from nigerian_states.registry import get_registry
+
+    registry = get_registry()
+    keys = get_lga_boundaries().locate_many(latitudes, longitudes)
+    return [registry.get_lga(key) if key is not None else None for key in keys]
+
+
+def resolve_state(latitude, longitude):
+    """
+    Returns the State whose boundary contains the point, or None.
+    """
+    from nigerian_states.registry import get_registry
+
+    key = get_state_boundaries().locate(latitude, longitude)
+    return get_registry().get_state(key) if key is not None else None
+
+
+def resolve_states(latitudes, longitudes):
+    """
+    Batch version of `resolve_state`.
+    """
+    from nigerian_states.registry import get_registry
+
+    registry = get_registry()
+    keys = get_state_boundaries().locate_many(latitudes, longitudes)
+    return [registry.get_state(key) if key is not None else None for key in keys]
+
+
+def resolve_zone(latitude, longitude):
+    """
+    Returns the GeoPoliticalZone of the state containing the point, or None.
+    """
+    state = resolve_state(latitude, longitude)
+    return state.zone if state is not None else None
@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+import json
+import os
+
+BUNDLE_NAME = "nigerian-states"
+
+
+def build_dataset(registry):
+    """
+    The full zone -> state -> lga hierarchy as plain python objects.
+    """
+    return {
+        "zones": [
+            {
+                "name": zone_name,
+                "states": [
+                    {
+                        "name": state.name,
+                        "code": state.code,
+                        "capital": state.capital,
+                        "lgas": [
+                            {"name": lga.name, "code": lga.code}
+                            for lga in registry.lgas_by_state[state.name]
+                        ],
+                    }
+                    for state in map(registry.states.get, state_names)
+                ],
+            }
+            for zone_name, state_names in registry.state_names_by_zone.items()
+        ]
+    }
+
+
+def _build_json(registry):
+    return json.dumps(
+        build_dataset(registry), separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def dataset_json(registry=None):
+    """
+    Returns the minified JSON bytes of the dataset, built once per registry.
+    """
+    if registry is None:
+        from nigerian_states.registry import get_registry
+
+        registry = get_registry()
+    return registry.memoize("bundle.json", _build_json)
+
+
+def dataset_hash(registry=None):
+    """
+    Returns the content hash of `dataset_json()`, used for file names and ETags.
+    """
+    if registry is None:
+        from nigerian_states.registry import get_registry
+
+        registry = get_registry()
+    return registry.memoize(
+        "bundle.hash",
+        lambda registry: hashlib.sha256(dataset_json(registry)).hexdigest()[:16],
+    )
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def write_bundle(directory):
+    """
+    Write the content hashed bundle into `directory`:
+        - nigerian-states.<hash>.json, the minified JSON
+        - nigerian-states.<hash>.mjs, the same data as an ES module default export
+        - a `.gz` (and `.br`, if `brotli` is installed) precompressed copy of both
+        - nigerian-states.manifest.json, mapping the unhashed names to the hashed ones
+
+    Returns:
+        list: paths of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    from nigerian_states.registry import get_registry
+
+    registry = get_registry()
+    data, content_hash = dataset_json(registry), dataset_hash(registry)
+    brotli = _brotli()
+    contents = {
+        f"{BUNDLE_NAME}.{content_hash}.json": data,
+        f"{BUNDLE_NAME}.{content_hash}.mjs": b"export default " + data + b";\n",
+    }
+    manifest = {
+        f"{BUNDLE_NAME}.json": f"{BUNDLE_NAME}.{content_hash}.json",
+        f"{BUNDLE_NAME}.mjs": f"{BUNDLE_NAME}.{content_hash}.mjs",
+    }
+    for name, content in list(contents.items()):
+        # mtime=0 keeps the compressed output identical across runs.
+        contents[f"{name}.gz"] = gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            contents[f"{name}.br"] = brotli.compress(content)
+    contents[f"{BUNDLE_NAME}.manifest.json"] = json.dumps(manifest).encode()
+    paths = []
+    for name, content in contents.items():
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        paths.append(path)
+    return paths
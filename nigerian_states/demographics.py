@@ -0,0 +1,181 @@
+"""
+Census population, area and density of the states and local governments, as columns.
+
+The figures are read from the in-memory registry once, into one array per attribute
+(`population`, `area` in square kilometres and `density` per square kilometre), aligned
+with an array of the primary keys. Analytics then work on whole arrays, e.g. normalizing
+a metric per capita, instead of querying the models.
+
+The packaged dataset has the 2006 census figures of the states. LGA figures are not
+shipped, they are NaN until set on the `LocalGovernment` rows (e.g. by `sync_dataset`).
+
+NumPy is optional: without it the columns are `array.array("d")` and the functions
+return lists.
+"""
+
+import math
+from array import array
+
+from nigerian_states.utils import get_numpy
+
+COLUMNS = ("population", "area", "density")
+LEVELS = ("state", "lga")
+
+
+def _float(value):
+    return math.nan if value is None else float(value)
+
+
+class Table:
+    """
+    The columns of the states or of the local governments, one row per object in
+    primary key order (the registry's order).
+
+    Attributes:
+        - ids: the primary key of each row
+        - names: the name of each row ("State: LGA" for local governments)
+        - columns: column name -> array of floats, NaN where unknown
+    """
+
+    def __init__(self, objects, names):
+        numpy = get_numpy()
+        self.names = tuple(names)
+        ids = [obj.pk for obj in objects]
+        population = [_float(obj.population) for obj in objects]
+        area = [_float(obj.area) for obj in objects]
+        if numpy is None:
+            self.ids = array("q", ids)
+            density = [
+                people / size if size else math.nan
+                for people, size in zip(population, area)
+            ]
+            self.columns = {
+                "population": array("d", population),
+                "area": array("d", area),
+                "density": array("d", density),
+            }
+            self._positions = {pk: position for position, pk in enumerate(ids)}
+        else:
+            self.ids = numpy.asarray(ids, dtype=numpy.int64)
+            population = numpy.asarray(population, dtype=float)
+            area = numpy.asarray(area, dtype=float)
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                density = numpy.where(area > 0, population / area, numpy.nan)
+            self.columns = {"population": population, "area": area, "density": density}
+            for column in self.columns.values():
+                column.flags.writeable = False
+            self.ids.flags.writeable = False
+            self._order = numpy.argsort(self.ids, kind="stable")
+            self._sorted_ids = self.ids[self._order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, column):
+        try:
+            return self.columns[column]
+        except KeyError:
+            message = f"column must be one of {COLUMNS}, not {column!r}."
+            raise KeyError(message) from None
+
+    def positions(self, ids):
+        """
+        The row of each primary key of `ids`, -1 for unknown ones.
+        """
+        numpy = get_numpy()
+        if numpy is None:
+            return [self._positions.get(pk, -1) for pk in ids]
+        ids = numpy.asarray(ids, dtype=numpy.int64)
+        if not len(self._sorted_ids):
+            return numpy.full(ids.shape, -1, dtype=numpy.intp)
+        found = numpy.searchsorted(self._sorted_ids, ids)
+        found = numpy.minimum(found, len(self._sorted_ids) - 1)
+        return numpy.where(self._sorted_ids[found] == ids, self._order[found], -1)
+
+    def take(self, column, ids):
+        """
+        The values of `column` for the primary keys `ids`, NaN for unknown ones.
+        """
+        values = self[column]
+        positions = self.positions(ids)
+        numpy = get_numpy()
+        if numpy is None:
+            return [
+                values[position] if position >= 0 else math.nan
+                for position in positions
+            ]
+        return numpy.where(positions >= 0, values[positions], numpy.nan)
+
+    def per_capita(self, values, ids=None):
+        """
+        Divide `values` by the population of their rows: one value per row of the
+        table if `ids` is None, else one value per primary key of `ids`.
+        A 2-d `values` array (e.g. one column per day) is divided row-wise.
+        NaN where the population is unknown.
+        """
+        population = self["population"] if ids is None else self.take("population", ids)
+        numpy = get_numpy()
+        if numpy is None:
+            return [
+                value / people if people else math.nan
+                for value, people in zip(values, population)
+            ]
+        values = numpy.asarray(values, dtype=float)
+        if len(values) != len(population):
+            raise ValueError(
+                f"values has {len(values)} rows, expected {len(population)}."
+            )
+        population = population.reshape((-1,) + (1,) * (values.ndim - 1))
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return numpy.where(population > 0, values / population, numpy.nan)
+
+
+class Demographics:
+    """
+    The `Table` of the states and of the local governments of a registry.
+    """
+
+    def __init__(self, registry):
+        self.states = Table(registry.states.values(), registry.states)
+        self.lgas = Table(
+            registry.lgas, (f"{lga.state.name}: {lga.name}" for lga in registry.lgas)
+        )
+
+    def table(self, level):
+        if level == "state":
+            return self.states
+        if level == "lga":
+            return self.lgas
+        raise ValueError(f"level must be one of {LEVELS}, not {level!r}.")
+
+
+def get_demographics(using=None):
+    """
+    Returns the Demographics of the registry of the database `using`, built once
+    per registry.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry(using).memoize("demographics", Demographics)
+
+
+def state_table(using=None):
+    """
+    Returns the Table of the states: `state_table()["population"]`, `state_table().ids`.
+    """
+    return get_demographics(using).states
+
+
+def lga_table(using=None):
+    """
+    Returns the Table of the local governments.
+    """
+    return get_demographics(using).lgas
+
+
+def per_capita(values, ids=None, level="state", using=None):
+    """
+    Divide `values` by the population of the states (or LGAs, with level="lga"),
+    see `Table.per_capita`.
+    """
+    return get_demographics(using).table(level).per_capita(values, ids)
@@ -1,11 +1,12 @@
 from django import forms
 from nigerian_states.enums import PoliticalZones
-from nigerian_states.models import State, LocalGovernment, GeoPoliticalZone
 from django.conf import settings
-from django.db import connection
+from nigerian_states.profiling import profiled
+from nigerian_states.utils import get_database
 
 
-DEFAULT_POLITICAL_ZONES = getattr(settings, "DEFAULT_GEO_POLITICAL_ZONES", [])
+def _describe_field(field):
+    return f"{type(field).__name__}(zones={list(field.get_zones())!r})"
 
 
 class BaseField(forms.ChoiceField):
@@ -15,13 +16,19 @@ class BaseField(forms.ChoiceField):
         - empty_label: The first option in the dropdown
         - zones: Geo-Political Zones you want the fields choices to be limited to.
           This would override the `settings.DEFAULT_GEO_POLITICAL_ZONES`
+        - using: database alias the choices are read from. This would override
+          `settings.NIGERIAN_STATES_DATABASE` and the database routers.
     """
 
     def __init__(self, *args, **kwargs):
         self.empty_label = kwargs.pop("empty_label", None)
         self.zones = kwargs.pop("zones", [])
+        self.using = kwargs.pop("using", None)
         kwargs["choices"] = self.get_choices()
         super().__init__(*args, **kwargs)
+        if type(self).get_choices is BaseField.get_choices:
+            # the choices are the memoized ones, and so is the set of their values.
+            self._valid_values = self.get_zone_choices()[1]
 
     def get_zones(self):
         """
@@ -42,8 +49,69 @@ class BaseField(forms.ChoiceField):
         return geo_zones
         # return GeoPoliticalZone.objects.filter(name__in=geo_zones)
 
+    def get_database(self):
+        """
+        The database alias the choices are read from, see `utils.get_database`.
+        """
+        return get_database(self.using)
+
+    def get_empty_label(self):
+        return self.empty_label or ""
+
+    def get_choices_key(self):
+        """
+        What, besides the zones, the choices of the field depend on.
+        """
+        return type(self)
+
+    def build_choices(self, registry, mask):
+        """
+        Returns the (value, label) choices in the zones of `mask`, without the empty choice.
+        """
+        return ()
+
+    def get_zone_choices(self):
+        """
+        Returns the choices in the zones of the field (without the empty choice) and
+        the set of their values, as a tuple. They are built once per zone subset, and
+        shared by every field limited to the same zones until the data changes.
+        """
+        from nigerian_states.registry import get_registry
+
+        registry = get_registry(self.using)
+        mask = registry.zone_mask(self.get_zones())
+
+        def build(registry):
+            choices = tuple(self.build_choices(registry, mask))
+            return choices, frozenset([""] + [str(value) for value, _ in choices])
+
+        return registry.memoize(("choices", self.get_choices_key(), mask), build)
+
+    @profiled(describe=_describe_field)
     def get_choices(self):
-        return [("", "")]
+        return [("", self.get_empty_label())] + list(self.get_zone_choices()[0])
+
+    @property
+    def choices(self):
+        return self._choices
+
+    @choices.setter
+    def choices(self, value):
+        forms.ChoiceField.choices.fset(self, value)
+        # built on the first validation, unless the choices came from `get_zone_choices`.
+        self._valid_values = None
+
+    def valid_value(self, value):
+        if self._valid_values is None:
+            # a set of the values, so validation is a lookup instead of a scan of the choices.
+            valid_values = set()
+            for key, label in self._choices:
+                if isinstance(label, (list, tuple)):
+                    valid_values.update(str(k) for k, _ in label)
+                else:
+                    valid_values.add(str(key))
+            self._valid_values = frozenset(valid_values)
+        return str(value) in self._valid_values
 
 
 class GeoPoliticalZoneField(BaseField):
@@ -62,16 +130,11 @@ class GeoPoliticalZoneField(BaseField):
     ```
     """
 
-    def get_choices(self):
-        empty_label = self.empty_label or "Select a Geo-Political Zone"
-        choices = [("", empty_label)]
-        table_names = connection.introspection.table_names()
-        if GeoPoliticalZone._meta.db_table in table_names:
-            qs = GeoPoliticalZone.objects.all()
-            if self.get_zones():
-                qs = qs.filter(name__in=self.get_zones())
-            choices += [(zone.name, zone.name) for zone in qs]
-        return choices
+    def get_empty_label(self):
+        return self.empty_label or "Select a Geo-Political Zone"
+
+    def build_choices(self, registry, mask):
+        return [(name, name) for name in registry.zones if registry.in_mask(mask, name)]
 
 
 class StateField(BaseField):
@@ -92,37 +155,48 @@ class StateField(BaseField):
     #todo: Add default `state` and `lga`, the default would be preselected on the fields.
     """
 
-    def get_choices(self):
-        empty_label = self.empty_label or "Select a State from the dropdown"
-        choices = [("", empty_label)]
-        table_names = connection.introspection.table_names()
-        if State._meta.db_table in table_names:
-            qs = State.objects.all()
-            if self.get_zones():
-                qs = qs.filter(zone__name__in=self.get_zones())
-            choices += [(state.name, state.name) for state in qs]
-        return choices
+    def get_empty_label(self):
+        return self.empty_label or "Select a State from the dropdown"
+
+    def build_choices(self, registry, mask):
+        return [
+            (state.name, state.name)
+            for state in registry.states.values()
+            if registry.in_mask(mask, state.zone.name)
+        ]
 
 
 class LocalGovernmentField(BaseField):
     """
     A custom form field for selecting Local Governments in Nigeria.
+    kwargs:
+        - qualified: use "State: LGA" as the value of each choice instead of the LGA name.
+          Some LGA names (e.g. "Obi", "Bassa") exist in more than one state, and only the
+          qualified values identify a single LGA.
     Example usage:
     ```
     lga = LocalGovernmentField(label='Local Governments',
                                 help_text='Select a LGA from the dropdown',
                                 zones=[PoliticalZones.NORTH_CENTRAL, PoliticalZones.NORTH_EAST],
+                                qualified=True,
                                 widget=forms.Select(attrs={'class': 'select form-select select2', 'required': 'required'}))
     ```
     """
 
-    def get_choices(self):
-        empty_label = self.empty_label or "Select a LG"
-        choices = choices = [("", empty_label)]
-        table_names = connection.introspection.table_names()
-        if LocalGovernment._meta.db_table in table_names:
-            qs = LocalGovernment.objects.all()
-            if self.get_zones():
-                qs = qs.filter(state__zone__name__in=self.get_zones())
-            choices += [(lga.name, f"{lga.state.name}: {lga.name}") for lga in qs]
+    def __init__(self, *args, **kwargs):
+        self.qualified = kwargs.pop("qualified", False)
+        super().__init__(*args, **kwargs)
+
+    def get_empty_label(self):
+        return self.empty_label or "Select a LG"
+
+    def get_choices_key(self):
+        return type(self), self.qualified
+
+    def build_choices(self, registry, mask):
+        choices = []
+        for lga in registry.lgas:
+            if registry.in_mask(mask, lga.state.zone.name):
+                label = f"{lga.state.name}: {lga.name}"
+                choices.append((label if self.qualified else lga.name, label))
         return choices
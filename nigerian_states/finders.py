@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage
+from django.db import connections
+
+from nigerian_states.bundle import BUNDLE_NAME, write_bundle
+
+
+def default_bundle_dir():
+    """
+    A directory of the temporary directory, per project (settings module and
+    STATIC_ROOT), so that projects sharing a machine do not collect each other's bundle.
+    """
+    project = f"{settings.SETTINGS_MODULE}:{getattr(settings, 'STATIC_ROOT', '')}"
+    digest = hashlib.sha256(project.encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"nigerian_states_bundle_{digest}")
+
+
+class DatasetBundleFinder(BaseFinder):
+    """
+    A staticfiles finder which (re)writes the dataset bundle and exposes it under
+    `nigerian_states/`, so that `collectstatic` picks it up.
+    Add "nigerian_states.finders.DatasetBundleFinder" to `settings.STATICFILES_FINDERS`.
+    The bundle is written to `settings.NIGERIAN_STATES_BUNDLE_DIR`, or to a per project
+    temporary directory, from the database, which must have been migrated and loaded.
+    """
+
+    prefix = "nigerian_states"
+
+    def __init__(self, *args, **kwargs):
+        self.location = (
+            getattr(settings, "NIGERIAN_STATES_BUNDLE_DIR", None)
+            or default_bundle_dir()
+        )
+        self.storage = FileSystemStorage(location=self.location)
+        self.storage.prefix = self.prefix
+        self._written = False
+
+    def write(self):
+        if self._written:
+            return
+        from nigerian_states.models import State
+        from nigerian_states.registry import get_registry
+        from nigerian_states.utils import get_database
+
+        using = get_database()
+        if State._meta.db_table not in connections[using].introspection.table_names():
+            raise ImproperlyConfigured(
+                "DatasetBundleFinder writes the bundle from the database, run `migrate` "
+                "and load the data before `collectstatic`."
+            )
+        if not get_registry().states:
+            raise ImproperlyConfigured(
+                "DatasetBundleFinder found no states in the database, load the data "
+                "before `collectstatic`."
+            )
+        paths = {os.path.basename(path) for path in write_bundle(self.location)}
+        # the bundles of the previous versions of the data.
+        for name in os.listdir(self.location):
+            if name.startswith(f"{BUNDLE_NAME}.") and name not in paths:
+                os.remove(os.path.join(self.location, name))
+        self._written = True
+
+    def find(self, path, all=False):
+        prefix = f"{self.prefix}/"
+        if not path.startswith(prefix):
+            return [] if all else None
+        self.write()
+        match = self.storage.path(path[len(prefix) :])
+        if not os.path.isfile(match):
+            return [] if all else None
+        return [match] if all else match
+
+    def list(self, ignore_patterns):
+        self.write()
+        for name in sorted(os.listdir(self.location)):
+            yield name, self.storage
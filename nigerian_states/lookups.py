@@ -0,0 +1,46 @@
+from django.db.models.lookups import In
+
+from nigerian_states.utils import lga_names_in_state, lga_names_in_zone, names_in_zone
+
+
+class StateInZone(In):
+    """
+    Filter a CharField holding state names by geo-political zone(s).
+    The zone is expanded to a literal `IN (...)` list of state names, so no join is needed.
+
+    Usage: Customer.objects.filter(state__in_zone="South West")
+    """
+
+    lookup_name = "in_zone"
+
+    def get_prep_lookup(self):
+        self.rhs = names_in_zone(self.rhs)
+        return super().get_prep_lookup()
+
+
+class LocalGovernmentInZone(In):
+    """
+    Filter a CharField holding local government names by geo-political zone(s).
+
+    Usage: Order.objects.filter(lga__lga_in_zone="South West")
+    """
+
+    lookup_name = "lga_in_zone"
+
+    def get_prep_lookup(self):
+        self.rhs = lga_names_in_zone(self.rhs)
+        return super().get_prep_lookup()
+
+
+class LocalGovernmentInState(In):
+    """
+    Filter a CharField holding local government names by state(s).
+
+    Usage: Order.objects.filter(lga__lga_in_state="Lagos")
+    """
+
+    lookup_name = "lga_in_state"
+
+    def get_prep_lookup(self):
+        self.rhs = lga_names_in_state(self.rhs)
+        return super().get_prep_lookup()
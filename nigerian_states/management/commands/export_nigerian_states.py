@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from nigerian_states.bundle import write_bundle
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the content hashed, minified and precompressed JSON / ES module "
+        "bundle of the zones, states and local governments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            default=getattr(settings, "NIGERIAN_STATES_BUNDLE_DIR", None),
+            help="Directory to write to, defaults to settings.NIGERIAN_STATES_BUNDLE_DIR.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output_dir"]:
+            raise CommandError(
+                "Pass --output-dir or set settings.NIGERIAN_STATES_BUNDLE_DIR."
+            )
+        for path in write_bundle(options["output_dir"]):
+            self.stdout.write(path)
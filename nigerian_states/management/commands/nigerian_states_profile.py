@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from nigerian_states.profiling import hotspots
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the templates and nigerian_states tags / fields taking the most time, "
+        "from the records of the profiling middleware."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=getattr(settings, "NIGERIAN_STATES_PROFILING_LOG", None),
+            help="JSON lines file to read, defaults to settings.NIGERIAN_STATES_PROFILING_LOG.",
+        )
+        parser.add_argument(
+            "--top", type=int, default=20, help="Number of hotspots to report."
+        )
+
+    def handle(self, *args, **options):
+        if not options["file"]:
+            raise CommandError(
+                "Pass --file or set settings.NIGERIAN_STATES_PROFILING_LOG."
+            )
+        try:
+            with open(options["file"], encoding="utf-8") as f:
+                ranked = hotspots(f, top=options["top"])
+        except FileNotFoundError:
+            raise CommandError(f"{options['file']} does not exist.")
+        self.stdout.write(
+            f"{'ms':>10} {'queries':>8} {'calls':>7}  template / function"
+        )
+        for total in ranked:
+            self.stdout.write(
+                f"{total['ms']:>10.3f} {total['queries']:>8} {total['calls']:>7}  "
+                f"{total['template'] or '-'} / {total['name']}"
+            )
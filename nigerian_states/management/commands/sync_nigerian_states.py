@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from nigerian_states.sync import sync_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the zones, states and local governments to the packaged dataset, "
+        "applying only the inserts, updates and renames."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Database to update, defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the changes without applying them.",
+        )
+
+    def handle(self, *args, **options):
+        changes = sync_dataset(using=options["database"], dry_run=options["dry_run"])
+        for model, old_name, new_name in changes.renamed:
+            self.stdout.write(f"{model.__name__}: {old_name} -> {new_name}")
+        action = "To apply" if options["dry_run"] else "Applied"
+        self.stdout.write(
+            f"{action} version {changes.version}: {changes.inserted} inserted, "
+            f"{changes.updated} updated, {len(changes.renamed)} renamed."
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from nigerian_states.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Build every cache of nigerian_states and report how long each step took."
+
+    def handle(self, *args, **options):
+        for step, seconds in warm_up().items():
+            self.stdout.write(f"{step}: {seconds * 1000:.1f}ms")
@@ -0,0 +1,263 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from nigerian_states.fields import LocalGovernmentField, StateField
+
+# "state" / "lga" -> (packaged code -> number, number -> packaged code)
+_numbers = {}
+
+
+def code_numbers(level):
+    """
+    The fixed mapping between the integer codes of the fields and the packaged codes
+    ("NG-LA", "NG-LA-05"): the primary keys of the rows in the packaged fixture.
+    It does not depend on the keys a database assigned to its rows (e.g. the rows
+    inserted by `sync_dataset`), so stored codes mean the same in every environment.
+    Rows without a packaged code have no integer code.
+
+    Returns:
+        tuple: (code -> number, number -> code) for level "state" or "lga".
+    """
+    if not _numbers:
+        from nigerian_states.sync import fixture_objects
+
+        levels = {
+            "nigerian_states.state": "state",
+            "nigerian_states.localgovernment": "lga",
+        }
+        numbers = {"state": {}, "lga": {}}
+        for obj in fixture_objects():
+            level_name = levels.get(obj["model"])
+            if level_name and obj["fields"].get("code"):
+                numbers[level_name][obj["fields"]["code"]] = obj["pk"]
+        for level_name, by_code in numbers.items():
+            _numbers[level_name] = (
+                by_code,
+                {number: code for code, number in by_code.items()},
+            )
+    return _numbers[level]
+
+
+class StateCode(int):
+    """
+    An integer state code (see `code_numbers`) which resolves its name, capital
+    and zone through the in-memory registry of the database `using`.
+    """
+
+    def __new__(cls, value, using=None):
+        code = super().__new__(cls, value)
+        code.using = using
+        return code
+
+    @property
+    def state(self):
+        from nigerian_states.registry import get_registry
+
+        code = code_numbers("state")[1].get(int(self))
+        return get_registry(self.using).states_by_code.get(code)
+
+    @property
+    def name(self):
+        state = self.state
+        return state.name if state else ""
+
+    @property
+    def capital(self):
+        state = self.state
+        return state.capital if state else ""
+
+    @property
+    def zone(self):
+        state = self.state
+        return state.zone.name if state else ""
+
+
+class LocalGovernmentCode(int):
+    """
+    An integer local government code (see `code_numbers`) which resolves its name,
+    state and zone through the in-memory registry of the database `using`.
+    """
+
+    def __new__(cls, value, using=None):
+        code = super().__new__(cls, value)
+        code.using = using
+        return code
+
+    @property
+    def lga(self):
+        from nigerian_states.registry import get_registry
+
+        code = code_numbers("lga")[1].get(int(self))
+        return get_registry(self.using).lgas_by_code.get(code)
+
+    @property
+    def name(self):
+        lga = self.lga
+        return lga.name if lga else ""
+
+    @property
+    def state(self):
+        lga = self.lga
+        return lga.state.name if lga else ""
+
+    @property
+    def zone(self):
+        lga = self.lga
+        return lga.state.zone.name if lga else ""
+
+
+class CodeAttribute(DeferredAttribute):
+    """
+    Converts assigned names or plain integers to the field's code class.
+    """
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = self.field.to_python(value)
+
+
+class BaseCodeField(models.PositiveSmallIntegerField):
+    """
+    Base class for the integer coded fields.
+    Stores a small integer instead of a name, names are accepted on assignment
+    and in filters (`Customer.objects.filter(state="Lagos")`).
+    kwargs:
+        - zones: Geo-Political Zones the paired form field is limited to.
+        - using: database alias the names are resolved from, see `utils.get_database`.
+    """
+
+    descriptor_class = CodeAttribute
+    code_class = int
+    form_class = None
+
+    def __init__(self, *args, **kwargs):
+        self.zones = kwargs.pop("zones", [])
+        self.using = kwargs.pop("using", None)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.zones:
+            kwargs["zones"] = list(self.zones)
+        if self.using:
+            kwargs["using"] = self.using
+        return name, path, args, kwargs
+
+    def make_code(self, value):
+        return self.code_class(value, using=self.using)
+
+    def lookup_code(self, name):
+        """
+        Returns the code of the object called `name`, or None if there is none.
+        """
+        raise NotImplementedError
+
+    def lookup_name(self, code):
+        """
+        Returns the name of the object with `code`, or "" if there is none.
+        """
+        return self.make_code(code).name
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.make_code(value)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            # e.g. a blank form field, "" is not an integer code.
+            return None
+        if isinstance(value, self.code_class) and value.using == self.using:
+            return value
+        if isinstance(value, str) and not value.isdigit():
+            code = self.lookup_code(value)
+            if code is None:
+                raise ValidationError(
+                    "'%(value)s' is not a valid choice.",
+                    code="invalid_choice",
+                    params={"value": value},
+                )
+            return self.make_code(code)
+        return self.make_code(super().to_python(value))
+
+    def get_prep_value(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, str) and not value.isdigit():
+            value = self.to_python(value)
+        return super().get_prep_value(value)
+
+    def value_from_object(self, obj):
+        # the paired form fields work with names.
+        value = super().value_from_object(obj)
+        if value is None:
+            return value
+        return self.lookup_name(value)
+
+    def formfield(self, **kwargs):
+        # skip IntegerField.formfield, the paired form fields do not take min/max values.
+        defaults = {
+            "form_class": self.form_class,
+            "zones": self.zones,
+            "using": self.using,
+        }
+        defaults.update(kwargs)
+        return models.Field.formfield(self, **defaults)
+
+
+class StateCodeField(BaseCodeField):
+    """
+    A model field which stores a state as a small integer code.
+    The value exposes `name`, `capital` and `zone`, and the form field is `StateField`.
+
+    Example usage:
+    ```
+    class Customer(models.Model):
+        state = StateCodeField(zones=[PoliticalZones.SOUTH_WEST])
+
+    customer.state = "Lagos"
+    customer.state.name, customer.state.zone  # ("Lagos", "South West")
+    ```
+    """
+
+    code_class = StateCode
+    form_class = StateField
+
+    def lookup_code(self, name):
+        from nigerian_states.registry import get_registry
+
+        state = get_registry(self.using).get_state(name)
+        return code_numbers("state")[0].get(state.code) if state else None
+
+
+class LocalGovernmentCodeField(BaseCodeField):
+    """
+    A model field which stores a local government as a small integer code.
+    The value exposes `name`, `state` and `zone`, and the form field is a qualified
+    `LocalGovernmentField`. Names shared by several states must be qualified as "State: LGA".
+
+    Example usage:
+    ```
+    class Order(models.Model):
+        lga = LocalGovernmentCodeField()
+
+    order.lga = "Lagos: Badagry"
+    order.lga.name, order.lga.state  # ("Badagry", "Lagos")
+    ```
+    """
+
+    code_class = LocalGovernmentCode
+    form_class = LocalGovernmentField
+
+    def lookup_name(self, code):
+        lga = self.make_code(code).lga
+        return f"{lga.state.name}: {lga.name}" if lga else ""
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{"qualified": True, **kwargs})
+
+    def lookup_code(self, name):
+        from nigerian_states.registry import get_registry
+
+        lga = get_registry(self.using).get_lga(name)
+        return code_numbers("lga")[0].get(lga.code) if lga else None
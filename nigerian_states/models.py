@@ -1,10 +1,42 @@
-from django.db import models
+from django.db import models, router, transaction
 from nigerian_states.enums import PoliticalZones
 
 
+def _density(obj):
+    """
+    Population per square kilometre, or None if either is unknown.
+    """
+    if obj.population is None or not obj.area:
+        return None
+    return obj.population / obj.area
+
+
+class GeoPoliticalZoneQuerySet(models.QuerySet):
+    def with_full_tree(self):
+        """
+        Load the zones, their states and the states' local governments in three queries.
+        `all_states`, `all_lgas`, `total_states`, `total_lgas`, `State.lgas` and
+        `State.total_lgas` then use the prefetched objects instead of querying.
+
+        Usage: GeoPoliticalZone.objects.with_full_tree()
+        """
+        return self.prefetch_related("states", "states__localgovernment_set")
+
+    def with_counts(self):
+        """
+        Annotate `num_states` and `num_lgas`, which `total_states` and `total_lgas` use.
+        """
+        return self.annotate(
+            num_states=models.Count("states", distinct=True),
+            num_lgas=models.Count("local_governments", distinct=True),
+        )
+
+
 class GeoPoliticalZone(models.Model):
     name = models.CharField(max_length=55, choices=PoliticalZones.choices)
 
+    objects = GeoPoliticalZoneQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -14,39 +46,227 @@ class GeoPoliticalZone(models.Model):
 
     @property
     def total_states(self):
+        if "num_states" in self.__dict__:
+            return self.num_states
         return self.all_states.count()
 
     @property
     def all_lgas(self):
-        return LocalGovernment.objects.filter(state__in=self.all_states)
+        """
+        The local governments of the zone's states. A list when the states are
+        prefetched (e.g. by `with_full_tree`), else a QuerySet filtering on the
+        denormalized `LocalGovernment.zone`, without a join.
+        """
+        states = getattr(self, "_prefetched_objects_cache", {}).get("states")
+        if states is None:
+            return self.local_governments.all()
+        # a no-op for states whose local governments are already prefetched.
+        models.prefetch_related_objects(states, "localgovernment_set")
+        return [lga for state in states for lga in state.lgas]
 
     @property
     def total_lgas(self):
-        return self.all_lgas.count()
+        if "num_lgas" in self.__dict__:
+            return self.num_lgas
+        lgas = self.all_lgas
+        return len(lgas) if isinstance(lgas, list) else lgas.count()
+
+
+class StateQuerySet(models.QuerySet):
+    """
+    Bulk writes changing the zone of states also update the denormalized
+    `LocalGovernment.zone` of their local governments.
+    """
+
+    def update(self, **kwargs):
+        if "zone" not in kwargs and "zone_id" not in kwargs:
+            return super().update(**kwargs)
+        using = router.db_for_write(self.model, **self._hints)
+        with transaction.atomic(using=using, savepoint=False):
+            ids = list(self.values_list("pk", flat=True))
+            updated = super().update(**kwargs)
+            LocalGovernment.objects.using(using).filter(state_id__in=ids).sync_zones()
+        return updated
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        using = router.db_for_write(self.model, **self._hints)
+        with transaction.atomic(using=using, savepoint=False):
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            if "zone" in fields or "zone_id" in fields:
+                LocalGovernment.objects.using(using).filter(
+                    state_id__in=[obj.pk for obj in objs]
+                ).sync_zones()
+        return updated
 
 
 class State(models.Model):
     name = models.CharField(max_length=100, db_index=True)
+    # ISO 3166-2:NG subdivision code, e.g. "NG-LA"
+    code = models.CharField(max_length=5, unique=True, null=True, blank=True)
     capital = models.CharField(max_length=100)
     zone = models.ForeignKey(
         GeoPoliticalZone, on_delete=models.CASCADE, related_name="states"
     )
+    # representative point of the state, the packaged data uses the capital.
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # 2006 census population, and area in square kilometres.
+    population = models.PositiveIntegerField(null=True, blank=True)
+    area = models.FloatField(null=True, blank=True)
+
+    objects = StateQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    # the zone the row was loaded with, None for rows not loaded from the database.
+    _loaded_zone_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_zone_id = instance.__dict__.get("zone_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        new = self._state.adding and self.pk is None
+        super().save(*args, **kwargs)
+        if new or self.zone_id == self._loaded_zone_id:
+            return
+        # keep the denormalized `LocalGovernment.zone` in step with the state.
+        self.localgovernment_set.exclude(zone_id=self.zone_id).update(
+            zone_id=self.zone_id
+        )
+        self._loaded_zone_id = self.zone_id
+
     @property
     def total_lgas(self):
+        if "num_lgas" in self.__dict__:
+            return self.num_lgas
         return self.localgovernment_set.count()
 
     @property
     def lgas(self):
         return self.localgovernment_set.all()
 
+    @property
+    def density(self):
+        return _density(self)
+
+
+class LocalGovernmentQuerySet(models.QuerySet):
+    """
+    Bulk writes set the denormalized `LocalGovernment.zone` from the state.
+    """
+
+    def sync_zones(self):
+        """
+        Set the zone of the local governments whose zone is not their state's.
+
+        Returns:
+            int: number of local governments updated.
+        """
+        zone = State.objects.filter(pk=models.OuterRef("state_id")).values("zone_id")
+        return self.filter(
+            models.Q(zone__isnull=True) | ~models.Q(zone_id=models.Subquery(zone))
+        ).update(zone_id=models.Subquery(zone))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        state_field = self.model._meta.get_field("state")
+        # the zones of the states not set as objects are read in one query.
+        state_ids = {
+            obj.state_id
+            for obj in objs
+            if obj.state_id is not None and not state_field.is_cached(obj)
+        }
+        zones = {}
+        if state_ids:
+            zones = dict(
+                State.objects.using(self.db)
+                .filter(pk__in=state_ids)
+                .values_list("pk", "zone_id")
+            )
+        for obj in objs:
+            if state_field.is_cached(obj):
+                obj.zone_id = obj.state.zone_id if obj.state else None
+            else:
+                obj.zone_id = zones.get(obj.state_id)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        state = kwargs.get("state", kwargs.get("state_id"))
+        if state is not None and "zone" not in kwargs and "zone_id" not in kwargs:
+            state_id = state.pk if isinstance(state, State) else state
+            kwargs["zone_id"] = models.Subquery(
+                State.objects.filter(pk=state_id).values("zone_id")
+            )
+        return super().update(**kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        using = router.db_for_write(self.model, **self._hints)
+        with transaction.atomic(using=using, savepoint=False):
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            if "state" in fields or "state_id" in fields:
+                self.model.objects.using(using).filter(
+                    pk__in=[obj.pk for obj in objs]
+                ).sync_zones()
+        return updated
+
 
 class LocalGovernment(models.Model):
     state = models.ForeignKey(State, on_delete=models.CASCADE)
     name = models.CharField(max_length=100, db_index=True)
+    # stable code of the form "<state code>-<nn>", e.g. "NG-LA-05"
+    code = models.CharField(max_length=10, unique=True, null=True, blank=True)
+    # denormalized copy of `state.zone`, so zone scoped LGA queries (`zone.all_lgas`,
+    # `filter(zone=...)`) do not need to join through the `State` table. It is kept
+    # in step by `save` and by the bulk writes of the managers of both models.
+    zone = models.ForeignKey(
+        GeoPoliticalZone,
+        on_delete=models.CASCADE,
+        related_name="local_governments",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # not part of the packaged data, see `nigerian_states.demographics`.
+    population = models.PositiveIntegerField(null=True, blank=True)
+    area = models.FloatField(null=True, blank=True)
+
+    objects = LocalGovernmentQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.state.name}: {self.name}"
+
+    def save(self, *args, **kwargs):
+        if self.state_id is not None:
+            self.zone_id = self.state.zone_id
+        super().save(*args, **kwargs)
+
+    @property
+    def density(self):
+        return _density(self)
+
+
+class DatasetVersion(models.Model):
+    """
+    A version of the packaged dataset applied by the `sync_nigerian_states` command.
+    The latest one is the cache generation of the in-memory registry.
+    """
+
+    version = models.CharField(max_length=20)
+    applied_at = models.DateTimeField(auto_now_add=True)
+    inserted = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    renamed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        get_latest_by = "id"
+
+    def __str__(self):
+        return self.version
@@ -0,0 +1,194 @@
+"""
+Opt-in profiling of the template tags and form field choices of the package.
+
+With `settings.NIGERIAN_STATES_PROFILING = True` and `ProfilingMiddleware` installed, each
+call to a profiled function (the tags of `state_tags` and `BaseField.get_choices`) made
+while handling a request is recorded with the template it was called from, its
+arguments, the database queries it issued and its wall time. A summary is sent in the
+`X-Nigerian-States-Profile` response header and logged, and the records are appended
+(as JSON lines) to `settings.NIGERIAN_STATES_PROFILING_LOG`, if set, for the
+`nigerian_states_profile` command to report the hotspots.
+
+Outside of a profiled request, a profiled function costs one context variable lookup.
+"""
+
+import functools
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("nigerian_states.profiling")
+
+HEADER = "X-Nigerian-States-Profile"
+
+_records = ContextVar("nigerian_states_profiling_records", default=None)
+_active = ContextVar("nigerian_states_profiling_active", default=False)
+
+
+def is_enabled():
+    return getattr(settings, "NIGERIAN_STATES_PROFILING", False)
+
+
+def _template_name():
+    """
+    The name of the template being rendered by the caller, found from the `context`
+    of the template node in the call stack.
+    """
+    from django.template.context import Context
+
+    frame = sys._getframe(2)
+    while frame is not None:
+        context = frame.f_locals.get("context")
+        if isinstance(context, Context) and context.template is not None:
+            template = context.template
+            origin = getattr(template, "origin", None)
+            return getattr(origin, "template_name", None) or template.name
+        frame = frame.f_back
+    return None
+
+
+def _describe(*args, **kwargs):
+    arguments = [repr(arg) for arg in args]
+    arguments += [f"{key}={value!r}" for key, value in kwargs.items()]
+    return ", ".join(arguments)
+
+
+def profiled(func=None, describe=None):
+    """
+    Record the calls to `func` made inside `capture()` (or a profiled request).
+    Calls made by a profiled function are part of its record, not recorded on their own.
+
+    Args:
+        describe: describe(*args, **kwargs) returns the arguments as recorded,
+            defaults to their repr.
+    """
+    if func is None:
+        return functools.partial(profiled, describe=describe)
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        records = _records.get()
+        if records is None or _active.get():
+            return func(*args, **kwargs)
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        token = _active.set(True)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(count_query))
+                return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            _active.reset(token)
+            records.append(
+                {
+                    "name": name,
+                    "template": _template_name(),
+                    "args": (describe or _describe)(*args, **kwargs),
+                    "queries": len(queries),
+                    "ms": round(duration * 1000, 3),
+                }
+            )
+
+    return wrapper
+
+
+@contextmanager
+def capture():
+    """
+    Record the profiled calls made in the block, e.g. in a task or a test:
+
+        with capture() as records:
+            template.render(context)
+    """
+    records = []
+    token = _records.set(records)
+    try:
+        yield records
+    finally:
+        _records.reset(token)
+
+
+def summarize(records):
+    """
+    Returns (calls, queries, milliseconds) of `records`.
+    """
+    return (
+        len(records),
+        sum(record["queries"] for record in records),
+        round(sum(record["ms"] for record in records), 3),
+    )
+
+
+class ProfilingMiddleware:
+    """
+    Profile the requests when `settings.NIGERIAN_STATES_PROFILING` is True, see the module.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_enabled():
+            return self.get_response(request)
+        with capture() as records:
+            response = self.get_response(request)
+        calls, queries, ms = summarize(records)
+        response[HEADER] = f"calls={calls}; queries={queries}; ms={ms}"
+        if records:
+            logger.info(
+                "%s %s: %d nigerian_states calls, %d queries, %.3fms",
+                request.method,
+                request.path,
+                calls,
+                queries,
+                ms,
+            )
+            self.save(request, records)
+        return response
+
+    def save(self, request, records):
+        path = getattr(settings, "NIGERIAN_STATES_PROFILING_LOG", None)
+        if not path:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(dict(record, path=request.path)) + "\n")
+
+
+def hotspots(lines, top=20):
+    """
+    Aggregate JSON line records per (template, name).
+
+    Returns:
+        list: dicts of template, name, calls, queries and ms, the most time first.
+    """
+    totals = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        key = (record["template"], record["name"])
+        total = totals.setdefault(
+            key,
+            {"template": key[0], "name": key[1], "calls": 0, "queries": 0, "ms": 0.0},
+        )
+        total["calls"] += 1
+        total["queries"] += record["queries"]
+        total["ms"] += record["ms"]
+    ranked = sorted(totals.values(), key=lambda total: total["ms"], reverse=True)
+    return ranked[:top]
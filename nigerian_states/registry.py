@@ -0,0 +1,398 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from nigerian_states.models import (
+    DatasetVersion,
+    GeoPoliticalZone,
+    State,
+    LocalGovernment,
+)
+from nigerian_states.utils import get_database
+
+logger = logging.getLogger("nigerian_states")
+
+
+class GeoRegistry:
+    """
+    An in-memory, read-only index of the zones, states and local governments.
+    It is built once from the database with three queries, and dropped whenever
+    any of the three models is saved or deleted.
+
+    A registry is never modified once built (apart from its memoized values), so it
+    is shared by the threads of the process without locking the lookups.
+
+    Attributes:
+        - built_at: when the registry was built
+        - generation: id of the latest DatasetVersion when it was built, see `get_registry`
+        - zones: zone name -> GeoPoliticalZone
+        - states: state name -> State
+        - lgas: every LocalGovernment, in primary key order
+        - states_by_id: state id -> State
+        - lgas_by_id: lga id -> LocalGovernment
+        - states_by_code: ISO 3166-2 code -> State
+        - lgas_by_code: lga code -> LocalGovernment
+        - lgas_by_state: state name -> tuple of LocalGovernment
+        - lgas_by_zone: zone name -> tuple of LocalGovernment
+        - lgas_by_name: lga name -> tuple of LocalGovernment (lga names repeat across states)
+        - state_names_by_zone: zone name -> tuple of state names
+        - lga_names_by_state: state name -> tuple of lga names
+        - lga_names_by_zone: zone name -> tuple of (distinct) lga names
+        - zone_bits: zone name -> a bit of the zone masks (see `zone_mask`)
+    """
+
+    def __init__(self, zones=(), states=(), lgas=(), generation=None):
+        self._memo = {}
+        self._lock = threading.RLock()
+        self.built_at = timezone.now()
+        self.generation = generation
+        self.checked_at = time.monotonic()
+        self.zones = {zone.name: zone for zone in zones}
+        self.states = {state.name: state for state in states}
+        self.lgas = tuple(lgas)
+        self.zone_bits = {name: 1 << bit for bit, name in enumerate(self.zones)}
+        self.states_by_id = {state.id: state for state in self.states.values()}
+        self.lgas_by_id = {lga.id: lga for lga in self.lgas}
+        self.states_by_code = {
+            state.code: state for state in self.states.values() if state.code
+        }
+        self.lgas_by_code = {lga.code: lga for lga in self.lgas if lga.code}
+        self.lgas_by_state = {name: [] for name in self.states}
+        self.lgas_by_zone = {name: [] for name in self.zones}
+        self.lgas_by_name = {}
+        self.state_names_by_zone = {name: [] for name in self.zones}
+        self.lga_names_by_state = {name: [] for name in self.states}
+        self.lga_names_by_zone = {name: {} for name in self.zones}
+        for state in self.states.values():
+            self.state_names_by_zone[state.zone.name].append(state.name)
+        for lga in self.lgas:
+            self.lga_names_by_state[lga.state.name].append(lga.name)
+            self.lga_names_by_zone[lga.state.zone.name][lga.name] = None
+            self.lgas_by_state[lga.state.name].append(lga)
+            self.lgas_by_zone[lga.state.zone.name].append(lga)
+            self.lgas_by_name.setdefault(lga.name, []).append(lga)
+        self.state_names_by_zone = _freeze(self.state_names_by_zone)
+        self.lga_names_by_state = _freeze(self.lga_names_by_state)
+        self.lga_names_by_zone = _freeze(self.lga_names_by_zone)
+        self.lgas_by_state = _freeze(self.lgas_by_state)
+        self.lgas_by_zone = _freeze(self.lgas_by_zone)
+        self.lgas_by_name = _freeze(self.lgas_by_name)
+
+    def get_state(self, key):
+        """
+        Returns the State with the name or ISO 3166-2 code `key`, or None.
+        """
+        return self.states.get(key) or self.states_by_code.get(key)
+
+    def get_lga(self, name, state=None):
+        """
+        Returns the LocalGovernment called `name` (or with the code `name`), or None.
+        `name` may be qualified as "State: LGA", the way `LocalGovernmentField` labels it.
+        A bare name shared by several states only resolves when `state` is given.
+        """
+        if name in self.lgas_by_code:
+            return self.lgas_by_code[name]
+        if state is None and ": " in name:
+            state, name = name.split(": ", 1)
+        if state is not None:
+            state = getattr(self.get_state(state), "name", state)
+        matches = self.lgas_by_name.get(name, ())
+        if state is not None:
+            matches = [lga for lga in matches if lga.state.name == state]
+        if len(matches) == 1:
+            return matches[0]
+        return None
+
+    def zone_mask(self, zones):
+        """
+        Returns the set of `zones` as a bitmask, the canonical (hashable, order and
+        duplicate independent) key of a zone subset. Unknown zones are ignored.
+        """
+        mask = 0
+        for zone in zones:
+            mask |= self.zone_bits.get(str(zone), 0)
+        return mask
+
+    def in_mask(self, mask, zone_name):
+        """
+        Returns True if the zone `zone_name` is part of the zone mask `mask`.
+        """
+        return bool(mask & self.zone_bits.get(zone_name, 0))
+
+    def memoize(self, key, builder):
+        """
+        Returns the value cached under `key`, calling `builder(registry)` the first time.
+        Derived indexes are memoized here so that they are dropped with the registry.
+
+        Cached values are read without locking. Values are built under a lock, so
+        concurrent first calls build once. The lock is reentrant, because builders may
+        memoize other values, e.g. a fragment rendering other tags.
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        with self._lock:
+            try:
+                return self._memo[key]
+            except KeyError:
+                value = self._memo[key] = builder(self)
+                return value
+
+    @classmethod
+    def build(cls, using=None):
+        """
+        Load the dataset from the database `using` (see `utils.get_database`).
+        Returns an empty registry if the tables have not been created yet.
+        """
+        using = get_database(using)
+        table_names = connections[using].introspection.table_names()
+        if LocalGovernment._meta.db_table not in table_names:
+            return cls()
+        zones = {
+            zone.id: zone
+            for zone in GeoPoliticalZone.objects.using(using).order_by("id")
+        }
+        states = {
+            state.id: state for state in State.objects.using(using).order_by("id")
+        }
+        for state in states.values():
+            state.zone = zones[state.zone_id]
+        lgas = list(LocalGovernment.objects.using(using).order_by("id"))
+        for lga in lgas:
+            lga.state = states[lga.state_id]
+            lga.zone = lga.state.zone
+        generation = None
+        if (
+            _check_interval() is not None
+            and DatasetVersion._meta.db_table in table_names
+        ):
+            generation = get_generation(using)
+        return cls(zones.values(), states.values(), lgas, generation=generation)
+
+
+def _freeze(mapping):
+    return {key: tuple(value) for key, value in mapping.items()}
+
+
+# database alias and schema -> GeoRegistry. The dict is never modified, it is replaced
+# (under `_swap_lock`), so lookups read it without locking.
+_registries = {}
+# incremented by `clear_registry`, so a registry built from data read before a write
+# is not published after the write.
+_epoch = 0
+# one registry is built at a time. `_swap_lock` is held only to replace `_registries`.
+_build_lock = threading.Lock()
+_swap_lock = threading.Lock()
+
+
+def registry_key(using=None):
+    """
+    The cache key of the registry for the database `using`: the alias, and the
+    schema of the connection for schema based multi-tenancy (`connection.schema_name`).
+    """
+    using = get_database(using)
+    if _schema_aware.get(using) is False:
+        return using, None
+    connection = connections[using]
+    # the backend of an alias does not change, so it is only inspected once.
+    _schema_aware[using] = hasattr(connection, "schema_name")
+    return using, getattr(connection, "schema_name", None)
+
+
+# alias -> whether its backend has schemas (`connection.schema_name`).
+_schema_aware = {}
+_settings = {}
+
+
+def _check_interval():
+    try:
+        return _settings["check_interval"]
+    except KeyError:
+        interval = getattr(settings, "NIGERIAN_STATES_GENERATION_CHECK_INTERVAL", None)
+        _settings["check_interval"] = interval
+        return interval
+
+
+@receiver(setting_changed)
+def _reset_settings(setting, **kwargs):
+    if setting == "NIGERIAN_STATES_GENERATION_CHECK_INTERVAL":
+        _settings.clear()
+    elif setting == "DATABASES":
+        _schema_aware.clear()
+
+
+def get_generation(using=None):
+    """
+    The cache generation of the database `using`: the id of the latest DatasetVersion
+    applied by `sync_nigerian_states`, or 0.
+    """
+    latest = (
+        DatasetVersion.objects.using(get_database(using))
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    return latest or 0
+
+
+def _is_stale(registry, using):
+    """
+    Whether another process changed the data since `registry` was built (a sync, or
+    a write through the models, see `record_change`). Checked at most every
+    `settings.NIGERIAN_STATES_GENERATION_CHECK_INTERVAL` seconds. A registry built
+    without a generation (e.g. before the DatasetVersion table existed) is always stale.
+    """
+    interval = _check_interval()
+    if interval is None:
+        return False
+    now = time.monotonic()
+    if now - registry.checked_at < interval:
+        return False
+    registry.checked_at = now
+    generation = _read_generation(using)
+    return generation is None or generation != registry.generation
+
+
+def _read_generation(using):
+    """
+    The generation of the database `using`, or None if the DatasetVersion table
+    has not been created yet.
+    """
+    table_names = connections[using].introspection.table_names()
+    if DatasetVersion._meta.db_table not in table_names:
+        return None
+    return get_generation(using)
+
+
+def get_registry(using=None):
+    """
+    Returns the GeoRegistry of the database `using`, building it on first use.
+    An empty registry (e.g. before `migrate` or `loaddata`) is not cached.
+    """
+    key = registry_key(using)
+    registry = _registries.get(key)
+    if registry is not None and not _is_stale(registry, key[0]):
+        return registry
+    with _build_lock:
+        current = _registries.get(key)
+        if current is not None and current is not registry:
+            # built by another thread while this one waited for the lock.
+            return current
+        epoch = _epoch
+        registry = GeoRegistry.build(key[0])
+        if registry.zones and _pending_change(key[0]) is None:
+            _publish(key, registry, epoch)
+    return registry
+
+
+def cached_registry(using=None):
+    """
+    Returns the cached GeoRegistry of the database `using`, or None, without building it.
+    """
+    return _registries.get(registry_key(using))
+
+
+def _publish(key, registry, epoch):
+    global _registries
+    with _swap_lock:
+        if epoch == _epoch:
+            _registries = {**_registries, key: registry}
+
+
+@receiver(post_save, sender=GeoPoliticalZone)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=LocalGovernment)
+@receiver(post_delete, sender=GeoPoliticalZone)
+@receiver(post_delete, sender=State)
+@receiver(post_delete, sender=LocalGovernment)
+def record_change(sender, using, **kwargs):
+    """
+    Drop the registries of this process now, and again once the transaction commits,
+    since another thread may rebuild one from the committed rows in between. Until
+    then, registries built on the connection (which sees the uncommitted rows) are not
+    cached. The writes of a transaction (e.g. a `loaddata`) are handled once.
+    """
+    clear_registry()
+    if _pending_change(using) is None:
+        transaction.on_commit(_Change(using), using=using)
+
+
+class _Change:
+    """
+    The commit callback of the writes of a transaction. When other processes check
+    the generation (`settings.NIGERIAN_STATES_GENERATION_CHECK_INTERVAL`), it records
+    the change as a new DatasetVersion, so that they rebuild their registries.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        self.done = False
+
+    def __call__(self):
+        if self.done:
+            return
+        self.done = True
+        if _check_interval() is not None:
+            try:
+                with transaction.atomic(using=self.using):
+                    versions = DatasetVersion.objects.using(self.using)
+                    latest = versions.order_by("-id").first()
+                    versions.create(version=latest.version if latest else "")
+            except DatabaseError:
+                logger.exception(
+                    "Could not record the change of the nigerian_states data."
+                )
+        clear_registry()
+
+
+def _pending_change(using):
+    """
+    The `_Change` waiting for the transaction of the connection `using` to commit,
+    or None. The callbacks of a rolled back transaction (or savepoint) are discarded
+    by Django, so they are not found here either.
+    """
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        return None
+    for _, callback, _ in connection.run_on_commit:
+        if isinstance(callback, _Change) and not callback.done:
+            return callback
+    return None
+
+
+def clear_registry(**kwargs):
+    """
+    Drop the cached registries, they would be rebuilt on the next lookup.
+    Every alias is dropped, since a write to the primary reaches its replicas.
+    Lookups in progress finish with the registry they started with.
+    """
+    global _registries, _epoch
+    with _swap_lock:
+        _epoch += 1
+        _registries = {}
+
+
+def _reset_locks():
+    """
+    Replace the locks in a forked child. A lock held by another thread of the parent
+    at the time of the fork would stay held forever in the child. The registries
+    inherited from the parent, e.g. warmed up before forking, are kept.
+    """
+    global _build_lock, _swap_lock
+    _build_lock = threading.Lock()
+    _swap_lock = threading.Lock()
+    for registry in _registries.values():
+        registry._lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks)
@@ -0,0 +1,228 @@
+"""
+Roll LGA level facts (counts, sums or arrays of values) up to states and zones.
+
+`Rollup` holds integer mapping arrays derived from `LocalGovernment.state` and
+`State.zone`: the position of each LGA's state, and of each state's zone. Aggregating
+is then a `bincount` over those positions instead of a dictionary lookup per row.
+`state_case` / `zone_case` do the same grouping in the database, as a single CASE expression.
+
+NumPy is optional: without it the same functions run as plain Python loops.
+"""
+
+from django.db.models import Case, CharField, Value, When
+
+from nigerian_states.utils import get_numpy
+
+LEVELS = ("state", "zone")
+
+
+class Rollup:
+    """
+    Mapping arrays of the LGAs of a registry, in the registry's (primary key) order.
+
+    Attributes:
+        - lga_keys: the code (or "State: LGA" qualified name) of each LGA position
+        - state_names, zone_names: the names of the state and zone positions
+        - lga_state: state position of each LGA position
+        - lga_zone: zone position of each LGA position
+        - state_zone: zone position of each state position
+        - positions: LGA code, qualified name or (unambiguous) name -> LGA position
+    """
+
+    def __init__(self, registry):
+        self.state_names = tuple(registry.states)
+        self.zone_names = tuple(registry.zones)
+        state_positions = {name: i for i, name in enumerate(self.state_names)}
+        zone_positions = {name: i for i, name in enumerate(self.zone_names)}
+        self.state_zone = [
+            zone_positions[state.zone.name] for state in registry.states.values()
+        ]
+        self.lga_state = [state_positions[lga.state.name] for lga in registry.lgas]
+        self.lga_zone = [self.state_zone[state] for state in self.lga_state]
+        self.lga_keys = tuple(
+            lga.code or f"{lga.state.name}: {lga.name}" for lga in registry.lgas
+        )
+        self.positions = {}
+        for position, lga in enumerate(registry.lgas):
+            if len(registry.lgas_by_name[lga.name]) == 1:
+                self.positions[lga.name] = position
+            self.positions[f"{lga.state.name}: {lga.name}"] = position
+            if lga.code:
+                self.positions[lga.code] = position
+        numpy = get_numpy()
+        if numpy is not None:
+            self.lga_state = numpy.asarray(self.lga_state, dtype=numpy.intp)
+            self.lga_zone = numpy.asarray(self.lga_zone, dtype=numpy.intp)
+            self.state_zone = numpy.asarray(self.state_zone, dtype=numpy.intp)
+
+    def _groups(self, level):
+        if level == "state":
+            return self.lga_state, self.state_names
+        if level == "zone":
+            return self.lga_zone, self.zone_names
+        raise ValueError(f"level must be one of {LEVELS}, not {level!r}.")
+
+    def lga_positions(self, lgas):
+        """
+        The LGA position of each LGA code, qualified name or name of `lgas`, -1 for
+        unknown and ambiguous names (e.g. "Obi", use "Benue: Obi" or the code instead).
+        With NumPy, each distinct key is looked up once.
+        """
+        numpy = get_numpy()
+        if numpy is None:
+            positions = self.positions
+            return [positions.get(key, -1) for key in lgas]
+        keys, inverse = numpy.unique(
+            numpy.asarray(lgas, dtype=str), return_inverse=True
+        )
+        lookup = numpy.fromiter(
+            (self.positions.get(key, -1) for key in keys.tolist()),
+            dtype=numpy.intp,
+            count=len(keys),
+        )
+        return lookup[inverse.reshape(-1)]
+
+    def rollup(self, lgas, values=None, level="state"):
+        """
+        Aggregate rows keyed by LGA up to `level` ("state" or "zone").
+
+        Args:
+            lgas: the LGA (code, "State: LGA" or name) of each row.
+            values: the value of each row to sum, counts the rows if None.
+            level: "state" or "zone".
+
+        Returns:
+            dict: state or zone name -> total, rows of unknown LGAs are left out.
+        """
+        groups, names = self._groups(level)
+        positions = self.lga_positions(lgas)
+        numpy = get_numpy()
+        if numpy is None:
+            totals = [0] * len(names)
+            if values is None:
+                values = [1] * len(positions)
+            for position, value in zip(positions, values):
+                if position >= 0:
+                    totals[groups[position]] += value
+            return dict(zip(names, totals))
+        known = positions >= 0
+        weights = None
+        if values is not None:
+            weights = numpy.asarray(values, dtype=float)[known]
+        totals = numpy.bincount(
+            groups[positions[known]], weights=weights, minlength=len(names)
+        )
+        return dict(zip(names, totals.tolist()))
+
+    def rollup_array(self, values, level="state"):
+        """
+        Aggregate an array of LGA level values, one row per LGA position (see `lga_keys`),
+        e.g. a (774,) array of totals or a (774, days) array of daily counts.
+
+        Returns:
+            the (states, ...) or (zones, ...) array of sums, in the order of
+            `state_names` / `zone_names` (a list without NumPy, for 1-d values).
+        """
+        groups, names = self._groups(level)
+        numpy = get_numpy()
+        if numpy is None:
+            totals = [0] * len(names)
+            for group, value in zip(groups, values):
+                totals[group] += value
+            return totals
+        values = numpy.asarray(values)
+        if len(values) != len(groups):
+            raise ValueError(
+                f"values has {len(values)} rows, expected one per LGA ({len(groups)})."
+            )
+        if values.ndim == 1:
+            return numpy.bincount(groups, weights=values, minlength=len(names))
+        totals = numpy.zeros((len(names),) + values.shape[1:], dtype=values.dtype)
+        numpy.add.at(totals, groups, values)
+        return totals
+
+
+def get_rollup(using=None):
+    """
+    Returns the Rollup of the registry of the database `using`, built once per registry.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry(using).memoize("rollups", Rollup)
+
+
+def rollup(lgas, values=None, level="state", using=None):
+    """
+    Aggregate rows keyed by LGA up to states or zones, see `Rollup.rollup`.
+    """
+    return get_rollup(using).rollup(lgas, values=values, level=level)
+
+
+def rollup_array(values, level="state", using=None):
+    """
+    Aggregate an array with one row per LGA up to states or zones, see `Rollup.rollup_array`.
+    """
+    return get_rollup(using).rollup_array(values, level=level)
+
+
+def _lga_keys_by_group(registry, level, key):
+    def group_of(lga):
+        return lga.state.name if level == "state" else lga.state.zone.name
+
+    groups = {}
+    for lga in registry.lgas:
+        group = group_of(lga)
+        if key == "code":
+            value = lga.code
+        else:
+            value = lga.name
+            matches = registry.lgas_by_name[lga.name]
+            if matches[0] is not lga:
+                continue
+            if any(group_of(match) != group for match in matches):
+                # a name shared by several states (or zones) does not identify one.
+                continue
+        groups.setdefault(group, []).append(value)
+    return groups
+
+
+def _case(field, level, key, using):
+    from nigerian_states.registry import get_registry
+
+    if level not in LEVELS:
+        raise ValueError(f"level must be one of {LEVELS}, not {level!r}.")
+    if key not in ("name", "code"):
+        raise ValueError(f"key must be 'name' or 'code', not {key!r}.")
+    groups = get_registry(using).memoize(
+        ("rollups.case", level, key),
+        lambda registry: _lga_keys_by_group(registry, level, key),
+    )
+    return Case(
+        *(
+            When(**{f"{field}__in": values}, then=Value(group))
+            for group, values in groups.items()
+        ),
+        default=Value(None),
+        output_field=CharField(),
+    )
+
+
+def state_case(field, key="name", using=None):
+    """
+    A CASE expression mapping the LGA name (or code, with key="code") in `field` to the
+    name of its state, with one WHEN per state. Ambiguous LGA names map to NULL.
+
+    Usage:
+        Sale.objects.annotate(state=state_case("lga")).values("state").annotate(total=Sum("amount"))
+    """
+    return _case(field, "state", key, using)
+
+
+def zone_case(field, key="name", using=None):
+    """
+    A CASE expression mapping the LGA name (or code, with key="code") in `field` to the
+    name of its geo-political zone, with one WHEN per zone. LGA names shared by states
+    of the same zone (e.g. "Obi", "Bassa") map to that zone, names shared across zones
+    map to NULL.
+    """
+    return _case(field, "zone", key, using)
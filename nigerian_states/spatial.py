@@ -0,0 +1,175 @@
+"""
+Nearest state / local government lookups from the `latitude` and `longitude`
+of the models, using an in-memory KD-tree. No spatial database is required.
+
+Points are indexed as unit vectors on the sphere, so the straight line (chord)
+distance used by the tree orders points exactly like the great-circle distance.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vector(latitude, longitude):
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class KDTree:
+    """
+    A static 3-d tree over (point, item) pairs.
+    Nodes are tuples of (point, item, axis, left, right).
+    """
+
+    def __init__(self, points, items):
+        self.size = len(points)
+        self.root = self._build(list(zip(points, items)), 0)
+
+    def _build(self, pairs, depth):
+        if not pairs:
+            return None
+        axis = depth % 3
+        pairs.sort(key=lambda pair: pair[0][axis])
+        median = len(pairs) // 2
+        point, item = pairs[median]
+        return (
+            point,
+            item,
+            axis,
+            self._build(pairs[:median], depth + 1),
+            self._build(pairs[median + 1 :], depth + 1),
+        )
+
+    def nearest(self, target):
+        """
+        Returns (item, squared distance) of the point closest to `target`, or (None, inf).
+        """
+        best = [None, math.inf]
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, item, axis, left, right = node
+            dx = point[0] - target[0]
+            dy = point[1] - target[1]
+            dz = point[2] - target[2]
+            distance = dx * dx + dy * dy + dz * dz
+            if distance < best[1]:
+                best[0], best[1] = item, distance
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # visit the far side only if the splitting plane is closer than the best match.
+            if diff * diff < best[1]:
+                stack.append(far)
+            stack.append(near)
+        return best[0], best[1]
+
+
+class SpatialIndex:
+    """
+    Nearest neighbour index over objects with `latitude` and `longitude`.
+    Objects without coordinates are left out of the index.
+    """
+
+    def __init__(self, objects):
+        located = [
+            obj
+            for obj in objects
+            if obj.latitude is not None and obj.longitude is not None
+        ]
+        points = [to_unit_vector(obj.latitude, obj.longitude) for obj in located]
+        self.tree = KDTree(points, located)
+
+    def __len__(self):
+        return self.tree.size
+
+    def nearest(self, latitude, longitude):
+        """
+        Returns the object closest to the point, or None if the index is empty.
+        """
+        item, _ = self.tree.nearest(to_unit_vector(latitude, longitude))
+        return item
+
+    def nearest_with_distance(self, latitude, longitude):
+        """
+        Returns (object, distance in km) of the object closest to the point.
+        """
+        item, distance = self.tree.nearest(to_unit_vector(latitude, longitude))
+        if item is None:
+            return None, math.inf
+        return item, chord_to_km(math.sqrt(distance))
+
+    def nearest_many(self, points):
+        """
+        Batch version of `nearest`.
+
+        Args:
+            points: iterable of (latitude, longitude) pairs, e.g. a list of tuples
+                or an (n, 2) array.
+
+        Returns:
+            list: the closest object for each point, in input order.
+        """
+        nearest = self.tree.nearest
+        return [
+            nearest(to_unit_vector(latitude, longitude))[0]
+            for latitude, longitude in points
+        ]
+
+
+def get_state_index():
+    """
+    Returns the SpatialIndex of the states, built once per registry.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry().memoize(
+        "spatial.states", lambda registry: SpatialIndex(registry.states.values())
+    )
+
+
+def get_lga_index():
+    """
+    Returns the SpatialIndex of the local governments, built once per registry.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry().memoize(
+        "spatial.lgas", lambda registry: SpatialIndex(registry.lgas)
+    )
+
+
+def nearest_state(latitude, longitude):
+    """
+    Returns the State whose representative point is closest to (latitude, longitude).
+    """
+    return get_state_index().nearest(latitude, longitude)
+
+
+def nearest_lga(latitude, longitude):
+    """
+    Returns the LocalGovernment whose centroid is closest to (latitude, longitude),
+    or None if no local government has coordinates.
+    """
+    return get_lga_index().nearest(latitude, longitude)
+
+
+def nearest_states(points):
+    """
+    Batch version of `nearest_state` for an iterable of (latitude, longitude) pairs.
+    """
+    return get_state_index().nearest_many(points)
+
+
+def nearest_lgas(points):
+    """
+    Batch version of `nearest_lga` for an iterable of (latitude, longitude) pairs.
+    """
+    return get_lga_index().nearest_many(points)
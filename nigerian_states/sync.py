@@ -0,0 +1,260 @@
+"""
+Incremental updates of the zones, states and local governments to the packaged dataset.
+
+The packaged dataset is versioned by `DATASET_VERSION`, to be bumped whenever the fixture
+changes. `sync_dataset` diffs it against the database by natural keys (zone names, state
+and LGA codes), so renamed LGAs and spelling fixes are updates of the existing rows, and
+applies the differences with bulk queries instead of rewriting every row.
+"""
+
+import json
+import os
+
+from django.db import router, transaction
+
+from nigerian_states.models import (
+    DatasetVersion,
+    GeoPoliticalZone,
+    LocalGovernment,
+    State,
+)
+
+DATASET_VERSION = "2024.2"
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "fixtures.json")
+
+STATE_FIELDS = (
+    "name",
+    "code",
+    "capital",
+    "latitude",
+    "longitude",
+    "population",
+    "area",
+)
+LGA_FIELDS = ("name", "code", "latitude", "longitude", "population", "area")
+
+_fixture = []
+
+
+def fixture_objects():
+    """
+    The packaged fixture as python objects, read from disk once per process.
+    """
+    if not _fixture:
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            _fixture.extend(json.load(f))
+    return _fixture
+
+
+def packaged_dataset():
+    """
+    The packaged dataset keyed by natural keys instead of primary keys:
+        {"version": ..., "zones": [name, ...],
+         "states": [{"code", "name", "capital", "zone", "latitude", "longitude",
+                     "population", "area"}, ...],
+         "lgas": [{"code", "name", "state" (code), "latitude", "longitude",
+                   "population", "area"}, ...]}
+    """
+    by_model = {}
+    for obj in fixture_objects():
+        by_model.setdefault(obj["model"], []).append(obj)
+    zone_names = {
+        obj["pk"]: obj["fields"]["name"]
+        for obj in by_model["nigerian_states.geopoliticalzone"]
+    }
+    state_codes = {}
+    states = []
+    for obj in by_model["nigerian_states.state"]:
+        fields = obj["fields"]
+        state_codes[obj["pk"]] = fields["code"]
+        states.append(
+            {
+                "code": fields["code"],
+                "name": fields["name"],
+                "capital": fields["capital"],
+                "zone": zone_names[fields["zone"]],
+                "latitude": fields.get("latitude"),
+                "longitude": fields.get("longitude"),
+                "population": fields.get("population"),
+                "area": fields.get("area"),
+            }
+        )
+    lgas = [
+        {
+            "code": obj["fields"]["code"],
+            "name": obj["fields"]["name"],
+            "state": state_codes[obj["fields"]["state"]],
+            "latitude": obj["fields"].get("latitude"),
+            "longitude": obj["fields"].get("longitude"),
+            "population": obj["fields"].get("population"),
+            "area": obj["fields"].get("area"),
+        }
+        for obj in by_model["nigerian_states.localgovernment"]
+    ]
+    return {
+        "version": DATASET_VERSION,
+        "zones": list(zone_names.values()),
+        "states": states,
+        "lgas": lgas,
+    }
+
+
+class DatasetChanges:
+    """
+    The differences between a dataset and the database, as unsaved model instances.
+
+    Attributes:
+        - version: version of the dataset
+        - inserts: new objects, per model
+        - updates: changed objects, per model
+        - renamed: (model, old name, new name) of the updated objects whose name changed
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.inserts = {GeoPoliticalZone: [], State: [], LocalGovernment: []}
+        self.updates = {State: [], LocalGovernment: []}
+        self.renamed = []
+
+    @property
+    def inserted(self):
+        return sum(len(objects) for objects in self.inserts.values())
+
+    @property
+    def updated(self):
+        return sum(len(objects) for objects in self.updates.values())
+
+    def __bool__(self):
+        return bool(self.inserted or self.updated)
+
+
+def _update(obj, values, changes, fields, **related):
+    """
+    Set `values` and the `related` objects on `obj`, recording it as an update (and a
+    rename) if anything changed.
+    """
+    changed = [field for field in fields if getattr(obj, field) != values[field]]
+    changed_related = [
+        name
+        for name, related_obj in related.items()
+        if related_obj.pk is None or getattr(obj, f"{name}_id") != related_obj.pk
+    ]
+    if not changed and not changed_related:
+        return
+    if "name" in changed:
+        changes.renamed.append((type(obj), obj.name, values["name"]))
+    for field in changed:
+        setattr(obj, field, values[field])
+    for name in changed_related:
+        setattr(obj, name, related[name])
+    changes.updates[type(obj)].append(obj)
+
+
+def diff_dataset(dataset=None, using=None):
+    """
+    Compare `dataset` (defaults to the packaged one) with the database `using`.
+    Rows are matched by code, and rows without a code by name (and state, for LGAs).
+    Rows missing from the dataset are left alone. Nothing is written.
+
+    Returns:
+        DatasetChanges: the inserts and updates that would bring the database up to date.
+    """
+    if dataset is None:
+        dataset = packaged_dataset()
+    if using is None:
+        using = router.db_for_write(State)
+    changes = DatasetChanges(dataset["version"])
+
+    zones = {zone.name: zone for zone in GeoPoliticalZone.objects.using(using)}
+    for name in dataset["zones"]:
+        if name not in zones:
+            zones[name] = GeoPoliticalZone(name=name)
+            changes.inserts[GeoPoliticalZone].append(zones[name])
+
+    db_states = list(State.objects.using(using))
+    states_by_code = {state.code: state for state in db_states if state.code}
+    states_by_name = {state.name: state for state in db_states if not state.code}
+    states = {}
+    for row in dataset["states"]:
+        zone = zones[row["zone"]]
+        state = states_by_code.get(row["code"]) or states_by_name.get(row["name"])
+        if state is None:
+            state = State(zone=zone, **{field: row[field] for field in STATE_FIELDS})
+            changes.inserts[State].append(state)
+        else:
+            _update(state, row, changes, STATE_FIELDS, zone=zone)
+        states[row["code"]] = (state, zone)
+
+    db_lgas = list(LocalGovernment.objects.using(using))
+    lgas_by_code = {lga.code: lga for lga in db_lgas if lga.code}
+    lgas_by_name = {(lga.state_id, lga.name): lga for lga in db_lgas if not lga.code}
+    for row in dataset["lgas"]:
+        state, zone = states[row["state"]]
+        lga = lgas_by_code.get(row["code"]) or lgas_by_name.get((state.pk, row["name"]))
+        if lga is None:
+            lga = LocalGovernment(
+                state=state, zone=zone, **{field: row[field] for field in LGA_FIELDS}
+            )
+            changes.inserts[LocalGovernment].append(lga)
+        else:
+            _update(lga, row, changes, LGA_FIELDS, state=state, zone=zone)
+    return changes
+
+
+def _bulk_create(model, objects, key, using):
+    """
+    bulk_create `objects`, and read back the primary keys on backends not returning them.
+    """
+    model.objects.using(using).bulk_create(objects)
+    missing = {getattr(obj, key): obj for obj in objects if obj.pk is None}
+    if missing:
+        for value, pk in (
+            model.objects.using(using)
+            .filter(**{f"{key}__in": list(missing)})
+            .values_list(key, "pk")
+        ):
+            missing[value].pk = pk
+
+
+def sync_dataset(dataset=None, using=None, dry_run=False):
+    """
+    Apply the differences between `dataset` (defaults to the packaged one) and the database
+    `using` with bulk queries, and record the version applied as a `DatasetVersion`.
+    The in-memory registries of this process are dropped; other processes notice the new
+    version if `settings.NIGERIAN_STATES_GENERATION_CHECK_INTERVAL` is set.
+
+    Returns:
+        DatasetChanges: the changes applied (or to apply, with `dry_run`).
+    """
+    from nigerian_states.registry import clear_registry
+
+    if using is None:
+        using = router.db_for_write(State)
+    with transaction.atomic(using=using):
+        changes = diff_dataset(dataset, using=using)
+        if dry_run:
+            return changes
+        # parents first, the foreign keys of the children are set from their objects.
+        _bulk_create(GeoPoliticalZone, changes.inserts[GeoPoliticalZone], "name", using)
+        _bulk_create(State, changes.inserts[State], "code", using)
+        LocalGovernment.objects.using(using).bulk_create(
+            changes.inserts[LocalGovernment]
+        )
+        State.objects.using(using).bulk_update(
+            changes.updates[State], STATE_FIELDS + ("zone",)
+        )
+        LocalGovernment.objects.using(using).bulk_update(
+            changes.updates[LocalGovernment], LGA_FIELDS + ("state", "zone")
+        )
+        latest = DatasetVersion.objects.using(using).order_by("-id").first()
+        if changes or latest is None or latest.version != changes.version:
+            DatasetVersion.objects.using(using).create(
+                version=changes.version,
+                inserted=changes.inserted,
+                updated=changes.updated,
+                renamed=len(changes.renamed),
+            )
+    # bulk queries send no signals.
+    clear_registry()
+    return changes
@@ -1,15 +1,16 @@
 from django import template
 from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from nigerian_states.enums import PoliticalZones
-from nigerian_states.models import GeoPoliticalZone, State, LocalGovernment
-from django.core.exceptions import ObjectDoesNotExist
-
-from nigerian_states.utils import queryset_to_list
+from nigerian_states.profiling import profiled
+from nigerian_states.registry import get_registry
 
 register = template.Library()
 
 
 @register.simple_tag
+@profiled
 def get_states_in_zone(zone_name):
     """
     get the list of states in a geopolitical zone
@@ -25,135 +26,299 @@ def get_states_in_zone(zone_name):
     zones = PoliticalZones.values
     if zone_name not in zones:
         return []
-    try:
-        zone = GeoPoliticalZone.objects.get(name=zone_name)
-    except GeoPoliticalZone.DoesNotExist:
-        return []
-    # return list(zone.all_states.values_list('name', flat=True))
-    return queryset_to_list(zone.all_states, "name")
+    return list(get_registry().state_names_by_zone.get(zone_name, ()))
 
 
 @register.simple_tag
+@profiled
 def get_capital(state_name):
     """
     Returns the capital of the state provided
 
     Args:
-        state_name (str): Name of the state
+        state_name (str): Name or ISO 3166-2 code of the state
 
     Returns:
         str: capital of the state otherwise empty string
-    Usage: {% get_capital 'Lagos' %}
+    Usage: {% get_capital 'Lagos' %} or {% get_capital 'NG-LA' %}
     """
-    try:
-        state = State.objects.get(name=state_name)
-    except State.DoesNotExist:
+    state = get_registry().get_state(state_name)
+    if state is None:
         return ""
     return state.capital
 
 
 @register.simple_tag
+@profiled
 def get_lgas_in_state(state_name):
     """
     get the list of LG in the provided state name
 
     Args:
-        state_name (str): Name of the state
+        state_name (str): Name or ISO 3166-2 code of the state
 
     Returns:
         list: List of local government in the state or empty list
     Usage: {% get_lgas_in_state "Lagos" %}
     """
-    try:
-        state = State.objects.get(name=state_name)
-    except State.DoesNotExist:
+    registry = get_registry()
+    state = registry.get_state(state_name)
+    if state is None:
         return []
-    return queryset_to_list(state.lgas, "name")
+    return list(registry.lga_names_by_state[state.name])
 
 
 @register.filter
+@profiled
 def is_state_in_zone(zone_name, state_name):
     """
     check to see if the state is from the zone
 
     Args:
-        state_name (str): name of state
+        state_name (str): name or ISO 3166-2 code of state
         zone_name (str): name of geopolitical zone
 
     Returns:
         bool: True if state is from the zone_name otherwise False
     Usage: {% if 'South West' | is_state_in_zone: 'Lagos' %}{% endif %}
     """
-    try:
-        state = State.objects.get(name=state_name)
-        zone = GeoPoliticalZone.objects.get(name=zone_name)
-    except ObjectDoesNotExist:
+    state = get_registry().get_state(state_name)
+    if state is None:
         return False
-    return state.zone.name == zone.name
+    return state.zone.name == zone_name
 
 
 @register.filter
+@profiled
 def is_lga_in_state(state_name, lga_name):
     """
     check whether the lga name is from the state
 
     Args:
-        state_name (str): name of the state
-        lga_name (str): name of the local government
+        state_name (str): name or ISO 3166-2 code of the state
+        lga_name (str): name or code of the local government
 
     Returns:
         bool: True if lga is under the state, False otherwise.
     Usage: {% if 'Lagos' | is_lga_in_state: 'Badagry' %} {% endif %}
     """
-    try:
-        state = State.objects.get(name=state_name)
-        lga = LocalGovernment.objects.get(name=lga_name)
-    except ObjectDoesNotExist:
+    registry = get_registry()
+    state = registry.get_state(state_name)
+    if state is None:
         return False
-    return lga in state.lgas
+    lga = registry.lgas_by_code.get(lga_name)
+    if lga is not None:
+        return lga.state.name == state.name
+    return lga_name in registry.lga_names_by_state[state.name]
 
 
 @register.filter
+@profiled
 def default_zone():
     return getattr(settings, "DEFAULT_GEO_POLITICAL_ZONES", [])
 
 
 @register.simple_tag
+@profiled
 def get_zone(state):
     """
     returns the name of the zone the state belongs to
 
     Args:
-        state (State): name of the state
+        state (State): name or ISO 3166-2 code of the state
 
     Returns:
         str: geopolitical zone of the state or ''
     Usage: {% get_zone 'Oyo' %}
     """
-    try:
-        state = State.objects.get(name=state)
-    except State.DoesNotExist:
+    state = get_registry().get_state(state)
+    if state is None:
         return ""
     return state.zone.name
 
 
 @register.simple_tag
+@profiled
+def get_state_code(state_name):
+    """
+    returns the ISO 3166-2 code of the state
+
+    Args:
+        state_name (str): name of the state
+
+    Returns:
+        str: code of the state, e.g. 'NG-LA', or ''
+    Usage: {% get_state_code 'Lagos' %}
+    """
+    state = get_registry().get_state(state_name)
+    if state is None:
+        return ""
+    return state.code or ""
+
+
+@register.simple_tag
+@profiled
+def get_state_name(code):
+    """
+    returns the name of the state with the ISO 3166-2 code
+
+    Args:
+        code (str): code of the state, e.g. 'NG-LA'
+
+    Returns:
+        str: name of the state or ''
+    Usage: {% get_state_name 'NG-LA' %}
+    """
+    state = get_registry().get_state(code)
+    if state is None:
+        return ""
+    return state.name
+
+
+@register.simple_tag
+@profiled
+def get_neighboring_states(state_name, hops=1):
+    """
+    Returns the names of the states at most `hops` borders away from the state.
+
+    Args:
+        state_name (str): name or ISO 3166-2 code of the state
+        hops (int): number of borders crossed, 1 for the neighbouring states
+
+    Returns:
+        list: names of the states, nearest first, empty if the state is unknown.
+    Usage: {% get_neighboring_states 'Lagos' as neighbors %} or {% get_neighboring_states 'NG-LA' 2 %}
+    """
+    from nigerian_states.adjacency import states_within
+
+    return [state.name for state in states_within(state_name, int(hops))]
+
+
+@register.filter
+@profiled
+def are_neighboring_states(state_name, other_state_name):
+    """
+    check whether the two states share a border
+
+    Returns:
+        bool: True if the states are neighbours, False otherwise.
+    Usage: {% if 'Lagos'|are_neighboring_states:'Ogun' %}{% endif %}
+    """
+    from nigerian_states.adjacency import get_state_adjacency
+
+    return get_state_adjacency().are_neighbors(state_name, other_state_name)
+
+
+@register.simple_tag
+@profiled
 def get_zone_info(zone_name):
-    try:
-        zone = GeoPoliticalZone.objects.get(name=zone_name)
-    except GeoPoliticalZone.DoesNotExist:
+    registry = get_registry()
+    zone = registry.zones.get(zone_name)
+    if zone is None:
         return {}
-    state_ids = list(zone.all_states.values_list("id", flat=True))
-    lgas = list(
-        LocalGovernment.objects.filter(state__in=state_ids).values_list(
-            "name", flat=True
-        )
-    )
+    states = list(registry.state_names_by_zone[zone.name])
+    lgas = [lga.name for lga in registry.lgas_by_zone[zone.name]]
     output = {
         "zone": zone.name,
-        "no_of_states": zone.all_states.count(),
-        "states": queryset_to_list(zone.all_states, "name"),
-        "no_of_lgas": zone.total_lgas,
+        "no_of_states": len(states),
+        "states": states,
+        "no_of_lgas": len(lgas),
         "lgas": lgas,
     }
     return output
+
+
+def render_fragment(template_name, key, get_context):
+    """
+    Render `template_name` with `get_context(registry)` once per `key`. The HTML is
+    memoized on the registry, and so dropped whenever the dataset changes.
+    """
+    return get_registry().memoize(
+        ("fragment", template_name, key),
+        lambda registry: mark_safe(
+            render_to_string(template_name, get_context(registry))
+        ),
+    )
+
+
+@register.simple_tag
+@profiled
+def render_zone_states(zone_name):
+    """
+    render the list of states in a geopolitical zone as HTML
+
+    Args:
+        zone_name (str): Geopolitical zone
+
+    Returns:
+        str: rendered `nigerian_states/zone_states.html`, or '' if the zone is invalid
+    Usage: {% render_zone_states 'South West' %}
+    """
+    if zone_name not in get_registry().state_names_by_zone:
+        return ""
+    return render_fragment(
+        "nigerian_states/zone_states.html",
+        zone_name,
+        lambda registry: {
+            "zone": zone_name,
+            "states": registry.state_names_by_zone[zone_name],
+        },
+    )
+
+
+@register.simple_tag
+@profiled
+def render_state_lgas(state_name):
+    """
+    render the list of LGs in a state as HTML
+
+    Args:
+        state_name (str): Name or ISO 3166-2 code of the state
+
+    Returns:
+        str: rendered `nigerian_states/state_lgas.html`, or '' if the state is invalid
+    Usage: {% render_state_lgas 'Lagos' %}
+    """
+    state = get_registry().get_state(state_name)
+    if state is None:
+        return ""
+    return render_fragment(
+        "nigerian_states/state_lgas.html",
+        state.name,
+        lambda registry: {
+            "state": state.name,
+            "lgas": registry.lga_names_by_state[state.name],
+        },
+    )
+
+
+@register.simple_tag
+@profiled
+def render_states_with_lgas(zone_name=None):
+    """
+    render every state (of a geopolitical zone, if given) with its LGs as HTML
+
+    Args:
+        zone_name (str): optional Geopolitical zone
+
+    Returns:
+        str: rendered `nigerian_states/states_with_lgas.html`, or '' if the zone is invalid
+    Usage: {% render_states_with_lgas %} or {% render_states_with_lgas 'South West' %}
+    """
+    if zone_name is not None and zone_name not in get_registry().state_names_by_zone:
+        return ""
+
+    def get_context(registry):
+        if zone_name is None:
+            state_names = registry.states
+        else:
+            state_names = registry.state_names_by_zone[zone_name]
+        return {
+            "states": [
+                (name, registry.lga_names_by_state[name]) for name in state_names
+            ]
+        }
+
+    return render_fragment(
+        "nigerian_states/states_with_lgas.html", zone_name, get_context
+    )
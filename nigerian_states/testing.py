@@ -0,0 +1,112 @@
+"""
+Helpers for the tests of projects using the package (and of the package itself):
+a bulk loader of the packaged dataset, a TestCase loading it once per class, and
+random sampling from the in-memory registry. The samples are copies, so tests can
+change and save them without changing the registry; their related objects (e.g.
+`lga.state`) are the registry's, and must be treated as read-only.
+"""
+
+import copy
+import random
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connections, router
+from django.test import TestCase
+
+from nigerian_states.models import GeoPoliticalZone, LocalGovernment, State
+from nigerian_states.registry import clear_registry, get_registry, record_change
+from nigerian_states.sync import fixture_objects
+
+
+def load_geography(using=None):
+    """
+    Load the packaged zones, states and local governments into the database `using`
+    (defaults to the database the routers write to) with one bulk insert per model,
+    instead of the one query per object of `loaddata`. The tables should be empty.
+
+    Returns:
+        int: number of objects loaded.
+    """
+    if using is None:
+        using = router.db_for_write(State)
+    objects = {GeoPoliticalZone: [], State: [], LocalGovernment: []}
+    for deserialized in serializers.deserialize("python", fixture_objects()):
+        obj = deserialized.object
+        objects[type(obj)].append(obj)
+    states = {state.pk: state for state in objects[State]}
+    for lga in objects[LocalGovernment]:
+        lga.state = states[lga.state_id]
+    for model, model_objects in objects.items():
+        model.objects.using(using).bulk_create(model_objects)
+    connection = connections[using]
+    # inserting explicit primary keys leaves the sequences behind on some backends.
+    sequence_sql = connection.ops.sequence_reset_sql(no_style(), list(objects))
+    if sequence_sql:
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
+    # bulk_create sends no signals, so the change is recorded here: the registries
+    # are dropped, and not cached again until the transaction commits.
+    record_change(sender=LocalGovernment, using=using)
+    return sum(len(model_objects) for model_objects in objects.values())
+
+
+class GeographyTestCase(TestCase):
+    """
+    A TestCase with the packaged dataset loaded once per class (in `setUpTestData`),
+    and rolled back after the class, rather than loaded in every test. The registries
+    are dropped after the rollback, so later tests do not see the dataset.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # the class transaction stands for a committed one in the tests of the class.
+        with cls.captureOnCommitCallbacks(execute=True):
+            load_geography()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        clear_registry()
+
+    def setUp(self):
+        super().setUp()
+        # the rollback of the previous test's changes sends no signals.
+        clear_registry()
+
+
+def random_zone(using=None):
+    """
+    Returns a random GeoPoliticalZone, copied from the in-memory registry.
+    """
+    registry = get_registry(using)
+    zones = registry.memoize("testing.zones", lambda r: tuple(r.zones.values()))
+    return copy.copy(random.choice(zones))
+
+
+def random_state(zone=None, using=None):
+    """
+    Returns a random State (of the zone named `zone`, if given), copied from the
+    in-memory registry.
+    """
+    registry = get_registry(using)
+    if zone is None:
+        states = registry.memoize("testing.states", lambda r: tuple(r.states.values()))
+        return copy.copy(random.choice(states))
+    state = registry.states[random.choice(registry.state_names_by_zone[str(zone)])]
+    return copy.copy(state)
+
+
+def random_lga(state=None, using=None):
+    """
+    Returns a random LocalGovernment (of the state with the name or code `state`, if given),
+    copied from the in-memory registry.
+    """
+    registry = get_registry(using)
+    if state is None:
+        return copy.copy(random.choice(registry.lgas))
+    return copy.copy(
+        random.choice(registry.lgas_by_state[registry.get_state(state).name])
+    )
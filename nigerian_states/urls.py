@@ -0,0 +1,15 @@
+from django.urls import path
+
+from nigerian_states import views
+
+app_name = "nigerian_states"
+
+urlpatterns = [
+    path("dataset.json", views.dataset, name="dataset"),
+    path("ready", views.readiness, name="ready"),
+    path("zones", views.zones, name="zones"),
+    path("zones/<str:zone>/states", views.zone_states, name="zone-states"),
+    path("states/<str:state>", views.state_detail, name="state-detail"),
+    path("states/<str:state>/lgas", views.state_lgas, name="state-lgas"),
+    path("states/<str:state>/lga-options", views.lga_options, name="lga-options"),
+]
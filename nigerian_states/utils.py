@@ -1,4 +1,10 @@
-from django.db.models import QuerySet
+from itertools import count, islice
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, router
+from django.db.models import OuterRef, Q, QuerySet, Subquery
+from django.dispatch import receiver
 
 
 def queryset_to_list(queryset: QuerySet, field_name: str):
@@ -13,3 +19,332 @@ def queryset_to_list(queryset: QuerySet, field_name: str):
         list: List containing values extracted from the specified field.
     """
     return list(queryset.values_list(field_name, flat=True))
+
+
+def get_numpy():
+    """
+    Returns the numpy module, or None if it is not installed. NumPy is optional, the
+    array based helpers of the package fall back to plain Python without it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def get_database(using=None):
+    """
+    The database alias the package reads from.
+    An explicit `using` wins, then `settings.NIGERIAN_STATES_DATABASE`,
+    and lastly the database routers (`router.db_for_read`, without hints).
+    The setting is read once, the routers are asked on every lookup, so routers
+    choosing the database per request or per tenant are followed.
+
+    Returns:
+        str: database alias
+    """
+    if using:
+        return using
+    try:
+        using = _settings["database"]
+    except KeyError:
+        using = _settings["database"] = getattr(
+            settings, "NIGERIAN_STATES_DATABASE", None
+        )
+    if using:
+        return using
+    if not router.routers:
+        return DEFAULT_DB_ALIAS
+    from nigerian_states.models import State
+
+    return router.db_for_read(State)
+
+
+_settings = {}
+
+
+@receiver(setting_changed)
+def _reset_settings(setting, **kwargs):
+    if setting == "NIGERIAN_STATES_DATABASE":
+        _settings.clear()
+
+
+def sync_lga_zones(apps=None, schema_editor=None):
+    """
+    Backfill the denormalized `LocalGovernment.zone` from `LocalGovernment.state.zone`.
+    It can be called directly, or used as the `RunPython` callable of a data migration.
+
+    Args:
+        apps: the migration app registry, when used inside a data migration.
+        schema_editor: the migration schema editor, its connection is written to.
+
+    Returns:
+        int: number of local governments updated.
+    """
+    if apps is None:
+        from nigerian_states.models import State, LocalGovernment
+    else:
+        State = apps.get_model("nigerian_states", "State")
+        LocalGovernment = apps.get_model("nigerian_states", "LocalGovernment")
+    using = (
+        schema_editor.connection.alias if schema_editor else router.db_for_write(State)
+    )
+    zone = State.objects.using(using).filter(pk=OuterRef("state_id")).values("zone_id")
+    return (
+        LocalGovernment.objects.using(using)
+        .filter(Q(zone__isnull=True) | ~Q(zone_id=Subquery(zone)))
+        .update(zone_id=Subquery(zone))
+    )
+
+
+def _as_names(value):
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def names_in_zone(zone, using=None):
+    """
+    Names of the states in the geo-political zone(s), read from the in-memory registry.
+
+    Args:
+        zone (str | list): name of a zone, or an iterable of zone names.
+        using (str): optional database alias, see `get_database`.
+
+    Returns:
+        tuple: state names, empty if the zone is unknown.
+    """
+    from nigerian_states.registry import get_registry
+
+    index = get_registry(using).state_names_by_zone
+    return tuple(
+        name for zone_name in _as_names(zone) for name in index.get(zone_name, ())
+    )
+
+
+def lga_names_in_zone(zone, using=None):
+    """
+    Distinct names of the local governments in the geo-political zone(s).
+
+    Args:
+        zone (str | list): name of a zone, or an iterable of zone names.
+        using (str): optional database alias, see `get_database`.
+
+    Returns:
+        tuple: local government names, empty if the zone is unknown.
+    """
+    from nigerian_states.registry import get_registry
+
+    index = get_registry(using).lga_names_by_zone
+    names = {}
+    for zone_name in _as_names(zone):
+        names.update(dict.fromkeys(index.get(zone_name, ())))
+    return tuple(names)
+
+
+def lga_names_in_state(state, using=None):
+    """
+    Names of the local governments in the state(s).
+
+    Args:
+        state (str | list): name of a state, or an iterable of state names.
+        using (str): optional database alias, see `get_database`.
+
+    Returns:
+        tuple: local government names, empty if the state is unknown.
+    """
+    from nigerian_states.registry import get_registry
+
+    index = get_registry(using).lga_names_by_state
+    names = {}
+    for state_name in _as_names(state):
+        names.update(dict.fromkeys(index.get(state_name, ())))
+    return tuple(names)
+
+
+def get_lga(name, state=None, using=None):
+    """
+    Get a local government by name, disambiguated by state where the name is not unique.
+
+    Args:
+        name (str): name, "State: LGA" qualified name or code of the local government.
+        state (str): optional name or ISO 3166-2 code of the state.
+        using (str): optional database alias, see `get_database`.
+
+    Returns:
+        LocalGovernment: the matching local government, or None if there is no single match.
+    """
+    from nigerian_states.registry import get_registry
+
+    return get_registry(using).get_lga(name, state=state)
+
+
+def lga_states(lga_name, using=None):
+    """
+    Names of the states having a local government called `lga_name`.
+
+    Args:
+        lga_name (str): name of the local government.
+        using (str): optional database alias, see `get_database`.
+
+    Returns:
+        tuple: state names, more than one for duplicated names such as "Obi".
+    """
+    from nigerian_states.registry import get_registry
+
+    return tuple(
+        lga.state.name for lga in get_registry(using).lgas_by_name.get(lga_name, ())
+    )
+
+
+INVALID_CHOICE = "Select a valid choice. %(value)s is not one of the available choices."
+REQUIRED = "This field is required."
+LGA_NOT_IN_STATE = "%(value)s is not a local government in %(state)s."
+ZONE_MISMATCH = "%(state)s is not in the %(value)s geo-political zone."
+
+
+def _build_validation_rules(registry, mask):
+    """
+    The lookups `validate_records` checks against, as plain (picklable) dicts:
+        - zones: names of the allowed zones
+        - states: state name or code -> (state name, zone name), for the allowed states
+        - lgas: state name -> lga names, codes and "State: LGA" qualified names
+        - all_lgas: the lga names, codes and qualified names of the allowed zones,
+          for the rows without a (valid) state
+    """
+    zones = frozenset(name for name in registry.zones if registry.in_mask(mask, name))
+    states, lgas = {}, {}
+    for state in registry.states.values():
+        if state.zone.name not in zones:
+            continue
+        states[state.name] = (state.name, state.zone.name)
+        if state.code:
+            states[state.code] = (state.name, state.zone.name)
+        values = set()
+        for lga in registry.lgas_by_state[state.name]:
+            values.update((lga.name, f"{state.name}: {lga.name}"))
+            if lga.code:
+                values.add(lga.code)
+        lgas[state.name] = frozenset(values)
+    all_lgas = frozenset().union(*lgas.values())
+    return {"zones": zones, "states": states, "lgas": lgas, "all_lgas": all_lgas}
+
+
+def _get(record, key):
+    try:
+        value = record[key]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+    return value
+
+
+def _validate_chunk(rules, keys, start, records):
+    """
+    Validate `records`, the rows numbered from `start`. Runs in the pool workers.
+    """
+    state_key, lga_key, zone_key = keys
+    states, lgas, zones = rules["states"], rules["lgas"], rules["zones"]
+    errors = {}
+    for row, record in enumerate(records, start):
+        row_errors = {}
+        state = None
+        if state_key is not None:
+            value = _get(record, state_key)
+            if not value:
+                row_errors[state_key] = [REQUIRED]
+            elif value not in states:
+                row_errors[state_key] = [INVALID_CHOICE % {"value": value}]
+            else:
+                state = states[value]
+        if lga_key is not None:
+            value = _get(record, lga_key)
+            if not value:
+                row_errors[lga_key] = [REQUIRED]
+            elif state is None:
+                # no state to check against, as LocalGovernmentField does.
+                if value not in rules["all_lgas"]:
+                    row_errors[lga_key] = [INVALID_CHOICE % {"value": value}]
+            elif value not in lgas[state[0]]:
+                row_errors[lga_key] = [
+                    LGA_NOT_IN_STATE % {"value": value, "state": state[0]}
+                ]
+        if zone_key is not None:
+            value = _get(record, zone_key)
+            if value and value not in zones:
+                row_errors[zone_key] = [INVALID_CHOICE % {"value": value}]
+            elif value and state is not None and value != state[1]:
+                row_errors[zone_key] = [
+                    ZONE_MISMATCH % {"value": value, "state": state[0]}
+                ]
+        if row_errors:
+            errors[row] = row_errors
+    return errors
+
+
+def validate_records(
+    records,
+    state_key="state",
+    lga_key="lga",
+    zone_key="zone",
+    zones=None,
+    using=None,
+    chunk_size=10000,
+    executor=None,
+):
+    """
+    Validate the state, local government and zone of many records (e.g. the rows of an
+    uploaded spreadsheet) with the rules of the form fields, without a Form per row:
+        - the state (name or ISO 3166-2 code) must be in the allowed zones
+        - the local government (name, code or "State: LGA") must be in the state
+        - the zone, when given, must be the zone of the state
+
+    Records are validated in chunks of `chunk_size`, one after the other, or in parallel
+    by `executor` when one is given. Validating a row costs a few dictionary lookups, so
+    a pool only pays off for very large inputs: sending the chunks to a
+    ProcessPoolExecutor made 200,000 rows about twice slower than the serial loop (and
+    forks the process, e.g. a web worker).
+
+    Args:
+        records: iterable of mappings (or sequences, with integer keys).
+        state_key, lga_key, zone_key: key of each value in the records, None to skip it.
+        zones (list): zones the states are limited to, defaults to
+            `settings.DEFAULT_GEO_POLITICAL_ZONES`, and then to every zone.
+        using (str): optional database alias, see `get_database`.
+        chunk_size (int): number of records validated per task.
+        executor (concurrent.futures.Executor): optional pool the chunks are submitted to,
+            e.g. a ProcessPoolExecutor already running in a batch job.
+
+    Returns:
+        dict: row index -> {key: [error messages]}, for the invalid rows only.
+    """
+    from nigerian_states.enums import PoliticalZones
+    from nigerian_states.registry import get_registry
+
+    if not zones:
+        zones = (
+            getattr(settings, "DEFAULT_GEO_POLITICAL_ZONES", [])
+            or PoliticalZones.values
+        )
+    registry = get_registry(using)
+    mask = registry.zone_mask(zones)
+    rules = registry.memoize(
+        ("validation", mask), lambda registry: _build_validation_rules(registry, mask)
+    )
+    keys = (state_key, lga_key, zone_key)
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    errors = {}
+    if executor is None:
+        for start, chunk in zip(count(0, chunk_size), chunks):
+            errors.update(_validate_chunk(rules, keys, start, chunk))
+        return errors
+    futures = [
+        executor.submit(_validate_chunk, rules, keys, start, chunk)
+        for start, chunk in zip(count(0, chunk_size), chunks)
+    ]
+    for future in futures:
+        errors.update(future.result())
+    return errors
@@ -0,0 +1,234 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.html import escape
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET, require_safe
+
+from nigerian_states.bundle import dataset_hash, dataset_json
+from nigerian_states.registry import get_registry
+
+
+def conditional_response(request, body, content_type, etag, last_modified=None):
+    """
+    Returns the response with `body`, or a 304 (or 412) if the request's conditions
+    say the client's copy is current. Used instead of `condition`, whose ETag would
+    be computed apart from the body, possibly from another registry.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = HttpResponse(body, content_type=content_type)
+    response.headers.setdefault("ETag", etag)
+    if timestamp is not None:
+        response.headers.setdefault("Last-Modified", http_date(timestamp))
+    return response
+
+
+@require_safe
+def dataset(request):
+    """
+    Serve the JSON dataset bundle. The body is built once per dataset version, and
+    the strong ETag lets clients revalidate with a 304 and no body.
+    """
+    registry = get_registry()
+    content_hash = dataset_hash(registry)
+    response = conditional_response(
+        request, dataset_json(registry), "application/json", f'"{content_hash}"'
+    )
+    # a request pinned to the current version (?v=<hash>) can be cached forever.
+    if request.GET.get("v") == content_hash:
+        patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@require_GET
+def readiness(request):
+    """
+    Readiness probe: 200 once the caches have been warmed (see `warmup.warm_up`), else 503.
+    """
+    from nigerian_states.warmup import is_ready
+
+    ready = is_ready()
+    response = JsonResponse({"ready": ready}, status=200 if ready else 503)
+    patch_cache_control(response, no_store=True)
+    return response
+
+
+def registry_json_view(resolve, build):
+    """
+    Make a read-only JSON view served from the registry.
+
+    Args:
+        resolve: resolve(registry, **url_kwargs) returns the canonical key of the
+            requested object, or None for a 404.
+        build: build(registry, key) returns the data to serialize.
+
+    The serialized body and its ETag are memoized on the registry per key, so a
+    request does no serialization work, and a revalidation gets a 304.
+    """
+
+    def get_payload(request, registry=None, **kwargs):
+        if registry is None:
+            registry = get_registry()
+        key = resolve(registry, **kwargs)
+        if key is None:
+            return None
+
+        def serialize(registry):
+            body = json.dumps(
+                build(registry, key), separators=(",", ":"), ensure_ascii=False
+            ).encode()
+            return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+        return registry.memoize(("api", build.__name__, key), serialize)
+
+    @require_safe
+    def view(request, **kwargs):
+        registry = get_registry()
+        payload = get_payload(request, registry, **kwargs)
+        if payload is None:
+            raise Http404
+        body, etag = payload
+        response = conditional_response(
+            request, body, "application/json", etag, registry.built_at
+        )
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    view.get_payload = get_payload
+    return view
+
+
+def _resolve_all(registry):
+    return "all"
+
+
+def _resolve_zone(registry, zone):
+    return zone if zone in registry.zones else None
+
+
+def _resolve_state(registry, state):
+    state = registry.get_state(state)
+    return state.name if state else None
+
+
+def _state_data(state):
+    return {
+        "name": state.name,
+        "code": state.code,
+        "capital": state.capital,
+        "zone": state.zone.name,
+        "latitude": state.latitude,
+        "longitude": state.longitude,
+    }
+
+
+def build_zones(registry, key):
+    return {
+        "zones": [
+            {"name": name, "states": list(states)}
+            for name, states in registry.state_names_by_zone.items()
+        ]
+    }
+
+
+def build_zone_states(registry, zone):
+    return {
+        "zone": zone,
+        "states": [
+            _state_data(registry.states[name])
+            for name in registry.state_names_by_zone[zone]
+        ],
+    }
+
+
+def build_state(registry, state):
+    data = _state_data(registry.states[state])
+    data["total_lgas"] = len(registry.lgas_by_state[state])
+    return data
+
+
+def build_state_lgas(registry, state):
+    return {
+        "state": state,
+        "lgas": [
+            {"name": lga.name, "code": lga.code}
+            for lga in registry.lgas_by_state[state]
+        ],
+    }
+
+
+zones = registry_json_view(_resolve_all, build_zones)
+zone_states = registry_json_view(_resolve_zone, build_zone_states)
+state_detail = registry_json_view(_resolve_state, build_state)
+state_lgas = registry_json_view(_resolve_state, build_state_lgas)
+
+
+def _build_lga_options(registry, state, qualified):
+    parts, offsets = [b'<option value="">Select a LG</option>'], {}
+    size = len(parts[0])
+    for lga in registry.lgas_by_state[state]:
+        value = f"{state}: {lga.name}" if qualified else lga.name
+        start = f'<option value="{escape(value)}"'.encode()
+        # where " selected" is inserted to preselect the option.
+        offsets[value] = size + len(start)
+        part = start + f">{escape(lga.name)}</option>".encode()
+        parts.append(part)
+        size += len(part)
+    body = b"".join(parts)
+    return body, offsets, hashlib.sha256(body).hexdigest()[:16]
+
+
+def get_lga_options(state, qualified=False):
+    """
+    Returns the `<option>` elements of the local governments of the state (name or
+    ISO 3166-2 code) as (bytes, {value: offset of " selected"}, hash), or None if the
+    state is unknown. Built once per state and registry.
+    """
+    registry = get_registry()
+    state = _resolve_state(registry, state)
+    if state is None:
+        return None
+    return registry.memoize(
+        ("lga_options", state, qualified),
+        lambda registry: _build_lga_options(registry, state, qualified),
+    )
+
+
+def _lga_options_request(request, state):
+    options = get_lga_options(state, qualified=request.GET.get("qualified") == "1")
+    if options is None:
+        return None
+    body, offsets, content_hash = options
+    offset = offsets.get(request.GET.get("selected"))
+    if offset is None:
+        return body, f'"{content_hash}"'
+    return body[:offset] + b" selected" + body[offset:], f'"{content_hash}-{offset}"'
+
+
+@require_safe
+def lga_options(request, state):
+    """
+    The `<option>` elements of the local governments of a state, for swapping the LGA
+    `<select>` (e.g. with HTMX) when the state changes. The fragment is precomputed;
+    `?selected=<value>` preselects an option and `?qualified=1` uses "State: LGA" values,
+    like `LocalGovernmentField(qualified=True)`.
+    """
+    options = _lga_options_request(request, state)
+    if options is None:
+        raise Http404
+    response = conditional_response(
+        request, options[0], "text/html; charset=utf-8", options[1]
+    )
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=getattr(settings, "NIGERIAN_STATES_OPTIONS_MAX_AGE", 3600),
+    )
+    return response
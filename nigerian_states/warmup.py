@@ -0,0 +1,173 @@
+import logging
+import time
+import weakref
+
+from django.db import connections
+
+# the models are imported by the functions, so that the gunicorn hooks can be imported
+# in gunicorn.conf.py, before Django is set up.
+
+logger = logging.getLogger("nigerian_states")
+
+WARM_UP_STEPS = []
+
+# `registry` is a weak reference to the registry warmed up last.
+_state = {"registry": None, "timings": {}}
+
+
+def warm_up_step(func):
+    """
+    Register `func(registry)` as a step of `warm_up`.
+    """
+    WARM_UP_STEPS.append(func)
+    return func
+
+
+@warm_up_step
+def spatial_indexes(registry):
+    from nigerian_states.spatial import get_lga_index, get_state_index
+
+    get_state_index()
+    get_lga_index()
+
+
+@warm_up_step
+def adjacency(registry):
+    from django.conf import settings
+
+    from nigerian_states.adjacency import get_lga_adjacency, get_state_adjacency
+
+    get_state_adjacency()
+    if getattr(settings, "NIGERIAN_STATES_LGA_ADJACENCY", None):
+        get_lga_adjacency()
+
+
+@warm_up_step
+def demographics(registry):
+    from nigerian_states.demographics import get_demographics
+
+    get_demographics()
+
+
+@warm_up_step
+def field_choices(registry):
+    from nigerian_states.fields import (
+        GeoPoliticalZoneField,
+        LocalGovernmentField,
+        StateField,
+    )
+
+    # the zones of `settings.DEFAULT_GEO_POLITICAL_ZONES`, the other subsets are built
+    # by the first field limited to them.
+    GeoPoliticalZoneField()
+    StateField()
+    LocalGovernmentField()
+    LocalGovernmentField(qualified=True)
+
+
+@warm_up_step
+def dataset_bundle(registry):
+    from nigerian_states.bundle import dataset_hash
+
+    dataset_hash()
+
+
+@warm_up_step
+def api_payloads(registry):
+    from nigerian_states import views
+
+    views.zones.get_payload(None)
+    for zone in registry.zones:
+        views.zone_states.get_payload(None, zone=zone)
+    for state in registry.states:
+        views.state_detail.get_payload(None, state=state)
+        views.state_lgas.get_payload(None, state=state)
+        views.get_lga_options(state)
+        views.get_lga_options(state, qualified=True)
+
+
+@warm_up_step
+def template_fragments(registry):
+    from nigerian_states.templatetags import state_tags
+
+    state_tags.render_states_with_lgas()
+    for zone in registry.zones:
+        state_tags.render_zone_states(zone)
+        state_tags.render_states_with_lgas(zone)
+    for state in registry.states:
+        state_tags.render_state_lgas(state)
+
+
+def warm_up():
+    """
+    Build every cache the package uses (for the database of `utils.get_database`),
+    so the first requests do not pay for it.
+
+    Returns:
+        dict: seconds taken by each step, including "registry" and "total".
+    """
+    from nigerian_states.registry import get_registry
+
+    timings = {}
+    start = time.perf_counter()
+    registry = get_registry()
+    timings["registry"] = time.perf_counter() - start
+    for step in WARM_UP_STEPS:
+        step_start = time.perf_counter()
+        step(registry)
+        timings[step.__name__] = time.perf_counter() - step_start
+    timings["total"] = time.perf_counter() - start
+    _state.update(registry=weakref.ref(registry), timings=timings)
+    logger.info(
+        "nigerian_states caches warmed in %.1fms (%s)",
+        timings["total"] * 1000,
+        ", ".join(
+            f"{name}: {seconds * 1000:.1f}ms" for name, seconds in timings.items()
+        ),
+    )
+    return timings
+
+
+def is_ready():
+    """
+    Readiness check: True once `warm_up` has completed in this process, and until
+    the registry it warmed is dropped (e.g. by a write or a sync).
+    """
+    from nigerian_states.registry import cached_registry
+
+    warmed = _state["registry"] and _state["registry"]()
+    return warmed is not None and warmed is cached_registry()
+
+
+def last_timings():
+    """
+    Returns the timings of the last `warm_up`, or {} if it has not run.
+    """
+    return dict(_state["timings"])
+
+
+def on_starting(server):
+    """
+    gunicorn `on_starting` hook: warm up in the master, so that forked workers
+    inherit the caches. The master's database connections are closed afterwards.
+
+    Usage (gunicorn.conf.py): from nigerian_states.warmup import on_starting
+    """
+    import django
+
+    django.setup()
+    warm_up()
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    """
+    gunicorn `post_fork` hook: warm up in each worker.
+
+    Usage (gunicorn.conf.py): from nigerian_states.warmup import post_fork
+    """
+    import django
+
+    # without `preload_app`, the worker has not set up Django yet.
+    django.setup()
+    warm_up()
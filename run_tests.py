@@ -2,6 +2,7 @@ import django, sys
 from django.conf import settings
 
 settings.configure(
+    SECRET_KEY="nigerian-states-tests",
     SILENCED_SYSTEM_CHECKS=["mysql.E001"],
     # Application definition
     INSTALLED_APPS=[
@@ -52,7 +53,12 @@ settings.configure(
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": "db.sqlite3",
-        }
+        },
+        # a second database, for the multi-database tests.
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": "replica.sqlite3",
+        },
     },
 )
 
@@ -1,6 +1,10 @@
-import random
-from nigerian_states.models import GeoPoliticalZone, LocalGovernment, State
-from django.core.management import call_command
+from nigerian_states.models import State
+from nigerian_states.testing import (
+    load_geography,
+    random_lga,
+    random_state,
+    random_zone,
+)
 
 
 EXPECTED_STATE_COUNT = 37
@@ -18,29 +22,26 @@ OYO_LGAS = 33
 
 
 def get_random_zone():
-    return random.choice(GeoPoliticalZone.objects.all())
+    return random_zone()
 
 
 def get_random_state():
-    return random.choice(State.objects.all())
+    return random_state()
 
 
 def get_random_lga():
-    return random.choice(LocalGovernment.objects.all())
+    return random_lga()
 
 
 def load_fixtures():
     """
     Helper function to load fixtures data in the needed test function
     """
-    return call_command(
-        "loaddata", "nigerian_states/fixtures/fixtures.json", verbosity=0
-    )
+    return load_geography()
 
 
 def get_random_state_in_zone(zone_name):
-    zone = GeoPoliticalZone.objects.get(name=zone_name)
-    return random.choice(zone.all_states)
+    return random_state(zone=zone_name)
 
 
 def get_state(name):
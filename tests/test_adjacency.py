@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from nigerian_states.adjacency import (
+    Graph,
+    STATE_BORDERS,
+    get_state_adjacency,
+    lga_path,
+    lgas_within,
+    neighboring_lgas,
+    neighboring_states,
+    state_path,
+    states_within,
+)
+from nigerian_states.registry import clear_registry
+from nigerian_states.templatetags.state_tags import (
+    are_neighboring_states,
+    get_neighboring_states,
+)
+from nigerian_states.testing import GeographyTestCase
+from .defaults import TOTAL_STATES
+
+
+def names(objects):
+    return [obj.name for obj in objects]
+
+
+class TestGraph(SimpleTestCase):
+    """
+    Test cases for the CSR graph.
+    """
+
+    def setUp(self):
+        # 0 - 1 - 2 - 3, and 4 on its own
+        self.graph = Graph(5, [(0, 1), (2, 1), (2, 3), (3, 2), (4, 4)])
+
+    def test_neighbors(self):
+        """
+        Test that edges are undirected, deduplicated and sorted.
+        """
+        self.assertEqual(list(self.graph.indptr), [0, 1, 3, 5, 6, 6])
+        self.assertEqual(list(self.graph.neighbors(1)), [0, 2])
+        self.assertEqual(list(self.graph.neighbors(4)), [])
+
+    def test_hops(self):
+        """
+        Test the breadth first search, with and without a limit.
+        """
+        self.assertEqual(self.graph.hops(0), {0: 0, 1: 1, 2: 2, 3: 3})
+        self.assertEqual(self.graph.hops(0, 1), {0: 0, 1: 1})
+
+    def test_shortest_path(self):
+        """
+        Test the shortest paths, and unreachable nodes.
+        """
+        self.assertEqual(self.graph.shortest_path(0, 3), [0, 1, 2, 3])
+        self.assertEqual(self.graph.shortest_path(2, 2), [2])
+        self.assertIsNone(self.graph.shortest_path(0, 4))
+
+
+class TestStateAdjacency(GeographyTestCase):
+    """
+    Test cases for the packaged state borders.
+    """
+
+    def test_borders_data(self):
+        """
+        Test that every state has a neighbour, and all states are connected.
+        """
+        codes = {code for pair in STATE_BORDERS for code in pair}
+        self.assertEqual(len(codes), TOTAL_STATES)
+        self.assertEqual(len(states_within("Lagos", hops=None)), TOTAL_STATES - 1)
+
+    def test_neighboring_states(self):
+        """
+        Test the neighbours of a state, by name or code.
+        """
+        self.assertEqual(names(neighboring_states("Lagos")), ["Ogun"])
+        self.assertEqual(names(neighboring_states("NG-LA")), ["Ogun"])
+        self.assertIn("Lagos", names(neighboring_states("Ogun")))
+        self.assertEqual(
+            sorted(names(neighboring_states("Federal Capital Territory"))),
+            ["Kaduna", "Kogi", "Nasarawa", "Niger"],
+        )
+        self.assertEqual(neighboring_states("Atlantis"), ())
+
+    def test_states_within(self):
+        """
+        Test the states within k hops, nearest first.
+        """
+        within = names(states_within("Lagos", hops=2))
+        self.assertEqual(within[0], "Ogun")
+        self.assertEqual(sorted(within[1:]), ["Ondo", "Osun", "Oyo"])
+
+    def test_state_path(self):
+        """
+        Test the shortest path between two states.
+        """
+        path = names(state_path("Lagos", "NG-KW"))
+        self.assertEqual(path[0], "Lagos")
+        self.assertEqual(path[-1], "Kwara")
+        self.assertEqual(len(path), 4)
+        self.assertIsNone(state_path("Lagos", "Atlantis"))
+
+    def test_are_neighbors(self):
+        """
+        Test whether two states share a border.
+        """
+        index = get_state_adjacency()
+        self.assertTrue(index.are_neighbors("Lagos", "Ogun"))
+        self.assertFalse(index.are_neighbors("Lagos", "Oyo"))
+
+    def test_template_tags(self):
+        """
+        Test the adjacency template tags.
+        """
+        self.assertEqual(get_neighboring_states("NG-LA"), ["Ogun"])
+        self.assertEqual(len(get_neighboring_states("Lagos", "2")), 4)
+        self.assertTrue(are_neighboring_states("Ogun", "Oyo"))
+        self.assertFalse(are_neighboring_states("Lagos", "Kano"))
+
+
+class TestLgaAdjacency(GeographyTestCase):
+    """
+    Test cases for the LGA borders read from settings.NIGERIAN_STATES_LGA_ADJACENCY.
+    """
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "lgas.json")
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "Lagos: Ikeja": ["Lagos: Kosofe", "Lagos: Mushin"],
+                    "Lagos: Mushin": ["Lagos: Agege"],
+                    "Benue: Obi": ["Unknown"],
+                },
+                f,
+            )
+        settings = override_settings(NIGERIAN_STATES_LGA_ADJACENCY=path)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_lga_adjacency(self):
+        """
+        Test the neighbours, k hops and paths of LGAs, unknown LGAs in the file left out.
+        """
+        self.assertEqual(
+            sorted(names(neighboring_lgas("Lagos: Ikeja"))), ["Kosofe", "Mushin"]
+        )
+        self.assertEqual(names(neighboring_lgas("Lagos: Kosofe")), ["Ikeja"])
+        self.assertEqual(neighboring_lgas("Benue: Obi"), ())
+        self.assertEqual(len(lgas_within("Lagos: Kosofe", hops=3)), 3)
+        self.assertEqual(
+            names(lga_path("Lagos: Kosofe", "Lagos: Agege")),
+            ["Kosofe", "Ikeja", "Mushin", "Agege"],
+        )
+
+    def test_missing_setting(self):
+        """
+        Test that LGA adjacency needs the setting.
+        """
+        clear_registry()
+        with override_settings(NIGERIAN_STATES_LGA_ADJACENCY=None):
+            with self.assertRaises(ImproperlyConfigured):
+                neighboring_lgas("Lagos: Ikeja")
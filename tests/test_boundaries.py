@@ -0,0 +1,242 @@
+import json
+import os
+import random
+import tempfile
+from unittest import skipIf, mock
+
+from django.test import TestCase, override_settings
+
+from nigerian_states import boundaries
+from nigerian_states.boundaries import BoundaryIndex, STRTree
+from nigerian_states.testing import GeographyTestCase
+from nigerian_states.utils import get_numpy
+
+
+def square(min_x, min_y, max_x, max_y):
+    return [
+        [min_x, min_y],
+        [max_x, min_y],
+        [max_x, max_y],
+        [min_x, max_y],
+        [min_x, min_y],
+    ]
+
+
+# simplified, made up boundaries
+STATE_BOUNDARIES = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"code": "NG-LA"},
+            # with a hole, to check the even-odd rule
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [square(2.7, 6.3, 4.0, 6.7), square(3.0, 6.4, 3.1, 6.5)],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {"code": "NG-OG"},
+            "geometry": {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [square(2.7, 6.7, 4.0, 7.8)],
+                    [square(3.0, 6.4, 3.1, 6.5)],
+                ],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {"code": "NG-KN"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [square(7.7, 10.5, 9.5, 12.7)],
+            },
+        },
+    ],
+}
+
+LGA_BOUNDARIES = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"name": "Lagos: Badagry"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [square(2.7, 6.3, 3.0, 6.6)],
+            },
+        },
+        {
+            "type": "Feature",
+            "properties": {"name": "Benue: Obi"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [square(8.2, 7.0, 8.5, 7.3)],
+            },
+        },
+    ],
+}
+
+
+class TestBoundaryIndex(TestCase):
+    """
+    Test cases for the point-in-polygon index.
+    """
+
+    def setUp(self):
+        self.index = BoundaryIndex.from_geojson(STATE_BOUNDARIES)
+
+    def test_locate(self):
+        """
+        Test that `locate` returns the key of the containing feature, or None.
+        """
+        self.assertEqual(self.index.locate(6.5, 3.5), "NG-LA")
+        self.assertEqual(self.index.locate(7.0, 3.5), "NG-OG")
+        self.assertEqual(self.index.locate(12.0, 8.5), "NG-KN")
+        # inside the hole of Lagos, which is part of Ogun
+        self.assertEqual(self.index.locate(6.45, 3.05), "NG-OG")
+        self.assertIsNone(self.index.locate(9.0, 7.4))
+
+    def test_locate_many_matches_locate(self):
+        """
+        Test that the batch api agrees with `locate`, with and without NumPy.
+        """
+        rng = random.Random(0)
+        lats = [rng.uniform(6, 13) for _ in range(500)]
+        lons = [rng.uniform(2.5, 10) for _ in range(500)]
+        expected = [self.index.locate(lat, lon) for lat, lon in zip(lats, lons)]
+        self.assertEqual(self.index.locate_many(lats, lons), expected)
+        with mock.patch.object(boundaries, "get_numpy", return_value=None):
+            self.assertEqual(self.index.locate_many(lats, lons), expected)
+
+    def test_str_tree(self):
+        """
+        Test that the R-tree returns exactly the boxes containing a point.
+        """
+        rng = random.Random(1)
+        bboxes = []
+        for _ in range(300):
+            x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+            bboxes.append((x, y, x + rng.uniform(0, 10), y + rng.uniform(0, 10)))
+        tree = STRTree(bboxes, capacity=8)
+        for _ in range(100):
+            x, y = rng.uniform(0, 110), rng.uniform(0, 110)
+            expected = [
+                i
+                for i, b in enumerate(bboxes)
+                if b[0] <= x <= b[2] and b[1] <= y <= b[3]
+            ]
+            self.assertEqual(sorted(tree.query(x, y)), expected)
+        self.assertEqual(STRTree([]).query(1, 1), [])
+
+    @skipIf(get_numpy() is None, "NumPy is not installed")
+    def test_str_tree_query_many(self):
+        """
+        Test that the batch query of the R-tree agrees with `query`.
+        """
+        numpy = get_numpy()
+        rng = random.Random(2)
+        bboxes = []
+        for _ in range(300):
+            x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+            bboxes.append((x, y, x + rng.uniform(0, 10), y + rng.uniform(0, 10)))
+        tree = STRTree(bboxes, capacity=8)
+        xs = numpy.array([rng.uniform(0, 110) for _ in range(200)])
+        ys = numpy.array([rng.uniform(0, 110) for _ in range(200)])
+        expected = {}
+        for point, (x, y) in enumerate(zip(xs.tolist(), ys.tolist())):
+            for box in tree.query(x, y):
+                expected.setdefault(box, []).append(point)
+        found = tree.query_many(numpy, xs, ys)
+        self.assertEqual(
+            {box: points.tolist() for box, points in found.items()}, expected
+        )
+
+    @skipIf(get_numpy() is None, "NumPy is not installed")
+    def test_memory_mapped_store(self):
+        """
+        Test that a saved store loads memory-mapped and gives the same answers.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            self.index.save(directory)
+            loaded = BoundaryIndex.from_file(directory)
+            self.assertEqual(len(loaded), 3)
+            self.assertEqual(loaded.locate(6.5, 3.5), "NG-LA")
+            self.assertEqual(loaded.locate(6.45, 3.05), "NG-OG")
+            self.assertEqual(
+                loaded.locate_many([12.0, 1.0], [8.5, 1.0]), ["NG-KN", None]
+            )
+
+
+class TestBoundaryResolution(GeographyTestCase):
+    """
+    Test cases for resolving coordinates to State, LocalGovernment and GeoPoliticalZone rows.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        paths = {}
+        for name, data in (("states", STATE_BOUNDARIES), ("lgas", LGA_BOUNDARIES)):
+            paths[name] = os.path.join(self.directory.name, f"{name}.geojson")
+            with open(paths[name], "w") as f:
+                json.dump(data, f)
+        settings = override_settings(
+            NIGERIAN_STATES_STATE_BOUNDARIES=paths["states"],
+            NIGERIAN_STATES_LGA_BOUNDARIES=paths["lgas"],
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_resolve_state_and_zone(self):
+        """
+        Test that coordinates resolve to the State and GeoPoliticalZone containing them.
+        """
+        self.assertEqual(boundaries.resolve_state(6.5, 3.5).name, "Lagos")
+        self.assertEqual(boundaries.resolve_zone(12.0, 8.5).name, "North West")
+        self.assertIsNone(boundaries.resolve_state(9.0, 7.4))
+        self.assertIsNone(boundaries.resolve_zone(9.0, 7.4))
+        states = boundaries.resolve_states([6.5, 7.0], [3.5, 3.5])
+        self.assertEqual([state.name for state in states], ["Lagos", "Ogun"])
+
+    def test_resolve_lga(self):
+        """
+        Test that coordinates resolve to the LocalGovernment, including duplicated names.
+        """
+        badagry = boundaries.resolve_lga(6.4, 2.9)
+        self.assertEqual((badagry.state.name, badagry.name), ("Lagos", "Badagry"))
+        obi = boundaries.resolve_lgas([7.1, 0.0], [8.3, 0.0])
+        self.assertEqual(obi[0].state.name, "Benue")
+        self.assertIsNone(obi[1])
+
+    def test_missing_setting(self):
+        """
+        Test that resolving without configured boundaries raises ImproperlyConfigured.
+        """
+        from django.core.exceptions import ImproperlyConfigured
+        from nigerian_states.registry import clear_registry
+
+        clear_registry()
+        with override_settings(NIGERIAN_STATES_STATE_BOUNDARIES=None):
+            with self.assertRaises(ImproperlyConfigured):
+                boundaries.resolve_state(6.5, 3.5)
+
+    def test_index_outlives_registry(self):
+        """
+        Test that the boundary index is loaded once per path, not once per registry.
+        """
+        from django.conf import settings
+        from nigerian_states.models import State
+        from nigerian_states.registry import clear_registry
+
+        index = boundaries.get_state_boundaries()
+        clear_registry()
+        State.objects.filter(name="Lagos").update(name="Lagos")
+        self.assertIs(boundaries.get_state_boundaries(), index)
+        with override_settings(
+            NIGERIAN_STATES_STATE_BOUNDARIES=settings.NIGERIAN_STATES_LGA_BOUNDARIES
+        ):
+            self.assertIsNot(boundaries.get_state_boundaries(), index)
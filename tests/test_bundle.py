@@ -0,0 +1,211 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import CommandError
+from django.test import RequestFactory, override_settings
+
+from nigerian_states.bundle import build_dataset, dataset_hash, dataset_json
+from nigerian_states.finders import DatasetBundleFinder, default_bundle_dir
+from nigerian_states.models import State
+from nigerian_states.registry import get_registry
+from nigerian_states.views import dataset
+from nigerian_states.testing import GeographyTestCase
+from .defaults import TOTAL_LGAS, TOTAL_STATES, TOTAL_ZONES
+
+
+class TestDatasetBundle(GeographyTestCase):
+    """
+    Test cases for the static JSON bundle of the dataset.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_build_dataset(self):
+        """
+        Test that the bundle holds the whole zone -> state -> lga hierarchy.
+        """
+        data = build_dataset(get_registry())
+        self.assertEqual(len(data["zones"]), TOTAL_ZONES)
+        states = [state for zone in data["zones"] for state in zone["states"]]
+        self.assertEqual(len(states), TOTAL_STATES)
+        self.assertEqual(sum(len(state["lgas"]) for state in states), TOTAL_LGAS)
+        lagos = next(state for state in states if state["name"] == "Lagos")
+        self.assertEqual(lagos["code"], "NG-LA")
+        self.assertIn({"name": "Badagry", "code": "NG-LA-05"}, lagos["lgas"])
+        self.assertEqual(json.loads(dataset_json()), data)
+        self.assertNotIn(b'", "', dataset_json())
+        self.assertNotIn(b'": ', dataset_json())
+
+    def test_hash_changes_with_data(self):
+        """
+        Test that the content hash changes when the data changes.
+        """
+        before = dataset_hash()
+        self.assertEqual(dataset_hash(), before)
+        State.objects.filter(name="Lagos").first().save()
+        self.assertEqual(dataset_hash(), before)
+        state = State.objects.get(name="Lagos")
+        state.capital = "Lagos Island"
+        state.save()
+        self.assertNotEqual(dataset_hash(), before)
+
+    def test_export_command(self):
+        """
+        Test that the command writes the hashed, precompressed JSON and ES module files.
+        """
+        out = StringIO()
+        call_command(
+            "export_nigerian_states", output_dir=self.directory.name, stdout=out
+        )
+        files = set(os.listdir(self.directory.name))
+        name = f"nigerian-states.{dataset_hash()}"
+        for expected in (
+            f"{name}.json",
+            f"{name}.json.gz",
+            f"{name}.mjs",
+            f"{name}.mjs.gz",
+        ):
+            self.assertIn(expected, files)
+        with open(os.path.join(self.directory.name, f"{name}.json.gz"), "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), dataset_json())
+        with open(os.path.join(self.directory.name, f"{name}.mjs"), "rb") as f:
+            self.assertTrue(f.read().startswith(b"export default {"))
+        with open(
+            os.path.join(self.directory.name, "nigerian-states.manifest.json")
+        ) as f:
+            self.assertEqual(json.load(f)["nigerian-states.json"], f"{name}.json")
+        self.assertIn(f"{name}.json", out.getvalue())
+
+    def test_export_command_without_directory(self):
+        """
+        Test that the command needs an output directory.
+        """
+        with self.assertRaises(CommandError):
+            call_command("export_nigerian_states")
+
+    def test_finder(self):
+        """
+        Test that the staticfiles finder lists and finds the bundle under `nigerian_states/`.
+        """
+        with override_settings(NIGERIAN_STATES_BUNDLE_DIR=self.directory.name):
+            finder = DatasetBundleFinder()
+            names = [name for name, storage in finder.list([])]
+            name = f"nigerian-states.{dataset_hash()}.json"
+            self.assertIn(name, names)
+            self.assertEqual(finder.storage.prefix, "nigerian_states")
+            found = finder.find(f"nigerian_states/{name}")
+            self.assertEqual(found, os.path.join(self.directory.name, name))
+            self.assertIsNone(finder.find("other/file.json"))
+            self.assertEqual(finder.find(f"nigerian_states/{name}", all=True), [found])
+
+    def test_finder_prunes_old_bundles(self):
+        """
+        Test that the bundles of previous versions of the data are not collected.
+        """
+        stale = os.path.join(
+            self.directory.name, "nigerian-states.0123456789abcdef.json"
+        )
+        other = os.path.join(self.directory.name, "other.txt")
+        for path in (stale, other):
+            open(path, "w").close()
+        with override_settings(NIGERIAN_STATES_BUNDLE_DIR=self.directory.name):
+            names = [name for name, storage in DatasetBundleFinder().list([])]
+        self.assertNotIn(os.path.basename(stale), names)
+        self.assertIn(f"nigerian-states.{dataset_hash()}.json", names)
+        self.assertIn("other.txt", names)
+
+    def test_finder_default_directory(self):
+        """
+        Test that the default directory depends on the project.
+        """
+        directory = default_bundle_dir()
+        self.assertEqual(DatasetBundleFinder().location, directory)
+        with override_settings(STATIC_ROOT="/srv/other/static"):
+            self.assertNotEqual(default_bundle_dir(), directory)
+
+    def test_finder_without_data(self):
+        """
+        Test that the finder fails clearly without the tables or the data.
+        """
+        with override_settings(NIGERIAN_STATES_BUNDLE_DIR=self.directory.name):
+            State.objects.all().delete()
+            with self.assertRaisesMessage(ImproperlyConfigured, "no states"):
+                list(DatasetBundleFinder().list([]))
+            introspection = connection.introspection
+            with mock.patch.object(introspection, "table_names", return_value=[]):
+                with self.assertRaisesMessage(ImproperlyConfigured, "migrate"):
+                    DatasetBundleFinder().find("nigerian_states/nigerian-states.json")
+
+
+class TestDatasetView(GeographyTestCase):
+    """
+    Test cases for the dataset view.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def test_dataset_view(self):
+        """
+        Test that the view serves the bundle with a strong ETag.
+        """
+        response = dataset(self.factory.get("/dataset.json"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, dataset_json())
+        self.assertEqual(response["ETag"], f'"{dataset_hash()}"')
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_dataset_view_not_modified(self):
+        """
+        Test that a matching If-None-Match gets a 304 without a body.
+        """
+        etag = f'"{dataset_hash()}"'
+        response = dataset(self.factory.get("/dataset.json", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        response = dataset(self.factory.get("/dataset.json", HTTP_IF_NONE_MATCH='"x"'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_dataset_view_pinned_version(self):
+        """
+        Test that a request for the current version is cacheable forever.
+        """
+        response = dataset(self.factory.get("/dataset.json", {"v": dataset_hash()}))
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+
+    def test_dataset_view_head(self):
+        """
+        Test that HEAD requests are served, and POST requests refused.
+        """
+        response = dataset(self.factory.head("/dataset.json"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], f'"{dataset_hash()}"')
+        self.assertEqual(dataset(self.factory.post("/dataset.json")).status_code, 405)
+
+    def test_dataset_view_one_registry(self):
+        """
+        Test that the ETag and the body come from the same registry, so a registry
+        dropped during the request cannot pair the new body with the old ETag.
+        """
+        registry = get_registry()
+        with mock.patch(
+            "nigerian_states.views.get_registry", return_value=registry
+        ) as views_registry, mock.patch(
+            "nigerian_states.registry.get_registry"
+        ) as other_registry:
+            response = dataset(self.factory.get("/dataset.json"))
+        self.assertEqual(views_registry.call_count, 1)
+        other_registry.assert_not_called()
+        self.assertEqual(response.content, dataset_json(registry))
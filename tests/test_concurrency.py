@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+import warnings
+from unittest import mock, skipUnless
+
+from nigerian_states import registry as registry_module
+from nigerian_states.registry import GeoRegistry, clear_registry, get_registry
+from nigerian_states.templatetags import state_tags
+from nigerian_states.testing import GeographyTestCase
+from .defaults import LAGOS_LGAS
+
+
+class TestConcurrency(GeographyTestCase):
+    """
+    Test cases for the registry lifecycle under threads and forks. The registries are
+    built from the objects loaded by the main thread, since the test data is not
+    visible to the database connections of other threads.
+    """
+
+    def setUp(self):
+        super().setUp()
+        base = get_registry()
+        self.builds = 0
+
+        def build(using=None):
+            self.builds += 1
+            # give the other threads a chance to race the builder.
+            time.sleep(0.01)
+            return GeoRegistry(base.zones.values(), base.states.values(), base.lgas)
+
+        patcher = mock.patch.object(GeoRegistry, "build", side_effect=build)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_registry()
+
+    def run_threads(self, target, count=16):
+        barrier = threading.Barrier(count)
+        results, errors = [], []
+
+        def run():
+            barrier.wait()
+            try:
+                results.append(target())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return results
+
+    def test_single_builder(self):
+        """
+        Test that concurrent first lookups build one registry, and share it.
+        """
+        registries = self.run_threads(get_registry)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(len({id(registry) for registry in registries}), 1)
+
+    def test_memoize_single_builder(self):
+        """
+        Test that concurrent first calls of a memoized value build it once.
+        """
+        registry = get_registry()
+        builder = mock.Mock(side_effect=lambda registry: time.sleep(0.01) or object())
+        values = self.run_threads(lambda: registry.memoize("test", builder))
+        self.assertEqual(builder.call_count, 1)
+        self.assertEqual(len({id(value) for value in values}), 1)
+
+    def test_clear_during_build(self):
+        """
+        Test that a registry built across a write is used once, but not cached.
+        """
+        build = GeoRegistry.build.side_effect
+
+        def build_then_write(using=None):
+            registry = build(using)
+            clear_registry()
+            return registry
+
+        with mock.patch.object(GeoRegistry, "build", side_effect=build_then_write):
+            registry = get_registry()
+        self.assertEqual(state_tags.get_capital("Lagos"), "Ikeja")
+        self.assertIsNot(get_registry(), registry)
+        self.assertEqual(self.builds, 2)
+
+    def test_tags_under_invalidation(self):
+        """
+        Test that the tags stay correct while the registries are dropped and rebuilt,
+        and that the number of lookups done in a fixed time does not collapse with
+        the number of threads, since cached lookups do not take a lock.
+        """
+        duration = 0.3
+
+        def hammer(stop):
+            calls = 0
+            while not stop.is_set():
+                assert state_tags.get_capital("Lagos") == "Ikeja"
+                assert state_tags.get_zone("NG-KN") == "North West"
+                assert len(state_tags.get_lgas_in_state("Lagos")) == LAGOS_LGAS
+                assert state_tags.is_lga_in_state("Oyo", "Ibadan North")
+                assert "Ikeja" in state_tags.render_state_lgas("Lagos")
+                calls += 1
+            return calls
+
+        def throughput(count, invalidate=False):
+            stop = threading.Event()
+
+            def stop_after():
+                deadline = time.perf_counter() + duration
+                while time.perf_counter() < deadline:
+                    if invalidate:
+                        clear_registry()
+                    time.sleep(0.005)
+                stop.set()
+
+            stopper = threading.Thread(target=stop_after)
+            stopper.start()
+            calls = self.run_threads(lambda: hammer(stop), count)
+            stopper.join()
+            return sum(calls)
+
+        get_registry()
+        single = throughput(1)
+        self.assertGreater(single, 0)
+        builds = self.builds
+        self.assertGreater(throughput(8, invalidate=True), 0)
+        self.assertGreater(self.builds, builds)
+        self.assertGreater(throughput(8), single / 2)
+
+    @skipUnless(hasattr(os, "fork"), "os.fork is not available")
+    def test_fork(self):
+        """
+        Test that a child forked while another thread holds the build lock can build
+        its own registry.
+        """
+        parent = get_registry()
+        building, release = threading.Event(), threading.Event()
+        build = GeoRegistry.build.side_effect
+
+        def slow_build(using=None):
+            building.set()
+            release.wait()
+            return build(using)
+
+        with mock.patch.object(GeoRegistry, "build", side_effect=slow_build):
+            clear_registry()
+            thread = threading.Thread(target=get_registry)
+            thread.start()
+            building.wait()
+            self.assertTrue(registry_module._build_lock.locked())
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    if not registry_module._build_lock.locked():
+                        with mock.patch.object(GeoRegistry, "build", side_effect=build):
+                            code = 0 if get_registry().states else 1
+                finally:
+                    os._exit(code)
+            release.set()
+            thread.join()
+        deadline = time.monotonic() + 10
+        while True:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        if not done:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+        self.assertTrue(done, "the forked child did not finish")
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertIsNot(get_registry(), parent)
+
+    def test_fork_keeps_registries(self):
+        """
+        Test that the locks are replaced, and the warm registries kept, after a fork.
+        """
+        registry = get_registry()
+        lock, registry_lock = registry_module._build_lock, registry._lock
+        registry_module._reset_locks()
+        self.assertIsNot(registry_module._build_lock, lock)
+        self.assertIsNot(registry._lock, registry_lock)
+        self.assertIs(get_registry(), registry)
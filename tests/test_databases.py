@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from nigerian_states.fields import LocalGovernmentField, StateField
+from nigerian_states.registry import get_registry, registry_key
+from nigerian_states.templatetags.state_tags import get_capital, get_lgas_in_state
+from nigerian_states.utils import get_database, names_in_zone
+from .defaults import TOTAL_LGAS, TOTAL_STATES
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return "replica"
+
+
+class TestDatabaseRouting(TestCase):
+    """
+    Test that the package reads go to the configured database, with a registry per alias.
+    The data is only loaded into the `replica` database.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        # the registries built inside the uncommitted loaddata transaction are not cached.
+        with self.captureOnCommitCallbacks(using="replica", execute=True):
+            call_command(
+                "loaddata",
+                "nigerian_states/fixtures/fixtures.json",
+                database="replica",
+                verbosity=0,
+            )
+
+    def test_get_database(self):
+        """
+        Test the precedence of `using`, the setting and the routers.
+        """
+        self.assertEqual(get_database(), "default")
+        self.assertEqual(get_database("replica"), "replica")
+        with override_settings(NIGERIAN_STATES_DATABASE="replica"):
+            self.assertEqual(get_database(), "replica")
+            self.assertEqual(get_database("default"), "default")
+        with override_settings(DATABASE_ROUTERS=[ReplicaRouter()]):
+            self.assertEqual(get_database(), "replica")
+
+    def test_registry_per_alias(self):
+        """
+        Test that each database alias gets its own registry.
+        """
+        self.assertEqual(len(get_registry("replica").states), TOTAL_STATES)
+        self.assertEqual(len(get_registry("default").states), 0)
+        self.assertIsNot(get_registry("replica"), get_registry("default"))
+        self.assertEqual(registry_key("replica"), ("replica", None))
+        self.assertIn("Lagos", names_in_zone("South West", using="replica"))
+        self.assertEqual(names_in_zone("South West"), ())
+
+    def test_fields_using(self):
+        """
+        Test that the fields read their choices from `using`.
+        """
+        self.assertEqual(len(StateField().choices), 1)
+        self.assertEqual(len(StateField(using="replica").choices), TOTAL_STATES + 1)
+        with override_settings(
+            NIGERIAN_STATES_DATABASE="replica", DEFAULT_GEO_POLITICAL_ZONES=[]
+        ):
+            self.assertEqual(len(LocalGovernmentField().choices), TOTAL_LGAS + 1)
+
+    def test_tags_follow_setting(self):
+        """
+        Test that the template tags read from `settings.NIGERIAN_STATES_DATABASE`.
+        """
+        self.assertEqual(get_capital("Lagos"), "")
+        with override_settings(NIGERIAN_STATES_DATABASE="replica"):
+            self.assertEqual(get_capital("Lagos"), "Ikeja")
+            self.assertIn("Badagry", get_lgas_in_state("Lagos"))
+
+    def test_cached_alias(self):
+        """
+        Test that a lookup with the database pinned by the setting does not go through
+        the routers or the connections.
+        """
+        with override_settings(NIGERIAN_STATES_DATABASE="replica"):
+            registry = get_registry()
+            with mock.patch("nigerian_states.utils.router") as router, mock.patch(
+                "nigerian_states.registry.connections"
+            ) as connections:
+                self.assertIs(get_registry(), registry)
+            router.db_for_read.assert_not_called()
+            self.assertEqual(connections.mock_calls, [])
+        self.assertEqual(len(get_registry().states), 0)
+        with override_settings(DATABASE_ROUTERS=[ReplicaRouter()]):
+            self.assertIs(get_registry(), registry)
+
+    def test_router_per_lookup(self):
+        """
+        Test that the routers are asked on every lookup, e.g. for a router choosing
+        the database of the current tenant.
+        """
+        router = ReplicaRouter()
+        with override_settings(DATABASE_ROUTERS=[router]):
+            self.assertEqual(get_capital("Lagos"), "Ikeja")
+            with mock.patch.object(router, "db_for_read", return_value="default"):
+                self.assertEqual(get_database(), "default")
+                self.assertEqual(get_capital("Lagos"), "")
+            self.assertEqual(get_database(), "replica")
@@ -0,0 +1,115 @@
+import math
+from unittest import mock
+
+from nigerian_states.demographics import (
+    get_demographics,
+    lga_table,
+    per_capita,
+    state_table,
+)
+from nigerian_states.models import LocalGovernment, State
+from nigerian_states.registry import clear_registry, get_registry
+from nigerian_states.testing import GeographyTestCase
+from .defaults import TOTAL_LGAS, TOTAL_STATES
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# 2006 census
+TOTAL_POPULATION = 140431790
+
+
+class TestDemographics(GeographyTestCase):
+    """
+    Test cases for the population, area and density columns.
+    """
+
+    def test_packaged_figures(self):
+        """
+        Test that the states carry the census figures, and the LGAs none.
+        """
+        lagos = State.objects.get(code="NG-LA")
+        self.assertEqual(lagos.population, 9113605)
+        self.assertEqual(lagos.area, 3345)
+        self.assertAlmostEqual(lagos.density, 9113605 / 3345)
+        self.assertFalse(State.objects.filter(population__isnull=True).exists())
+        self.assertIsNone(LocalGovernment.objects.first().density)
+
+    def test_columns(self):
+        """
+        Test that the columns are aligned with the ids, and built once per registry.
+        """
+        demographics = get_demographics()
+        self.assertIs(get_demographics(), demographics)
+        table = state_table()
+        self.assertEqual(len(table), TOTAL_STATES)
+        self.assertEqual(len(lga_table()), TOTAL_LGAS)
+        self.assertEqual(sum(table["population"]), TOTAL_POPULATION)
+        registry = get_registry()
+        for position in (0, 24, TOTAL_STATES - 1):
+            state = registry.states_by_id[table.ids[position]]
+            self.assertEqual(table.names[position], state.name)
+            self.assertEqual(table["population"][position], state.population)
+            self.assertAlmostEqual(table["density"][position], state.density)
+        self.assertTrue(all(math.isnan(value) for value in lga_table()["population"]))
+        with self.assertRaises(KeyError):
+            table["gdp"]
+
+    def test_take_and_per_capita(self):
+        """
+        Test the lookups by ids, and the per capita normalization.
+        """
+        lagos, kano = State.objects.get(code="NG-LA"), State.objects.get(code="NG-KN")
+        table = state_table()
+        population = list(table.take("population", [kano.pk, 0, lagos.pk]))
+        self.assertEqual(population[0], 9401288)
+        self.assertTrue(math.isnan(population[1]))
+        self.assertEqual(population[2], 9113605)
+        normalized = list(per_capita([9113605 * 2, 1], ids=[lagos.pk, 0]))
+        self.assertEqual(normalized[0], 2)
+        self.assertTrue(math.isnan(normalized[1]))
+        everyone = per_capita(list(table["population"]))
+        self.assertTrue(all(value == 1 for value in everyone))
+
+    def test_per_capita_2d(self):
+        """
+        Test that 2-d values are normalized row-wise.
+        """
+        if numpy is None:
+            self.skipTest("NumPy is not installed")
+        table = state_table()
+        values = numpy.stack([table["population"], table["population"] * 3], axis=1)
+        normalized = per_capita(values)
+        self.assertEqual(normalized.shape, (TOTAL_STATES, 2))
+        self.assertTrue((normalized == [1, 3]).all())
+        with self.assertRaises(ValueError):
+            per_capita([1, 2])
+
+    def test_lga_figures(self):
+        """
+        Test that the LGA figures set on the rows are picked up.
+        """
+        lga = LocalGovernment.objects.get(code="NG-LA-05")
+        lga.population, lga.area = 1000, 4
+        lga.save()
+        table = lga_table()
+        self.assertEqual(list(table.take("density", [lga.pk])), [250])
+        self.assertEqual(list(per_capita([10], ids=[lga.pk], level="lga")), [0.01])
+        with self.assertRaises(ValueError):
+            per_capita([1], level="zone")
+
+    def test_without_numpy(self):
+        """
+        Test the same lookups without NumPy.
+        """
+        clear_registry()
+        lagos = State.objects.get(code="NG-LA")
+        with mock.patch("nigerian_states.demographics.get_numpy", return_value=None):
+            table = state_table()
+            self.assertEqual(sum(table["population"]), TOTAL_POPULATION)
+            population = table.take("population", [lagos.pk, 0])
+            self.assertEqual(population[0], 9113605)
+            self.assertTrue(math.isnan(population[1]))
+            self.assertEqual(per_capita([9113605], ids=[lagos.pk]), [1])
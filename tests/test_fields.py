@@ -4,7 +4,9 @@ from nigerian_states.models import GeoPoliticalZone, State, LocalGovernment
 from django.test import TestCase, override_settings
 from django.conf import settings
 
+from nigerian_states.registry import get_registry
 from nigerian_states.utils import queryset_to_list
+from nigerian_states.testing import GeographyTestCase
 from .defaults import (
     FIRST_LG,
     FIRST_STATE,
@@ -301,3 +303,120 @@ class LocalGovernmentFieldTestCases(TestCase):
         widget = field.widget
         self.assertEqual(widget.attrs.get("class"), "select form-select select2")
         self.assertEqual(widget.attrs.get("required"), "required")
+
+    def test_local_government_field_qualified(self):
+        """
+        Test that `qualified=True` makes the values "State: LGA", so duplicated names are distinct.
+        """
+        load_fixtures()
+        with override_settings(DEFAULT_GEO_POLITICAL_ZONES=[]):
+            field = LocalGovernmentField(qualified=True)
+            values = [value for value, _ in field.choices[1:]]
+            self.assertEqual(len(values), TOTAL_LGAS)
+            self.assertEqual(len(set(values)), TOTAL_LGAS)
+            self.assertIn(("Benue: Obi", "Benue: Obi"), field.choices)
+            self.assertEqual(field.clean("Nasarawa: Obi"), "Nasarawa: Obi")
+            with self.assertRaises(ValidationError):
+                field.clean("Obi")
+            with self.assertRaises(ValidationError):
+                field.clean("Lagos: Obi")
+            self.assertFalse(LocalGovernmentField().qualified)
+
+    def test_local_government_field_valid_value(self):
+        """
+        Test that validation follows choices assigned after initialization.
+        """
+        load_fixtures()
+        field = LocalGovernmentField()
+        self.assertTrue(field.valid_value("Badagry"))
+        field.choices = [("", "Select a LG"), ("Custom", "Custom")]
+        self.assertTrue(field.valid_value("Custom"))
+        self.assertFalse(field.valid_value("Badagry"))
+
+
+class ZoneChoicesTestCase(GeographyTestCase):
+    """
+    Test Case for the choices shared by the fields limited to the same zones.
+    """
+
+    def test_zone_mask(self):
+        """
+        Test that a zone subset has the same mask regardless of order, duplicates and types.
+        """
+        registry = get_registry()
+        mask = registry.zone_mask(["North West", "South South"])
+        self.assertEqual(
+            mask,
+            registry.zone_mask(
+                [PoliticalZones.SOUTH_SOUTH, "North West", "South South"]
+            ),
+        )
+        self.assertEqual(registry.zone_mask(["Unknown"]), 0)
+        self.assertEqual(
+            registry.zone_mask(PoliticalZones.values), (1 << TOTAL_ZONES) - 1
+        )
+        self.assertTrue(registry.in_mask(mask, "North West"))
+        self.assertFalse(registry.in_mask(mask, "North Central"))
+
+    def test_choices_are_shared(self):
+        """
+        Test that fields limited to the same zones reuse the choices, without queries.
+        """
+        zones = ["North West", "South South"]
+        field = StateField(zones=zones)
+        with self.assertNumQueries(0):
+            other = StateField(zones=list(reversed(zones)), empty_label="Pick")
+        self.assertIs(field.get_zone_choices(), other.get_zone_choices())
+        self.assertEqual(field.choices[1:], other.choices[1:])
+        self.assertEqual(other.choices[0], ("", "Pick"))
+        self.assertIsNot(
+            LocalGovernmentField(zones=zones).get_zone_choices(),
+            LocalGovernmentField(zones=zones, qualified=True).get_zone_choices(),
+        )
+
+    def test_choices_follow_the_data(self):
+        """
+        Test that the shared choices are rebuilt when the data changes.
+        """
+        field = StateField(zones=["South West"])
+        self.assertTrue(field.valid_value("Lagos"))
+        State.objects.filter(name="Lagos").delete()
+        field = StateField(zones=["South West"])
+        self.assertFalse(field.valid_value("Lagos"))
+
+    def test_assigned_choices(self):
+        """
+        Test that validation follows choices assigned after initialization.
+        """
+        field = StateField()
+        field.choices = [("", ""), ("Lagos", "Lagos")]
+        self.assertTrue(field.valid_value("Lagos"))
+        self.assertFalse(field.valid_value("Oyo"))
+
+    def test_overridden_get_choices(self):
+        """
+        Test that a subclass overriding `get_choices` gets its own choices.
+        """
+
+        class SouthWestCapitalField(StateField):
+            def get_choices(self):
+                return [("", ""), ("Ikeja", "Ikeja")]
+
+        field = SouthWestCapitalField()
+        self.assertEqual(field.choices, [("", ""), ("Ikeja", "Ikeja")])
+        self.assertTrue(field.valid_value("Ikeja"))
+        self.assertFalse(field.valid_value("Lagos"))
+
+    def test_choices_per_field_class(self):
+        """
+        Test that field classes with the same name do not share their choices.
+        """
+        zones = ["South West"]
+        self.assertIn(("Lagos", "Lagos"), StateField(zones=zones).choices)
+        custom = type(
+            "StateField",
+            (BaseField,),
+            {"build_choices": lambda self, registry, mask: [("Custom", "Custom")]},
+        )
+        self.assertEqual(custom(zones=zones).choices[1:], [("Custom", "Custom")])
+        self.assertIn(("Lagos", "Lagos"), StateField(zones=zones).choices)
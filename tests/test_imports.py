@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import nigerian_states
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the package's own import time (self time of its modules) after django.setup(), in ms.
+IMPORT_BUDGET_MS = 50
+
+SCRIPT = """
+import sys
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=["nigerian_states"],
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+)
+django.setup()
+import nigerian_states.fields
+import nigerian_states.model_fields
+import nigerian_states.templatetags.state_tags
+import nigerian_states.urls
+print(",".join(sorted(sys.modules)))
+"""
+
+# modules imported only when the features needing them are used.
+LAZY_MODULES = [
+    "numpy",
+    "concurrent.futures.process",
+    "nigerian_states.boundaries",
+    "nigerian_states.spatial",
+    "nigerian_states.testing",
+    "nigerian_states.warmup",
+]
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Test that importing the package stays cheap, see `python -X importtime`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cls.modules = set(result.stdout.strip().split(","))
+        cls.self_times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_time, _, name = line[len("import time:") :].split("|")
+            if self_time.strip().isdigit():
+                cls.self_times[name.strip()] = int(self_time)
+
+    def test_heavy_modules_are_lazy(self):
+        """
+        Test that the indexes and optional dependencies are not imported at startup.
+        """
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, self.modules)
+
+    def test_import_budget(self):
+        """
+        Test that the package's modules import within the budget.
+        """
+        total_us = sum(
+            self_time
+            for name, self_time in self.self_times.items()
+            if name.split(".")[0] == "nigerian_states"
+        )
+        self.assertLess(total_us / 1000, IMPORT_BUDGET_MS)
+
+    def test_lazy_attributes(self):
+        """
+        Test that the helpers are importable from the package.
+        """
+        from nigerian_states.spatial import nearest_state
+
+        self.assertIs(nigerian_states.nearest_state, nearest_state)
+        self.assertIn("validate_records", dir(nigerian_states))
+        with self.assertRaises(AttributeError):
+            nigerian_states.unknown
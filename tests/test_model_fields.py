@@ -0,0 +1,211 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.test import TestCase
+from django.test.utils import isolate_apps
+
+from nigerian_states.fields import LocalGovernmentField, StateField
+from nigerian_states.model_fields import (
+    LocalGovernmentCode,
+    LocalGovernmentCodeField,
+    StateCode,
+    StateCodeField,
+    code_numbers,
+)
+from nigerian_states.models import GeoPoliticalZone, LocalGovernment, State
+from nigerian_states.registry import clear_registry
+from nigerian_states.sync import sync_dataset
+from nigerian_states.testing import GeographyTestCase
+
+
+@isolate_apps("tests")
+class CodeFieldTestCase(GeographyTestCase):
+    """
+    Test cases for StateCodeField and LocalGovernmentCodeField
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        class Address(models.Model):
+            state = StateCodeField(zones=["South West"])
+            lga = LocalGovernmentCodeField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        self.Address = Address
+
+    def test_state_code_from_name(self):
+        """
+        Test that assigning a state name stores the state id as a StateCode.
+        """
+        lagos = State.objects.get(name="Lagos")
+        address = self.Address(state="Lagos")
+        self.assertIsInstance(address.state, StateCode)
+        self.assertEqual(address.state, lagos.id)
+        self.assertEqual(address.state.name, "Lagos")
+        self.assertEqual(address.state.capital, "Ikeja")
+        self.assertEqual(address.state.zone, "South West")
+
+    def test_state_code_from_integer(self):
+        """
+        Test that assigning an integer code resolves through the registry.
+        """
+        oyo = State.objects.get(name="Oyo")
+        address = self.Address(state=oyo.id)
+        self.assertIsInstance(address.state, StateCode)
+        self.assertEqual(address.state.name, "Oyo")
+        self.assertEqual(StateCode(10_000).name, "")
+
+    def test_invalid_state_name(self):
+        """
+        Test that an unknown state name is rejected.
+        """
+        with self.assertRaises(ValidationError):
+            self.Address(state="Togo")
+
+    def test_state_get_prep_value(self):
+        """
+        Test that names are converted to codes when used in filters.
+        """
+        field = self.Address._meta.get_field("state")
+        lagos = State.objects.get(name="Lagos")
+        self.assertEqual(field.get_prep_value("Lagos"), lagos.id)
+        self.assertEqual(field.get_prep_value(lagos.id), lagos.id)
+        self.assertIsNone(field.get_prep_value(None))
+
+    def test_lga_code(self):
+        """
+        Test the LocalGovernmentCode attributes, and qualified names for duplicated lgas.
+        """
+        badagry = LocalGovernment.objects.get(name="Badagry")
+        address = self.Address(state="Lagos", lga="Badagry")
+        self.assertIsInstance(address.lga, LocalGovernmentCode)
+        self.assertEqual(address.lga, badagry.id)
+        self.assertEqual(address.lga.name, "Badagry")
+        self.assertEqual(address.lga.state, "Lagos")
+        self.assertEqual(address.lga.zone, "South West")
+        with self.assertRaises(ValidationError):
+            self.Address(lga="Obi")
+        obi = LocalGovernment.objects.get(name="Obi", state__name="Benue")
+        self.assertEqual(self.Address(lga="Benue: Obi").lga, obi.id)
+
+    def test_formfield(self):
+        """
+        Test that the model fields pair with the package form fields.
+        """
+        state_field = self.Address._meta.get_field("state").formfield()
+        lga_field = self.Address._meta.get_field("lga").formfield()
+        self.assertIsInstance(state_field, StateField)
+        self.assertEqual(state_field.zones, ["South West"])
+        self.assertIn(("Lagos", "Lagos"), state_field.choices)
+        self.assertIsInstance(lga_field, LocalGovernmentField)
+        self.assertTrue(lga_field.qualified)
+        self.assertIn(("Benue: Obi", "Benue: Obi"), lga_field.choices)
+
+    def test_model_form(self):
+        """
+        Test that a ModelForm round trips names through the integer codes.
+        """
+        Address = self.Address
+
+        class AddressForm(forms.ModelForm):
+            class Meta:
+                model = Address
+                fields = ["state", "lga"]
+
+        form = AddressForm(data={"state": "Oyo", "lga": "Oyo: Ogbomosho North"})
+        self.assertTrue(form.is_valid(), form.errors)
+        instance = form.save(commit=False)
+        self.assertEqual(instance.state.name, "Oyo")
+        self.assertEqual(instance.lga.name, "Ogbomosho North")
+        initial = AddressForm(instance=instance).initial
+        self.assertEqual(initial["state"], "Oyo")
+        self.assertEqual(initial["lga"], "Oyo: Ogbomosho North")
+        form = AddressForm(data={"state": "Kano"})
+        self.assertFalse(form.is_valid())
+
+    def test_model_form_blank(self):
+        """
+        Test that a blank optional code field is saved as NULL, not as "".
+        """
+
+        class Contact(models.Model):
+            state = StateCodeField(null=True, blank=True)
+
+            class Meta:
+                app_label = "tests"
+
+        class ContactForm(forms.ModelForm):
+            class Meta:
+                model = Contact
+                fields = ["state"]
+
+        form = ContactForm(data={"state": ""})
+        self.assertTrue(form.is_valid(), form.errors)
+        instance = form.save(commit=False)
+        self.assertIsNone(instance.state)
+        field = Contact._meta.get_field("state")
+        self.assertIsNone(field.get_db_prep_save(instance.state, connection))
+        self.assertIsNone(field.get_db_prep_save("", connection))
+        self.assertEqual(ContactForm(instance=instance).initial["state"], None)
+
+
+@isolate_apps("tests")
+class CodeNumbersTestCase(TestCase):
+    """
+    Test that the integer codes do not depend on the primary keys of the database.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        # rows inserted before the sync shift the keys the database assigns.
+        zone = GeoPoliticalZone.objects.create(name="Test")
+        State.objects.create(name="Test", capital="Test", zone=zone)
+        sync_dataset()
+        clear_registry()
+
+        class Address(models.Model):
+            state = StateCodeField()
+            lga = LocalGovernmentCodeField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        self.Address = Address
+
+    def test_codes_follow_the_packaged_codes(self):
+        """
+        Test that the codes are the ones of the packaged fixture, whatever the keys.
+        """
+        states, _ = code_numbers("state")
+        lgas, _ = code_numbers("lga")
+        lagos = State.objects.get(code="NG-LA")
+        self.assertNotEqual(lagos.pk, states["NG-LA"])
+        address = self.Address(state="Lagos", lga="Lagos: Badagry")
+        self.assertEqual(address.state, states["NG-LA"])
+        self.assertEqual(address.state.name, "Lagos")
+        badagry = LocalGovernment.objects.get(name="Badagry")
+        self.assertEqual(address.lga, lgas[badagry.code])
+        self.assertEqual(address.lga.name, "Badagry")
+        self.assertEqual(self.Address(state=states["NG-OY"]).state.name, "Oyo")
+
+    def test_using(self):
+        """
+        Test that the codes resolve from the registry of the field's database.
+        """
+
+        class ReplicaAddress(models.Model):
+            state = StateCodeField(using="replica")
+
+            class Meta:
+                app_label = "tests"
+
+        with self.assertRaises(ValidationError):
+            ReplicaAddress(state="Lagos")
+        address = ReplicaAddress(state=code_numbers("state")[0]["NG-LA"])
+        self.assertEqual(address.state.using, "replica")
+        self.assertEqual(address.state.name, "")
+        self.assertEqual(self.Address(state="Lagos").state.name, "Lagos")
@@ -1,7 +1,8 @@
+from django.db.models import Count, F
 from nigerian_states.models import GeoPoliticalZone, State, LocalGovernment
-from django.test import TestCase
 
-from nigerian_states.utils import queryset_to_list
+from nigerian_states.utils import queryset_to_list, sync_lga_zones
+from nigerian_states.testing import GeographyTestCase
 from .defaults import (
     FIRST_LG,
     FIRST_STATE,
@@ -9,24 +10,22 @@ from .defaults import (
     LAST_LG,
     LAST_STATE,
     LAST_THREE_STATE,
-    load_fixtures,
     get_random_lga,
     get_random_state,
     get_random_zone,
     TOTAL_ZONES,
     TOTAL_STATES,
     TOTAL_LGAS,
+    OYO_LGAS,
+    LAGOS_LGAS,
 )
 
 
-class TestGeoPoliticalZone(TestCase):
+class TestGeoPoliticalZone(GeographyTestCase):
     """
     Test cases for GeoPoliticalZone model.
     """
 
-    def setUp(self):
-        load_fixtures()
-
     def test_zone_string_representation(self):
         """
         Test the string representation of GeoPoliticalZone model
@@ -103,6 +102,69 @@ class TestGeoPoliticalZone(TestCase):
         self.assertEqual(lgas.count(), all_lgas.count())
         self.assertEqual(len(set(lgas).difference(set(all_lgas))), 0)
 
+    def test_with_full_tree_queries(self):
+        """
+        Test that walking zones -> states -> lgas with `with_full_tree` takes three queries.
+        """
+        with self.assertNumQueries(3):
+            zones = list(GeoPoliticalZone.objects.with_full_tree())
+            total_states = total_lgas = 0
+            for zone in zones:
+                total_states += zone.total_states
+                total_lgas += zone.total_lgas
+                self.assertEqual(len(zone.all_lgas), zone.total_lgas)
+                for state in zone.all_states:
+                    self.assertEqual(state.total_lgas, len(state.lgas))
+                    for lga in state.lgas:
+                        str(lga)
+        self.assertEqual(total_states, TOTAL_STATES)
+        self.assertEqual(total_lgas, TOTAL_LGAS)
+
+    def test_with_full_tree_matches_queries(self):
+        """
+        Test that the prefetched properties return the same objects as the queries.
+        """
+        zone = GeoPoliticalZone.objects.with_full_tree().get(name="North Central")
+        fresh = GeoPoliticalZone.objects.get(name="North Central")
+        self.assertSetEqual(set(zone.all_lgas), set(fresh.all_lgas))
+        self.assertSetEqual(set(zone.all_states), set(fresh.all_states))
+        self.assertEqual(zone.total_lgas, fresh.total_lgas)
+
+    def test_all_lgas_bulk_create(self):
+        """
+        Test that `all_lgas` filters on the denormalized zone without a join, and that
+        LGAs inserted with `bulk_create` get their zone.
+        """
+        state = State.objects.get(name="Lagos")
+        LocalGovernment.objects.bulk_create(
+            [
+                LocalGovernment(state=state, name="Test"),
+                LocalGovernment(state_id=state.pk, name="Test 2"),
+            ]
+        )
+        expected = LocalGovernment.objects.filter(state__zone_id=state.zone_id).count()
+        zone = GeoPoliticalZone.objects.get(pk=state.zone_id)
+        self.assertNotIn("JOIN", str(zone.all_lgas.query))
+        for zone in (
+            zone,
+            GeoPoliticalZone.objects.with_full_tree().get(pk=state.zone_id),
+            GeoPoliticalZone.objects.prefetch_related("states").get(pk=state.zone_id),
+        ):
+            names = [lga.name for lga in zone.all_lgas]
+            self.assertIn("Test", names)
+            self.assertIn("Test 2", names)
+            self.assertEqual(len(names), expected)
+            self.assertEqual(zone.total_lgas, expected)
+
+    def test_with_counts(self):
+        """
+        Test that `total_states` and `total_lgas` use the `with_counts` annotations.
+        """
+        zones = list(GeoPoliticalZone.objects.with_counts())
+        with self.assertNumQueries(0):
+            self.assertEqual(sum(zone.total_states for zone in zones), TOTAL_STATES)
+            self.assertEqual(sum(zone.total_lgas for zone in zones), TOTAL_LGAS)
+
     def test_zone_has_reverse_foreignKey_relation_to_state(self):
         """
         test that GeoPoliticalZone has a reverse foreignkey relationship to state
@@ -111,14 +173,11 @@ class TestGeoPoliticalZone(TestCase):
         self.assertTrue(zone.states.all())
 
 
-class TestStateModel(TestCase):
+class TestStateModel(GeographyTestCase):
     """
     Test cases for the State Model
     """
 
-    def setUp(self):
-        load_fixtures()
-
     def test_state_string_representation(self):
         state = State.objects.get(name="Lagos")
         self.assertEqual(str(state), "Lagos")
@@ -180,6 +239,16 @@ class TestStateModel(TestCase):
         last_three = queryset_to_list(State.objects.order_by("-id"), "name")[:3]
         self.assertEqual(last_three, LAST_THREE_STATE)
 
+    def test_state_codes(self):
+        """
+        Test that every state carries a unique ISO 3166-2:NG code
+        """
+        self.assertEqual(State.objects.get(name="Lagos").code, "NG-LA")
+        self.assertEqual(State.objects.get(code="NG-FC").name, LAST_STATE)
+        codes = queryset_to_list(State.objects.all(), "code")
+        self.assertEqual(len(set(codes)), TOTAL_STATES)
+        self.assertTrue(all(code.startswith("NG-") for code in codes))
+
     def test_fetching_state_with_invalid_name(self):
         """
         Test that getting state with an invalid name wold raise DoesNotExist exception
@@ -187,6 +256,15 @@ class TestStateModel(TestCase):
         with self.assertRaises(State.DoesNotExist):
             State.objects.get(name="Invalid name")
 
+    def test_state_total_lgas_annotation(self):
+        """
+        Test that `State.total_lgas` uses a `num_lgas` annotation when there is one.
+        """
+        states = State.objects.annotate(num_lgas=Count("localgovernment"))
+        lagos = states.get(name="Lagos")
+        with self.assertNumQueries(0):
+            self.assertEqual(lagos.total_lgas, LAGOS_LGAS)
+
     def test_state_has_foreignkey_relation_to_zone(self):
         """ """
         state = get_random_state()
@@ -197,14 +275,11 @@ class TestStateModel(TestCase):
         self.assertTrue(state.localgovernment_set.all())
 
 
-class TestLocalGovernmentModel(TestCase):
+class TestLocalGovernmentModel(GeographyTestCase):
     """
     Test cases for the LocalGovernment Model
     """
 
-    def setUp(self):
-        load_fixtures()
-
     def test_state_string_representation(self):
         lg = LocalGovernment.objects.get(name="Aba South")
         self.assertEqual(str(lg), f"{lg.state.name}: Aba South")
@@ -258,6 +333,97 @@ class TestLocalGovernmentModel(TestCase):
         last_lg = LocalGovernment.objects.last()
         self.assertTrue(last_lg.state.name == LAST_STATE)
 
+    def test_lg_codes(self):
+        """
+        Test that every LocalGovernment carries a unique code prefixed with its state code
+        """
+        codes = LocalGovernment.objects.values_list("code", "state__code")
+        self.assertEqual(len({code for code, _ in codes}), TOTAL_LGAS)
+        self.assertTrue(all(code.startswith(f"{state}-") for code, state in codes))
+        self.assertEqual(LocalGovernment.objects.get(code="NG-LA-05").name, "Badagry")
+
     def test_lg_has_foreignkey_relation_to_state(self):
         lg = get_random_lga()
         self.assertIsInstance(lg.state, State)
+
+    def test_lg_zone_matches_state_zone(self):
+        """
+        Test that the denormalized `zone` of every LocalGovernment is the zone of its state.
+        """
+        mismatched = LocalGovernment.objects.exclude(zone=F("state__zone"))
+        self.assertFalse(mismatched.exists())
+
+    def test_lg_zone_is_set_on_save(self):
+        """
+        Test that saving a LocalGovernment sets the zone from its state.
+        """
+        state = State.objects.get(name="Lagos")
+        lg = LocalGovernment.objects.create(state=state, name="New LG")
+        self.assertEqual(lg.zone_id, state.zone_id)
+
+    def test_lg_zone_follows_state_zone_change(self):
+        """
+        Test that moving a state to another zone updates the zone of its LocalGovernments.
+        """
+        state = State.objects.get(name="Lagos")
+        state.zone = GeoPoliticalZone.objects.get(name="North Central")
+        state.save()
+        zones = set(queryset_to_list(state.lgas, "zone__name"))
+        self.assertSetEqual(zones, {"North Central"})
+
+    def test_state_save_without_zone_change(self):
+        """
+        Test that saving a state whose zone did not change does not update its LocalGovernments.
+        """
+        state = State.objects.get(name="Lagos")
+        state.capital = "Lagos"
+        with self.assertNumQueries(1):
+            state.save()
+        state.zone = GeoPoliticalZone.objects.get(name="North Central")
+        with self.assertNumQueries(2):
+            state.save()
+        with self.assertNumQueries(1):
+            state.save()
+
+    def test_bulk_writes_keep_lga_zones(self):
+        """
+        Test that the queryset writes changing the state of LGAs, or the zone of
+        states, update the denormalized zone.
+        """
+        north_central = GeoPoliticalZone.objects.get(name="North Central")
+        State.objects.filter(name="Lagos").update(zone=north_central)
+        lagos = State.objects.get(name="Lagos")
+        self.assertSetEqual(
+            set(queryset_to_list(lagos.lgas, "zone__name")), {"North Central"}
+        )
+
+        lagos.zone = GeoPoliticalZone.objects.get(name="South West")
+        State.objects.bulk_update([lagos], ["zone"])
+        self.assertSetEqual(
+            set(queryset_to_list(lagos.lgas, "zone__name")), {"South West"}
+        )
+
+        kano = State.objects.get(name="Kano")
+        LocalGovernment.objects.filter(name="Badagry").update(state=kano)
+        self.assertEqual(LocalGovernment.objects.get(name="Badagry").zone, kano.zone)
+
+        lga = LocalGovernment.objects.get(name="Ikeja")
+        lga.state = kano
+        LocalGovernment.objects.bulk_update([lga], ["state"])
+        self.assertEqual(LocalGovernment.objects.get(name="Ikeja").zone, kano.zone)
+        self.assertFalse(
+            LocalGovernment.objects.exclude(zone_id=F("state__zone_id")).exists()
+        )
+
+    def test_sync_lga_zones(self):
+        """
+        Test that `sync_lga_zones` backfills LocalGovernments with a missing zone.
+        """
+        LocalGovernment.objects.filter(state__name="Oyo").update(zone=None)
+        LocalGovernment.objects.filter(state__name="Lagos").update(
+            zone=GeoPoliticalZone.objects.get(name="North Central")
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(sync_lga_zones(), OYO_LGAS + LAGOS_LGAS)
+        self.assertFalse(LocalGovernment.objects.filter(zone__isnull=True).exists())
+        self.assertEqual(sync_lga_zones(), 0)
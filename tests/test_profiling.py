@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import override_settings
+
+from nigerian_states import profiling
+from nigerian_states.fields import StateField
+from nigerian_states.registry import clear_registry
+from nigerian_states.templatetags.state_tags import get_capital
+from nigerian_states.testing import GeographyTestCase
+
+PAGE = (
+    "{% load state_tags %}{% get_capital 'Lagos' %}"
+    "{% if 'South West'|is_state_in_zone:'Oyo' %}yes{% endif %}{% get_zone 'Kano' %}"
+)
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "OPTIONS": {
+            "loaders": [
+                ("django.template.loaders.locmem.Loader", {"profiled_page.html": PAGE})
+            ],
+        },
+    }
+]
+
+
+class TestProfiling(GeographyTestCase):
+    """
+    Test cases for the profiling of the tags and fields.
+    """
+
+    def test_not_recorded_by_default(self):
+        """
+        Test that calls are only recorded inside `capture`.
+        """
+        with profiling.capture() as records:
+            pass
+        get_capital("Lagos")
+        self.assertEqual(records, [])
+
+    def test_capture(self):
+        """
+        Test that tag and field calls are recorded with their queries, nested calls once.
+        """
+        clear_registry()
+        template = Template(PAGE)
+        with profiling.capture() as records:
+            template.render(Context())
+            StateField(zones=["South West"])
+        names = [record["name"] for record in records]
+        self.assertEqual(
+            names,
+            ["get_capital", "is_state_in_zone", "get_zone", "BaseField.get_choices"],
+        )
+        # the first tag builds the registry.
+        self.assertEqual(records[0]["queries"], 4)
+        self.assertEqual(records[1]["queries"], 0)
+        self.assertEqual(records[0]["args"], "'Lagos'")
+        self.assertEqual(records[3]["args"], "StateField(zones=['South West'])")
+        self.assertGreaterEqual(records[0]["ms"], 0)
+
+    @override_settings(
+        ROOT_URLCONF="tests.urls",
+        TEMPLATES=TEMPLATES,
+        NIGERIAN_STATES_PROFILING=True,
+        MIDDLEWARE=["nigerian_states.profiling.ProfilingMiddleware"],
+    )
+    def test_middleware_and_report(self):
+        """
+        Test the per-request header, log line and records, and the hotspot report.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "profile.jsonl")
+        with override_settings(NIGERIAN_STATES_PROFILING_LOG=path):
+            with self.assertLogs("nigerian_states.profiling", level="INFO"):
+                response = self.client.get("/profiled-page/")
+            self.client.get("/profiled-page/")
+        self.assertEqual(response.content.decode().strip(), "IkejayesNorth West")
+        self.assertTrue(response[profiling.HEADER].startswith("calls=3; queries="))
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[0]["template"], "profiled_page.html")
+        self.assertEqual(records[0]["path"], "/profiled-page/")
+
+        out = StringIO()
+        call_command("nigerian_states_profile", file=path, top=2, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("profiled_page.html / ", lines[1])
+        self.assertEqual(lines[1].split()[2], "2")
+
+    def test_report_without_file(self):
+        """
+        Test that the report command fails without a log file to read.
+        """
+        with self.assertRaises(CommandError):
+            call_command("nigerian_states_profile")
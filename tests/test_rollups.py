@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.db.models import Count
+
+from nigerian_states.models import LocalGovernment
+from nigerian_states.registry import get_registry
+from nigerian_states.rollups import (
+    Rollup,
+    get_rollup,
+    rollup,
+    rollup_array,
+    state_case,
+    zone_case,
+)
+from nigerian_states.testing import GeographyTestCase
+from .defaults import LAGOS_LGAS, OYO_LGAS, TOTAL_LGAS, TOTAL_STATES, TOTAL_ZONES
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestRollup(GeographyTestCase):
+    """
+    Test cases for the LGA -> state -> zone rollups.
+    """
+
+    def test_mapping_arrays(self):
+        """
+        Test that the mapping arrays follow the registry.
+        """
+        index = get_rollup()
+        registry = get_registry()
+        self.assertIs(get_rollup(), index)
+        self.assertEqual(len(index.lga_state), TOTAL_LGAS)
+        self.assertEqual(len(index.state_zone), TOTAL_STATES)
+        for position in (0, 300, TOTAL_LGAS - 1):
+            lga = registry.lgas[position]
+            state = index.state_names[index.lga_state[position]]
+            zone = index.zone_names[index.lga_zone[position]]
+            self.assertEqual((state, zone), (lga.state.name, lga.state.zone.name))
+
+    def test_lga_positions(self):
+        """
+        Test that codes, qualified names and unambiguous names are resolved.
+        """
+        keys = ["Ikeja", "Lagos: Ikeja", "NG-LA-05", "Obi", "?"]
+        positions = list(get_rollup().lga_positions(keys))
+        self.assertEqual(positions[0], positions[1])
+        self.assertGreaterEqual(positions[0], 0)
+        self.assertEqual(positions[3:], [-1, -1])
+        registry = get_registry()
+        self.assertEqual(
+            positions[2], registry.lgas.index(registry.lgas_by_code["NG-LA-05"])
+        )
+
+    def test_rollup_counts_and_sums(self):
+        """
+        Test that rows are counted or summed per state and zone, unknown rows left out.
+        """
+        lgas = ["Ikeja", "Ikeja", "Ibadan North", "Benue: Obi", "Obi", "Unknown"]
+        counts = rollup(lgas)
+        self.assertEqual(counts["Lagos"], 2)
+        self.assertEqual(counts["Oyo"], 1)
+        self.assertEqual(counts["Benue"], 1)
+        self.assertEqual(sum(counts.values()), 4)
+        sums = rollup(lgas, values=[1, 2, 4, 8, 16, 32], level="zone")
+        self.assertEqual(sums["South West"], 7)
+        self.assertEqual(sums["North Central"], 8)
+        with self.assertRaises(ValueError):
+            rollup(lgas, level="lga")
+
+    def test_rollup_array(self):
+        """
+        Test that an array with one value per LGA sums to the number of LGAs per state.
+        """
+        totals = rollup_array([1] * TOTAL_LGAS)
+        index = get_rollup()
+        self.assertEqual(totals[index.state_names.index("Lagos")], LAGOS_LGAS)
+        self.assertEqual(totals[index.state_names.index("Oyo")], OYO_LGAS)
+        self.assertEqual(sum(rollup_array([1] * TOTAL_LGAS, level="zone")), TOTAL_LGAS)
+
+    def test_rollup_2d_array(self):
+        """
+        Test that arrays of values per LGA are rolled up row-wise.
+        """
+        if numpy is None:
+            self.skipTest("numpy is not installed")
+        totals = rollup_array(numpy.ones((TOTAL_LGAS, 3), dtype=int), level="zone")
+        self.assertEqual(totals.shape, (TOTAL_ZONES, 3))
+        self.assertEqual(totals.sum(), TOTAL_LGAS * 3)
+        with self.assertRaises(ValueError):
+            rollup_array(numpy.ones(10))
+
+    def test_without_numpy(self):
+        """
+        Test that the rollups work without NumPy.
+        """
+        with mock.patch("nigerian_states.rollups.get_numpy", return_value=None):
+            index = Rollup(get_registry())
+            self.assertIsInstance(index.lga_state, list)
+            self.assertEqual(index.rollup(["Ikeja", "Obi", "NG-OY-01"])["Lagos"], 1)
+            totals = index.rollup_array([1] * TOTAL_LGAS)
+        self.assertEqual(totals[index.state_names.index("Lagos")], LAGOS_LGAS)
+
+    def test_case_expressions(self):
+        """
+        Test the database side grouping, using the LGA table as the fact table.
+        """
+        by_code = dict(
+            LocalGovernment.objects.annotate(group=state_case("code", key="code"))
+            .values_list("group")
+            .annotate(total=Count("id"))
+        )
+        self.assertEqual(by_code["Lagos"], LAGOS_LGAS)
+        self.assertNotIn(None, by_code)
+        by_name = dict(
+            LocalGovernment.objects.annotate(group=zone_case("name"))
+            .values_list("group")
+            .annotate(total=Count("id"))
+        )
+        # "Ifelodun", "Irepodun" and "Nasarawa" are in two zones, "Obi" and "Bassa" in
+        # two states of North Central.
+        self.assertEqual(by_name[None], 6)
+        self.assertEqual(
+            LocalGovernment.objects.filter(name__in=("Obi", "Bassa"))
+            .annotate(group=zone_case("name"))
+            .filter(group="North Central")
+            .count(),
+            4,
+        )
+        self.assertEqual(sum(by_name.values()), TOTAL_LGAS)
+        with self.assertRaises(ValueError):
+            state_case("lga", key="id")
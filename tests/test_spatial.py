@@ -0,0 +1,89 @@
+import random
+
+from nigerian_states.models import LocalGovernment, State
+from nigerian_states.registry import clear_registry
+from nigerian_states.spatial import (
+    SpatialIndex,
+    get_lga_index,
+    get_state_index,
+    nearest_lga,
+    nearest_lgas,
+    nearest_state,
+    nearest_states,
+)
+from nigerian_states.testing import GeographyTestCase
+from .defaults import TOTAL_STATES
+
+
+class TestSpatialIndex(GeographyTestCase):
+    """
+    Test cases for the nearest state/lga lookups.
+    """
+
+    def test_states_have_coordinates(self):
+        """
+        Test that every state in the fixture has a representative point.
+        """
+        self.assertFalse(State.objects.filter(latitude__isnull=True).exists())
+        self.assertEqual(len(get_state_index()), TOTAL_STATES)
+
+    def test_nearest_state(self):
+        """
+        Test that `nearest_state` returns the state closest to a point.
+        """
+        self.assertEqual(nearest_state(6.60, 3.35).name, "Lagos")
+        self.assertEqual(nearest_state(12.00, 8.59).name, "Kano")
+        self.assertEqual(nearest_state(9.05, 7.49).name, "Federal Capital Territory")
+
+    def test_nearest_matches_brute_force(self):
+        """
+        Test that the KD-tree agrees with a linear scan on random points.
+        """
+        index = get_state_index()
+        states = list(State.objects.all())
+        rng = random.Random(0)
+        for _ in range(200):
+            lat, lon = rng.uniform(4, 14), rng.uniform(2.5, 14.7)
+            state, distance = index.nearest_with_distance(lat, lon)
+            expected = min(
+                states,
+                key=lambda s: (s.latitude - lat) ** 2
+                + ((s.longitude - lon) * 0.988) ** 2,
+            )
+            self.assertGreaterEqual(distance, 0)
+            # the planar approximation above can disagree only on near ties.
+            if state.id != expected.id:
+                _, other = SpatialIndex([expected]).nearest_with_distance(lat, lon)
+                self.assertAlmostEqual(distance, other, delta=1)
+
+    def test_nearest_states_batch(self):
+        """
+        Test the batch api returns one state per point in order.
+        """
+        points = [(6.60, 3.35), (12.00, 8.59), (7.38, 3.95)]
+        names = [state.name for state in nearest_states(points)]
+        self.assertEqual(names, ["Lagos", "Kano", "Oyo"])
+        self.assertEqual(nearest_states([]), [])
+
+    def test_nearest_lga(self):
+        """
+        Test the lga lookup, lgas without coordinates are left out of the index.
+        """
+        self.assertIsNone(nearest_lga(6.45, 3.39))
+        self.assertEqual(nearest_lgas([(6.45, 3.39)]), [None])
+        self.assertEqual(len(get_lga_index()), 0)
+        LocalGovernment.objects.filter(name="Badagry").update(
+            latitude=6.42, longitude=2.88
+        )
+        LocalGovernment.objects.filter(name="Ikeja").update(
+            latitude=6.60, longitude=3.34
+        )
+        # queryset updates do not send signals, so rebuild the index from the db.
+        index = SpatialIndex(LocalGovernment.objects.all())
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.nearest(6.45, 2.95).name, "Badagry")
+        self.assertEqual(index.nearest(6.58, 3.36).name, "Ikeja")
+        clear_registry()
+        names = [lga.name for lga in nearest_lgas([(6.45, 2.95), (6.58, 3.36)])]
+        self.assertEqual(names, ["Badagry", "Ikeja"])
+        self.assertEqual(nearest_lgas([]), [])
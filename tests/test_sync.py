@@ -0,0 +1,241 @@
+import copy
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from nigerian_states.models import DatasetVersion, LocalGovernment, State
+from nigerian_states import registry as registry_module
+from nigerian_states.registry import (
+    GeoRegistry,
+    cached_registry,
+    clear_registry,
+    get_generation,
+    get_registry,
+    registry_key,
+)
+from nigerian_states.sync import DATASET_VERSION, packaged_dataset, sync_dataset
+from nigerian_states.templatetags.state_tags import get_capital
+from nigerian_states.testing import GeographyTestCase
+from .defaults import TOTAL_LGAS, TOTAL_STATES, TOTAL_ZONES
+
+
+class TestInitialSync(TestCase):
+    """
+    Test cases for syncing into an empty database.
+    """
+
+    def test_sync_empty_database(self):
+        """
+        Test that every object is inserted, with the denormalized zones, and the version recorded.
+        """
+        changes = sync_dataset()
+        self.assertEqual(changes.inserted, TOTAL_ZONES + TOTAL_STATES + TOTAL_LGAS)
+        self.assertEqual(changes.updated, 0)
+        self.assertEqual(LocalGovernment.objects.count(), TOTAL_LGAS)
+        self.assertFalse(
+            LocalGovernment.objects.exclude(zone_id=F("state__zone_id")).exists()
+        )
+        self.assertEqual(DatasetVersion.objects.get().version, DATASET_VERSION)
+        self.assertEqual(len(get_registry().states), TOTAL_STATES)
+
+
+class TestSync(GeographyTestCase):
+    """
+    Test cases for syncing a database with the dataset loaded.
+    """
+
+    def test_up_to_date(self):
+        """
+        Test that an up to date database only gets its version recorded, once.
+        """
+        changes = sync_dataset()
+        self.assertFalse(changes)
+        self.assertEqual(DatasetVersion.objects.count(), 1)
+        sync_dataset()
+        self.assertEqual(DatasetVersion.objects.count(), 1)
+
+    def test_rename(self):
+        """
+        Test that a changed name is restored in place, as a rename.
+        """
+        lga = LocalGovernment.objects.get(code="NG-LA-05")
+        LocalGovernment.objects.filter(pk=lga.pk).update(name="Old Name")
+        changes = sync_dataset()
+        self.assertEqual(changes.inserted, 0)
+        self.assertEqual(changes.updated, 1)
+        self.assertEqual(changes.renamed, [(LocalGovernment, "Old Name", lga.name)])
+        self.assertEqual(LocalGovernment.objects.get(pk=lga.pk).name, lga.name)
+        self.assertEqual(DatasetVersion.objects.get().renamed, 1)
+
+    def test_match_without_code(self):
+        """
+        Test that rows without a code are matched by name, and get their code.
+        """
+        State.objects.filter(code="NG-LA").update(code=None, capital="Lagos")
+        LocalGovernment.objects.filter(code="NG-OY-01").update(code=None)
+        changes = sync_dataset()
+        self.assertEqual(changes.inserted, 0)
+        self.assertEqual(changes.updated, 2)
+        self.assertEqual(State.objects.get(code="NG-LA").capital, "Ikeja")
+        self.assertTrue(LocalGovernment.objects.filter(code="NG-OY-01").exists())
+
+    def test_new_objects(self):
+        """
+        Test that new states and local governments in a dataset are inserted.
+        """
+        dataset = copy.deepcopy(packaged_dataset())
+        dataset["version"] = "next"
+        dataset["states"].append(
+            {
+                "code": "NG-XX",
+                "name": "New State",
+                "capital": "New Town",
+                "zone": "South West",
+                "latitude": None,
+                "longitude": None,
+                "population": None,
+                "area": None,
+            }
+        )
+        dataset["lgas"].append(
+            {
+                "code": "NG-XX-01",
+                "name": "New LGA",
+                "state": "NG-XX",
+                "latitude": None,
+                "longitude": None,
+                "population": None,
+                "area": None,
+            }
+        )
+        with self.assertNumQueries(9):
+            changes = sync_dataset(dataset)
+        self.assertEqual(changes.inserted, 2)
+        lga = LocalGovernment.objects.get(code="NG-XX-01")
+        self.assertEqual(lga.state.name, "New State")
+        self.assertEqual(lga.zone.name, "South West")
+        self.assertEqual(DatasetVersion.objects.get().version, "next")
+
+    def test_dry_run(self):
+        """
+        Test that a dry run reports the changes without applying them.
+        """
+        LocalGovernment.objects.filter(code="NG-LA-05").update(name="Old Name")
+        changes = sync_dataset(dry_run=True)
+        self.assertEqual(changes.updated, 1)
+        self.assertTrue(LocalGovernment.objects.filter(name="Old Name").exists())
+        self.assertFalse(DatasetVersion.objects.exists())
+
+    def test_command(self):
+        """
+        Test the `sync_nigerian_states` command output.
+        """
+        LocalGovernment.objects.filter(code="NG-LA-05").update(name="Old Name")
+        out = StringIO()
+        call_command("sync_nigerian_states", stdout=out)
+        self.assertIn("LocalGovernment: Old Name -> ", out.getvalue())
+        self.assertIn("0 inserted, 1 updated, 1 renamed", out.getvalue())
+
+    @override_settings(NIGERIAN_STATES_GENERATION_CHECK_INTERVAL=0)
+    def test_generation(self):
+        """
+        Test that a registry is rebuilt once another process syncs a new version.
+        """
+        clear_registry()
+        registry = get_registry()
+        self.assertEqual(registry.generation, 0)
+        self.assertIs(get_registry(), registry)
+        # as if applied by another process, which leaves this process' registry in place.
+        version = DatasetVersion.objects.create(version="next")
+        rebuilt = get_registry()
+        self.assertIsNot(rebuilt, registry)
+        self.assertEqual(rebuilt.generation, version.id)
+
+    def test_no_generation_check(self):
+        """
+        Test that the generation is not checked unless the setting is set.
+        """
+        registry = get_registry()
+        self.assertIsNone(registry.generation)
+        DatasetVersion.objects.create(version="next")
+        with self.assertNumQueries(0):
+            self.assertIs(get_registry(), registry)
+
+    @override_settings(NIGERIAN_STATES_GENERATION_CHECK_INTERVAL=0)
+    def test_writes_bump_generation(self):
+        """
+        Test that writes through the models record one new generation per transaction.
+        """
+        DatasetVersion.objects.create(version=DATASET_VERSION)
+        generation = get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            lga = LocalGovernment.objects.get(code="NG-LA-05")
+            lga.name = "New Name"
+            lga.save()
+            State.objects.get(code="NG-LA").save()
+        latest = DatasetVersion.objects.latest()
+        self.assertEqual(DatasetVersion.objects.count(), 2)
+        self.assertGreater(get_generation(), generation)
+        self.assertEqual(latest.version, DATASET_VERSION)
+        self.assertEqual(get_registry().generation, latest.id)
+
+    def test_writes_without_generation_check(self):
+        """
+        Test that writes record nothing unless the generation is checked.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            State.objects.get(code="NG-LA").save()
+        self.assertFalse(DatasetVersion.objects.exists())
+
+    def test_rolled_back_write(self):
+        """
+        Test that a registry read inside a rolled back transaction is not kept.
+        """
+        self.assertEqual(get_capital("Lagos"), "Ikeja")
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            state = State.objects.get(name="Lagos")
+            state.capital = "Uncommitted"
+            state.save()
+            self.assertEqual(get_capital("Lagos"), "Uncommitted")
+            self.assertIsNone(cached_registry())
+            raise RuntimeError
+        self.assertEqual(get_capital("Lagos"), "Ikeja")
+
+    def test_registry_dropped_on_commit(self):
+        """
+        Test that a registry published by another thread before the commit, from the
+        rows committed before the write, is dropped when the write commits.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            State.objects.get(name="Lagos").save()
+            registry_module._publish(
+                registry_key(), GeoRegistry(), registry_module._epoch
+            )
+            self.assertIsNotNone(cached_registry())
+        self.assertIsNone(cached_registry())
+
+    def test_registry_without_generation_is_stale(self):
+        """
+        Test that a registry built without a generation is rebuilt once it is checked.
+        """
+        registry = get_registry()
+        self.assertIsNone(registry.generation)
+        with override_settings(NIGERIAN_STATES_GENERATION_CHECK_INTERVAL=0):
+            rebuilt = get_registry()
+            self.assertIsNot(rebuilt, registry)
+            self.assertEqual(rebuilt.generation, 0)
+            self.assertIs(get_registry(), rebuilt)
+
+    def test_empty_registry_not_cached(self):
+        """
+        Test that an empty registry (e.g. before `loaddata`) is not cached.
+        """
+        empty = GeoRegistry()
+        with mock.patch.object(GeoRegistry, "build", return_value=empty) as build:
+            get_registry()
+            get_registry()
+        self.assertEqual(build.call_count, 2)
@@ -1,46 +1,31 @@
-from django.test import TestCase
-
 from nigerian_states.models import GeoPoliticalZone, State
 from nigerian_states.utils import queryset_to_list
-from .defaults import get_state, load_fixtures, get_random_state_in_zone
+from nigerian_states.testing import GeographyTestCase
+from .defaults import get_state, get_random_state_in_zone
 from nigerian_states.templatetags.state_tags import (
     default_zone,
     get_capital,
     get_lgas_in_state,
     get_states_in_zone,
+    get_state_code,
+    get_state_name,
     get_zone,
     get_zone_info,
     is_lga_in_state,
     is_state_in_zone,
+    render_state_lgas,
+    render_states_with_lgas,
+    render_zone_states,
 )
 from django.conf import settings
+from django.template import Context, Template
 
 
-class TestTemplateTags(TestCase):
+class TestTemplateTags(GeographyTestCase):
     """
     Test cases for the template tags
     """
 
-    def setUp(self):
-        load_fixtures()
-
-        # def test_tags_get_states(self):
-        """
-        I don't think you need to render a template in order to test your filter logic. Django already has well-tested template rendering logic, which the unit-tests for your filter shouldn't have to worry about since the "job" done by your filter is not to render to a template, but to take an input and return an output.
-
-        https://stackoverflow.com/questions/49603388/test-a-custom-template-tag-filter-in-django
-        I agree with the above, which is why i won't be testing the tags using Template.
-        # Test that `get_states` template tags returns states from the zone name passed as args.
-        # """
-        # zone_name = "North Central"
-        # state = get_random_state_in_zone(zone_name)
-        # context = Context({'zone_name': zone_name})
-        # self.GET_STATES = Template(
-        #     "{% load default_tags %}{% get_states_in_zone zone_name as states %}{{ states|safe }}"
-        # )
-        # rendered = self.GET_STATES.render(context)
-        # self.assertIn(state.name, rendered)
-
     def test_tag_get_state_in_zone(self):
         """
         Test that template tag `get_states_in_zones` return states in a GeoPoliticalzone if a valid zone name is provided as args else empty list.
@@ -105,6 +90,14 @@ class TestTemplateTags(TestCase):
         self.assertFalse(is_lga_in_state("Lagos", "Invalid LGA"))
         self.assertFalse(is_lga_in_state("Invalid State", "Invalid LGA"))
 
+    def test_tag_is_lga_in_state_duplicated_names(self):
+        """
+        Test that `is_lga_in_state` handles LGA names that exist in more than one state.
+        """
+        self.assertTrue(is_lga_in_state("Benue", "Obi"))
+        self.assertTrue(is_lga_in_state("Nasarawa", "Obi"))
+        self.assertFalse(is_lga_in_state("Lagos", "Obi"))
+
     def test_tag_get_zone(self):
         """
         Test that tag `get_zone` returns the name of the zone the state belongs to if a valid state, else ''
@@ -141,6 +134,29 @@ class TestTemplateTags(TestCase):
         self.assertIsInstance(test_data["states"], list)
         self.assertIsInstance(test_data["lgas"], list)
 
+    def test_tags_accept_state_codes(self):
+        """
+        Test that the state tags accept ISO 3166-2 codes as well as names.
+        """
+        self.assertEqual(get_capital("NG-LA"), "Ikeja")
+        self.assertEqual(get_zone("NG-KN"), "North West")
+        self.assertEqual(get_lgas_in_state("NG-OY"), get_lgas_in_state("Oyo"))
+        self.assertTrue(is_state_in_zone("South West", "NG-OY"))
+        self.assertTrue(is_lga_in_state("NG-LA", "Badagry"))
+        self.assertTrue(is_lga_in_state("Lagos", "NG-LA-05"))
+        self.assertFalse(is_lga_in_state("Oyo", "NG-LA-05"))
+        self.assertEqual(get_capital("NG-XX"), "")
+
+    def test_tag_get_state_code(self):
+        """
+        Test that `get_state_code` and `get_state_name` map between names and codes.
+        """
+        self.assertEqual(get_state_code("Lagos"), "NG-LA")
+        self.assertEqual(get_state_code("Federal Capital Territory"), "NG-FC")
+        self.assertEqual(get_state_code("Togo"), "")
+        self.assertEqual(get_state_name("NG-LA"), "Lagos")
+        self.assertEqual(get_state_name("NG-XX"), "")
+
     def test_tag_default_zone(self):
         """
         Test that the `default zone` tag returns the default set in the settings
@@ -148,3 +164,62 @@ class TestTemplateTags(TestCase):
         self.assertEqual(
             default_zone(), getattr(settings, "DEFAULT_GEO_POLITICAL_ZONES", [])
         )
+
+
+class TestFragmentTags(GeographyTestCase):
+    """
+    Test cases for the memoized HTML fragment tags
+    """
+
+    def test_render_zone_states(self):
+        """
+        Test that `render_zone_states` renders every state of the zone, and '' for an invalid zone.
+        """
+        html = render_zone_states("South West")
+        for state in get_states_in_zone("South West"):
+            self.assertIn(f"<li>{state}</li>", html)
+        self.assertNotIn("Kano", html)
+        self.assertEqual(render_zone_states("Invalid Zone"), "")
+
+    def test_render_state_lgas(self):
+        """
+        Test that `render_state_lgas` renders the LGs of a state given by name or code.
+        """
+        html = render_state_lgas("Lagos")
+        self.assertEqual(html.count("<li>"), 20)
+        self.assertIn("<li>Badagry</li>", html)
+        self.assertEqual(render_state_lgas("NG-LA"), html)
+        self.assertEqual(render_state_lgas("Togo"), "")
+
+    def test_render_states_with_lgas(self):
+        """
+        Test that `render_states_with_lgas` renders all states, or the states of a zone.
+        """
+        html = render_states_with_lgas()
+        self.assertEqual(html.count('data-state="'), State.objects.count())
+        self.assertIn("<li>Municipal Area Council</li>", html)
+        html = render_states_with_lgas("South West")
+        self.assertEqual(html.count('data-state="'), 6)
+        self.assertEqual(render_states_with_lgas("Invalid Zone"), "")
+
+    def test_fragments_are_memoized(self):
+        """
+        Test that a fragment is rendered once, and rendered again after the dataset changes.
+        """
+        first = render_zone_states("South West")
+        with self.assertNumQueries(0):
+            with self.settings(TEMPLATES=[]):
+                # the template engine is not needed for a memoized fragment.
+                self.assertIs(render_zone_states("South West"), first)
+        state = State.objects.get(name="Lagos")
+        state.name = "Lagos State"
+        state.save()
+        self.assertIn("<li>Lagos State</li>", render_zone_states("South West"))
+
+    def test_fragment_tags_in_template(self):
+        """
+        Test that the fragments are not escaped when used in a template.
+        """
+        template = Template("{% load state_tags %}{% render_zone_states zone %}")
+        html = template.render(Context({"zone": "South East"}))
+        self.assertIn("<li>Abia</li>", html)
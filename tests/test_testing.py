@@ -0,0 +1,94 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from nigerian_states.models import GeoPoliticalZone, LocalGovernment, State
+from nigerian_states.registry import cached_registry, clear_registry, get_registry
+from nigerian_states.testing import (
+    GeographyTestCase,
+    load_geography,
+    random_lga,
+    random_state,
+    random_zone,
+)
+from .defaults import TOTAL_LGAS, TOTAL_STATES, TOTAL_ZONES
+
+
+class TestLoadGeography(TestCase):
+    """
+    Test cases for the bulk loader of the dataset.
+    """
+
+    def test_load_geography(self):
+        """
+        Test that the whole dataset is loaded, with the denormalized zones, in a few queries.
+        """
+        clear_registry()
+        self.assertEqual(len(get_registry().states), 0)
+        with CaptureQueriesContext(connection) as queries:
+            loaded = load_geography()
+        # one INSERT per model, split into batches by backends limiting the parameters.
+        self.assertLess(len(queries), 10)
+        self.assertEqual(loaded, TOTAL_ZONES + TOTAL_STATES + TOTAL_LGAS)
+        self.assertEqual(GeoPoliticalZone.objects.count(), TOTAL_ZONES)
+        self.assertEqual(State.objects.count(), TOTAL_STATES)
+        self.assertFalse(LocalGovernment.objects.filter(zone__isnull=True).exists())
+        # the registry built before the load is dropped.
+        self.assertEqual(len(get_registry().states), TOTAL_STATES)
+
+    def test_registry_dropped_after_class(self):
+        """
+        Test that a GeographyTestCase does not leave its registry to the next tests.
+        """
+
+        class Lookups(GeographyTestCase):
+            def test_lookup(self):
+                self.assertEqual(len(get_registry().states), TOTAL_STATES)
+
+        result = unittest.TestResult()
+        unittest.defaultTestLoader.loadTestsFromTestCase(Lookups).run(result)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+        self.assertIsNone(cached_registry())
+        self.assertEqual(len(get_registry().states), 0)
+
+
+class TestRandomSampling(GeographyTestCase):
+    """
+    Test cases for the random sampling helpers.
+    """
+
+    def test_random_objects(self):
+        """
+        Test that the samples come from the registry, without queries.
+        """
+        get_registry()
+        with self.assertNumQueries(0):
+            zone = random_zone()
+            state = random_state()
+            lga = random_lga()
+        self.assertIsInstance(zone, GeoPoliticalZone)
+        self.assertIsInstance(state, State)
+        self.assertIsInstance(lga, LocalGovernment)
+
+    def test_random_objects_within(self):
+        """
+        Test that the samples can be limited to a zone or a state.
+        """
+        for _ in range(10):
+            self.assertEqual(random_state(zone="South West").zone.name, "South West")
+            self.assertEqual(random_lga(state="Lagos").state.name, "Lagos")
+            self.assertEqual(random_lga(state="NG-OY").state.name, "Oyo")
+
+    def test_random_objects_are_copies(self):
+        """
+        Test that changing a sample does not change the registry.
+        """
+        registry = get_registry()
+        state = random_state()
+        state.capital = "Changed"
+        self.assertNotEqual(registry.states[state.name].capital, "Changed")
+        lga = random_lga()
+        lga.name = "Changed"
+        self.assertNotIn("Changed", [lga.name for lga in registry.lgas])
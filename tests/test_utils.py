@@ -0,0 +1,230 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import override_settings
+
+from nigerian_states.models import LocalGovernment, State
+from nigerian_states.registry import clear_registry
+from nigerian_states.utils import (
+    get_lga,
+    lga_states,
+    lga_names_in_state,
+    lga_names_in_zone,
+    names_in_zone,
+    queryset_to_list,
+    validate_records,
+)
+from nigerian_states.testing import GeographyTestCase
+from .defaults import LAGOS_LGAS, OYO_LGAS
+
+
+class TestZoneHelpers(GeographyTestCase):
+    """
+    Test cases for the registry backed name helpers.
+    """
+
+    def test_names_in_zone(self):
+        """
+        Test that `names_in_zone` returns the names of the states in the zone(s).
+        """
+        south_west = queryset_to_list(
+            State.objects.filter(zone__name="South West"), "name"
+        )
+        self.assertEqual(list(names_in_zone("South West")), south_west)
+        self.assertIn("Lagos", names_in_zone(["South West", "North West"]))
+        self.assertIn("Kano", names_in_zone(["South West", "North West"]))
+        self.assertEqual(names_in_zone("Invalid Zone"), ())
+
+    def test_lga_names_in_zone(self):
+        """
+        Test that `lga_names_in_zone` returns the distinct lga names in the zone.
+        """
+        names = lga_names_in_zone("North Central")
+        expected = set(
+            queryset_to_list(
+                LocalGovernment.objects.filter(state__zone__name="North Central"),
+                "name",
+            )
+        )
+        self.assertEqual(len(names), len(expected))
+        self.assertSetEqual(set(names), expected)
+        self.assertEqual(lga_names_in_zone("Invalid Zone"), ())
+
+    def test_lga_names_in_state(self):
+        """
+        Test that `lga_names_in_state` returns the lga names in the state(s).
+        """
+        self.assertEqual(len(lga_names_in_state("Lagos")), LAGOS_LGAS)
+        self.assertEqual(
+            len(lga_names_in_state(["Lagos", "Oyo"])), LAGOS_LGAS + OYO_LGAS
+        )
+        self.assertIn("Badagry", lga_names_in_state("Lagos"))
+        self.assertEqual(lga_names_in_state("Togo"), ())
+
+    def test_lga_states(self):
+        """
+        Test that `lga_states` lists every state having an lga with the name.
+        """
+        self.assertEqual(sorted(lga_states("Obi")), ["Benue", "Nasarawa"])
+        self.assertEqual(lga_states("Badagry"), ("Lagos",))
+        self.assertEqual(lga_states("Invalid LGA"), ())
+
+    def test_get_lga(self):
+        """
+        Test that `get_lga` disambiguates duplicated names by state.
+        """
+        self.assertEqual(get_lga("Badagry").state.name, "Lagos")
+        self.assertIsNone(get_lga("Obi"))
+        self.assertEqual(get_lga("Obi", state="Benue").state.name, "Benue")
+        self.assertEqual(get_lga("Obi", state="NG-NA").state.name, "Nasarawa")
+        self.assertEqual(get_lga("Nasarawa: Obi").state.name, "Nasarawa")
+        self.assertEqual(get_lga("NG-LA-05").name, "Badagry")
+        self.assertIsNone(get_lga("Obi", state="Lagos"))
+        self.assertIsNone(get_lga("Invalid LGA"))
+
+    def test_helpers_without_data(self):
+        """
+        Test that the helpers return empty tuples when there is no data in the db.
+        """
+        State.objects.all().delete()
+        clear_registry()
+        self.assertEqual(names_in_zone("South West"), ())
+        self.assertEqual(lga_names_in_state("Lagos"), ())
+
+
+class TestZoneLookups(GeographyTestCase):
+    """
+    Test cases for the `in_zone`, `lga_in_zone` and `lga_in_state` lookups.
+    """
+
+    def test_in_zone_lookup(self):
+        """
+        Test that `in_zone` filters a CharField of state names without joining the zone.
+        """
+        qs = State.objects.filter(name__in_zone="South West")
+        self.assertSetEqual(
+            set(queryset_to_list(qs, "name")),
+            set(
+                queryset_to_list(State.objects.filter(zone__name="South West"), "name")
+            ),
+        )
+        self.assertNotIn("JOIN", str(qs.query))
+        self.assertEqual(
+            State.objects.filter(name__in_zone=["South West", "North West"]).count(),
+            State.objects.filter(zone__name__in=["South West", "North West"]).count(),
+        )
+        self.assertFalse(State.objects.filter(name__in_zone="Invalid Zone").exists())
+
+    def test_lga_in_zone_lookup(self):
+        """
+        Test that `lga_in_zone` filters a CharField of lga names by zone.
+        """
+        qs = LocalGovernment.objects.filter(name__lga_in_zone="South East")
+        self.assertIn("Aba North", queryset_to_list(qs, "name"))
+        self.assertNotIn("Badagry", queryset_to_list(qs, "name"))
+
+    def test_lga_in_state_lookup(self):
+        """
+        Test that `lga_in_state` filters a CharField of lga names by state.
+        """
+        qs = LocalGovernment.objects.filter(name__lga_in_state="Oyo")
+        self.assertEqual(qs.count(), OYO_LGAS)
+
+
+class TestValidateRecords(GeographyTestCase):
+    """
+    Test cases for the bulk validation of records.
+    """
+
+    def test_valid_records(self):
+        """
+        Test that valid names, codes and qualified names pass.
+        """
+        records = [
+            {"state": "Lagos", "lga": "Ikeja", "zone": "South West"},
+            {"state": "NG-LA", "lga": "Lagos: Ikeja"},
+            {"state": "Benue", "lga": "Obi", "zone": ""},
+        ]
+        self.assertEqual(validate_records(records), {})
+
+    def test_invalid_records(self):
+        """
+        Test that the errors are reported per row and key.
+        """
+        records = [
+            {"state": "Lagos", "lga": "Ikeja"},
+            {"state": "Atlantis", "lga": "Ikeja"},
+            {"state": "Lagos", "lga": "Ibadan North"},
+            {"state": "Lagos", "lga": "Ikeja", "zone": "North West"},
+            {"lga": ""},
+        ]
+        errors = validate_records(records)
+        self.assertSetEqual(set(errors), {1, 2, 3, 4})
+        self.assertEqual(list(errors[1]), ["state"])
+        self.assertIn("Atlantis", errors[1]["state"][0])
+        self.assertEqual(
+            errors[2], {"lga": ["Ibadan North is not a local government in Lagos."]}
+        )
+        self.assertEqual(list(errors[3]), ["zone"])
+        self.assertEqual(
+            errors[4],
+            {"state": ["This field is required."], "lga": ["This field is required."]},
+        )
+
+    def test_zone_restriction(self):
+        """
+        Test that states outside the allowed zones are invalid, as with the fields.
+        """
+        records = [
+            {"state": "Lagos", "lga": "Ikeja"},
+            {"state": "Kano", "lga": "Kano Municipal"},
+        ]
+        self.assertEqual(list(validate_records(records, zones=["South West"])), [1])
+        with override_settings(DEFAULT_GEO_POLITICAL_ZONES=["North West"]):
+            self.assertEqual(list(validate_records(records)), [0])
+
+    def test_stateless_records(self):
+        """
+        Test that LGAs without a (valid) state are checked against the allowed zones.
+        """
+        records = [
+            {"lga": "Ikeja"},
+            {"lga": "garbage"},
+            {"lga": "Kano Municipal"},
+            {"lga": "NG-LA-05"},
+        ]
+        errors = validate_records(records, state_key=None, zone_key=None)
+        self.assertEqual(list(errors), [1])
+        self.assertIn("garbage", errors[1]["lga"][0])
+        errors = validate_records(
+            records, state_key=None, zone_key=None, zones=["South West"]
+        )
+        self.assertEqual(sorted(errors), [1, 2])
+        errors = validate_records([{"state": "Atlantis", "lga": "garbage"}])
+        self.assertEqual(sorted(errors[0]), ["lga", "state"])
+
+    def test_sequences_and_keys(self):
+        """
+        Test that rows may be sequences, and that checks can be skipped.
+        """
+        rows = [("Lagos", "Ikeja"), ("Oyo", "Ikeja")]
+        self.assertEqual(list(validate_records(rows, 0, 1, None)), [1])
+        self.assertEqual(validate_records(rows, 0, None, None), {})
+
+    def test_chunks(self):
+        """
+        Test that chunked validation, serial or in a pool, gives the rows of the input.
+        """
+        records = [
+            {"state": "Lagos", "lga": "Ikeja" if row % 7 else "Obi"}
+            for row in range(100)
+        ]
+        expected = validate_records(records)
+        self.assertEqual(sorted(expected), list(range(0, 100, 7)))
+        with ThreadPoolExecutor(2) as executor:
+            errors = validate_records(iter(records), chunk_size=8, executor=executor)
+        self.assertEqual(errors, expected)
+        self.assertEqual(validate_records(records, chunk_size=30), expected)
+        with mock.patch("concurrent.futures.ProcessPoolExecutor") as pool:
+            self.assertEqual(validate_records(iter(records), chunk_size=8), expected)
+        pool.assert_not_called()
@@ -0,0 +1,171 @@
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from nigerian_states.models import State
+from nigerian_states.registry import get_registry
+from nigerian_states.testing import GeographyTestCase
+from .defaults import LAGOS_LGAS, TOTAL_ZONES
+
+
+@override_settings(ROOT_URLCONF="tests.urls")
+class TestReadOnlyApi(GeographyTestCase):
+    """
+    Test cases for the read-only zone/state/lga endpoints.
+    """
+
+    def test_zones(self):
+        """
+        Test that the zones endpoint lists every zone with its states.
+        """
+        response = self.client.get(reverse("nigerian_states:zones"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        zones = response.json()["zones"]
+        self.assertEqual(len(zones), TOTAL_ZONES)
+        south_west = next(zone for zone in zones if zone["name"] == "South West")
+        self.assertIn("Lagos", south_west["states"])
+
+    def test_zone_states(self):
+        """
+        Test that the zone states endpoint returns the states of the zone, or a 404.
+        """
+        url = reverse("nigerian_states:zone-states", args=["South West"])
+        data = self.client.get(url).json()
+        self.assertEqual(data["zone"], "South West")
+        lagos = next(state for state in data["states"] if state["name"] == "Lagos")
+        self.assertEqual(lagos["code"], "NG-LA")
+        self.assertEqual(lagos["capital"], "Ikeja")
+        url = reverse("nigerian_states:zone-states", args=["Invalid Zone"])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_state_detail(self):
+        """
+        Test that the state endpoint accepts names and codes, or returns a 404.
+        """
+        data = self.client.get(
+            reverse("nigerian_states:state-detail", args=["Lagos"])
+        ).json()
+        self.assertEqual(data["zone"], "South West")
+        self.assertEqual(data["total_lgas"], LAGOS_LGAS)
+        by_code = self.client.get(
+            reverse("nigerian_states:state-detail", args=["NG-LA"])
+        )
+        self.assertEqual(by_code.json(), data)
+        response = self.client.get(
+            reverse("nigerian_states:state-detail", args=["Togo"])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_state_lgas(self):
+        """
+        Test that the state lgas endpoint returns the lgas of the state.
+        """
+        data = self.client.get(
+            reverse("nigerian_states:state-lgas", args=["Lagos"])
+        ).json()
+        self.assertEqual(len(data["lgas"]), LAGOS_LGAS)
+        self.assertIn({"name": "Badagry", "code": "NG-LA-05"}, data["lgas"])
+
+    def test_conditional_get(self):
+        """
+        Test that a matching ETag or an unchanged Last-Modified returns a 304.
+        """
+        url = reverse("nigerian_states:state-lgas", args=["Oyo"])
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        since = http_date(get_registry().built_at.timestamp() + 1)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH='"x"').status_code, 200
+        )
+        response = self.client.head(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_payload_is_rebuilt_after_change(self):
+        """
+        Test that the serialized bytes and ETag change with the data.
+        """
+        url = reverse("nigerian_states:state-detail", args=["Lagos"])
+        etag = self.client.get(url)["ETag"]
+        state = State.objects.get(name="Lagos")
+        state.capital = "Lagos Island"
+        state.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["capital"], "Lagos Island")
+
+    def test_read_only(self):
+        """
+        Test that the endpoints only accept GET.
+        """
+        url = reverse("nigerian_states:zones")
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+
+@override_settings(ROOT_URLCONF="tests.urls")
+class TestLgaOptions(GeographyTestCase):
+    """
+    Test cases for the precomputed LGA <option> fragments.
+    """
+
+    def test_options(self):
+        """
+        Test that the fragment lists the LGAs of the state, by name or code.
+        """
+        url = reverse("nigerian_states:lga-options", args=["NG-LA"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertIn("max-age=3600", response["Cache-Control"])
+        content = response.content.decode()
+        self.assertTrue(content.startswith('<option value="">Select a LG</option>'))
+        self.assertEqual(content.count("<option"), LAGOS_LGAS + 1)
+        self.assertIn('<option value="Badagry">Badagry</option>', content)
+        self.assertNotIn("selected", content)
+        url = reverse("nigerian_states:lga-options", args=["Atlantis"])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_selected_and_qualified(self):
+        """
+        Test that `selected` preselects one option, and `qualified` changes the values.
+        """
+        url = reverse("nigerian_states:lga-options", args=["Lagos"])
+        plain_etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, {"selected": "Badagry"})
+        content = response.content.decode()
+        self.assertIn('<option value="Badagry" selected>Badagry</option>', content)
+        self.assertEqual(content.count("selected"), 1)
+        self.assertNotEqual(response["ETag"], plain_etag)
+        content = self.client.get(url, {"qualified": "1", "selected": "Lagos: Badagry"})
+        self.assertIn(
+            b'<option value="Lagos: Badagry" selected>Badagry</option>', content.content
+        )
+        # an unknown value selects nothing.
+        response = self.client.get(url, {"selected": "Ibadan North"})
+        self.assertNotIn(b"selected", response.content)
+
+    def test_escaping_and_revalidation(self):
+        """
+        Test that values are escaped, and that a matching ETag returns a 304 without work.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            State.objects.get(name="Oyo").localgovernment_set.create(
+                name='Oyo "East" & <West>'
+            )
+        url = reverse("nigerian_states:lga-options", args=["Oyo"])
+        response = self.client.get(url)
+        self.assertIn(
+            b'value="Oyo &quot;East&quot; &amp; &lt;West&gt;"', response.content
+        )
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
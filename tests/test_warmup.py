@@ -0,0 +1,171 @@
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import RequestFactory, override_settings
+
+from nigerian_states import warmup
+from nigerian_states.fields import StateField
+from nigerian_states.registry import clear_registry, get_registry
+from nigerian_states.templatetags.state_tags import render_state_lgas
+from nigerian_states.views import readiness
+from nigerian_states.testing import GeographyTestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETTINGS = """
+import os
+
+SECRET_KEY = "nigerian-states-tests"
+INSTALLED_APPS = ["django.contrib.contenttypes", "nigerian_states"]
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(os.path.dirname(__file__), "db.sqlite3"),
+    }
+}
+TEMPLATES = [{"BACKEND": "django.template.backends.django.DjangoTemplates", "APP_DIRS": True}]
+"""
+
+SETUP_SCRIPT = """
+import django
+from django.core.management import call_command
+
+django.setup()
+call_command("migrate", run_syncdb=True, verbosity=0)
+call_command("loaddata", "fixtures", verbosity=0)
+"""
+
+# gunicorn.conf.py imports the hooks before Django is set up.
+HOOK_SCRIPT = """
+import sys
+from nigerian_states.warmup import is_ready, on_starting, post_fork
+
+hook = {"on_starting": lambda: on_starting(None), "post_fork": lambda: post_fork(None, None)}
+hook[sys.argv[1]]()
+print(is_ready())
+"""
+
+
+class TestWarmUp(GeographyTestCase):
+    """
+    Test cases for the cache warm up and readiness check.
+    """
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(warmup._state, {"registry": None, "timings": {}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_warm_up(self):
+        """
+        Test that `warm_up` reports the time of every step, and builds the caches.
+        """
+        self.assertFalse(warmup.is_ready())
+        timings = warmup.warm_up()
+        self.assertTrue(warmup.is_ready())
+        expected = {"registry", "total"} | {
+            step.__name__ for step in warmup.WARM_UP_STEPS
+        }
+        self.assertSetEqual(set(timings), expected)
+        self.assertEqual(warmup.last_timings(), timings)
+        registry = get_registry()
+        with self.assertNumQueries(0):
+            self.assertIs(render_state_lgas("Lagos"), render_state_lgas("Lagos"))
+        self.assertIs(get_registry(), registry)
+
+    def test_readiness_view(self):
+        """
+        Test that the readiness view returns 503 until the caches are warm.
+        """
+        request = RequestFactory().get("/ready")
+        self.assertEqual(readiness(request).status_code, 503)
+        warmup.warm_up()
+        response = readiness(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-store", response["Cache-Control"])
+
+    def test_readiness_follows_the_registry(self):
+        """
+        Test that the process is no longer ready once the warmed registry is dropped.
+        """
+        warmup.warm_up()
+        self.assertTrue(warmup.is_ready())
+        clear_registry()
+        self.assertFalse(warmup.is_ready())
+        get_registry()
+        self.assertFalse(warmup.is_ready())
+        warmup.warm_up()
+        self.assertTrue(warmup.is_ready())
+
+    def test_field_choices_default_zones(self):
+        """
+        Test that only the choices of the default zones are warmed up.
+        """
+        with override_settings(DEFAULT_GEO_POLITICAL_ZONES=["South West"]):
+            warmup.warm_up()
+            with self.assertNumQueries(0):
+                field = StateField()
+        self.assertIn(("Lagos", "Lagos"), field.choices)
+        self.assertNotIn(("Kano", "Kano"), field.choices)
+        keys = [key for key in get_registry()._memo if key[0] == "choices"]
+        self.assertEqual(len(keys), 4)
+
+    def test_command(self):
+        """
+        Test that the `warm_nigerian_states` command prints the timings.
+        """
+        out = StringIO()
+        call_command("warm_nigerian_states", stdout=out)
+        self.assertIn("registry:", out.getvalue())
+        self.assertIn("total:", out.getvalue())
+        self.assertTrue(warmup.is_ready())
+
+    def test_gunicorn_hooks(self):
+        """
+        Test that the gunicorn hooks warm the caches.
+        """
+        warmup.post_fork(server=None, worker=None)
+        self.assertTrue(warmup.is_ready())
+
+    def test_gunicorn_hooks_before_setup(self):
+        """
+        Test that the gunicorn hooks import and warm the caches in a fresh process,
+        where Django is not set up yet.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "hook_settings.py"), "w") as f:
+                f.write(SETTINGS)
+            env = {
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "hook_settings",
+                "PYTHONPATH": os.pathsep.join([ROOT, directory]),
+            }
+            run = dict(cwd=ROOT, env=env, capture_output=True, text=True)
+            subprocess.run([sys.executable, "-c", SETUP_SCRIPT], check=True, **run)
+            for hook in ("on_starting", "post_fork"):
+                with self.subTest(hook=hook):
+                    result = subprocess.run(
+                        [sys.executable, "-c", HOOK_SCRIPT, hook], **run
+                    )
+                    self.assertEqual(result.returncode, 0, result.stderr)
+                    self.assertEqual(result.stdout.strip(), "True")
+
+    def test_app_config_warm_up(self):
+        """
+        Test the opt-in warm up in AppConfig.ready, and that database errors are logged.
+        """
+        config = apps.get_app_config("nigerian_states")
+        with override_settings(NIGERIAN_STATES_WARM_UP=True):
+            config.ready()
+        self.assertTrue(warmup.is_ready())
+        with mock.patch.object(warmup, "warm_up", side_effect=DatabaseError):
+            with self.assertLogs("nigerian_states", level="ERROR"):
+                config.warm_up()
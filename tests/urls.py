@@ -0,0 +1,12 @@
+from django.shortcuts import render
+from django.urls import include, path
+
+
+def profiled_page(request):
+    return render(request, "profiled_page.html")
+
+
+urlpatterns = [
+    path("geo/", include("nigerian_states.urls")),
+    path("profiled-page/", profiled_page),
+]